@@ -0,0 +1,112 @@
+"""
+Django management command pentru pornirea containerului: migrate, collectstatic
+și superuser într-un singur proces, sărind pașii care nu au nimic de făcut.
+Usage: python manage.py boot
+       python manage.py boot --force
+"""
+import hashlib
+import os
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import get_finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+# Aceleași fișiere ignorate ca în collectstatic
+IGNORE_PATTERNS = ['CVS', '.*', '*~']
+# Amprenta ultimei colectări, păstrată lângă fișierele colectate
+STATIC_HASH_NAME = '.collectstatic.sha256'
+
+
+def pending_migrations(database=DEFAULT_DB_ALIAS):
+    """Migrările din cod care nu sunt aplicate în baza de date"""
+    connection = connections[database]
+    connection.prepare_database()
+    executor = MigrationExecutor(connection)
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+def static_fingerprint():
+    """SHA-256 peste backend-ul de stocare, căile și conținutul fișierelor statice sursă"""
+    digest = hashlib.sha256(settings.STORAGES['staticfiles']['BACKEND'].encode() + b'\0')
+    found = []
+    for finder in get_finders():
+        for path, storage in finder.list(IGNORE_PATTERNS):
+            prefixed = os.path.join(getattr(storage, 'prefix', None) or '', path)
+            found.append((prefixed, storage, path))
+    for prefixed, storage, path in sorted(found, key=lambda item: item[0]):
+        digest.update(prefixed.encode() + b'\0')
+        with storage.open(path) as handle:
+            for chunk in iter(lambda: handle.read(1 << 16), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def collected_fingerprint():
+    """Amprenta salvată la ultima colectare (None dacă lipsește sau manifestul lipsește)"""
+    root = str(settings.STATIC_ROOT)
+    manifest = getattr(staticfiles_storage, 'manifest_name', None)
+    if manifest and not os.path.exists(os.path.join(root, manifest)):
+        return None
+    try:
+        with open(os.path.join(root, STATIC_HASH_NAME), encoding='ascii') as handle:
+            return handle.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def save_fingerprint(fingerprint):
+    path = os.path.join(str(settings.STATIC_ROOT), STATIC_HASH_NAME)
+    with open(f'{path}.tmp', 'w', encoding='ascii') as handle:
+        handle.write(fingerprint)
+    os.replace(f'{path}.tmp', path)
+
+
+class Command(BaseCommand):
+    help = 'Pregătește pornirea: migrate și collectstatic doar dacă e nevoie, apoi superuser-ul (cu timpi per pas)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rulează migrate și collectstatic oricum')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Baza de date pentru migrate')
+
+    def _step(self, name, func):
+        started = time.perf_counter()
+        result = func()
+        self.stdout.write(f'  {name}: {result} ({time.perf_counter() - started:.2f}s)')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        started = time.perf_counter()
+        self._step('migrate', lambda: self.migrate(options['database'], options['force']))
+        self._step('collectstatic', lambda: self.collectstatic(options['force']))
+        self._step('superuser', self.superuser)
+        self.stdout.write(self.style.SUCCESS(f'Boot terminat în {time.perf_counter() - started:.2f}s'))
+
+    def migrate(self, database, force):
+        plan = pending_migrations(database)
+        if not plan and not force:
+            return 'sărit (toate migrările sunt aplicate)'
+        call_command('migrate', database=database, interactive=False, verbosity=self.verbosity)
+        return f'{len(plan)} migrări aplicate'
+
+    def collectstatic(self, force):
+        fingerprint = static_fingerprint()
+        if fingerprint == collected_fingerprint() and not force:
+            return f'sărit (fișiere neschimbate, {fingerprint[:12]})'
+        call_command('collectstatic', interactive=False, verbosity=self.verbosity)
+        save_fingerprint(fingerprint)
+        return f'colectat ({fingerprint[:12]})'
+
+    def superuser(self):
+        if not os.environ.get('SUPERUSER_PASSWORD'):
+            return 'sărit (SUPERUSER_PASSWORD nu este setat)'
+        try:
+            call_command('create_superuser_if_none', verbosity=self.verbosity)
+        except Exception as e:
+            # Ca în start.sh: o eroare aici nu oprește pornirea
+            return f'eșuat ({e})'
+        return 'verificat'
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-19 16:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_module_lessontemplate'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lessontemplate',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='module',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
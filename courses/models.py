@@ -140,7 +140,7 @@ class Module(models.Model):
 
     is_active = models.BooleanField(default=True, verbose_name="Activ")
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Modul"
@@ -186,7 +186,7 @@ class LessonTemplate(models.Model):
     is_active = models.BooleanField(default=True, verbose_name="Activ")
 
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Șablon Lecție"
@@ -1,3 +1,125 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from mathcourses import query_budget
+
+from .management.commands import boot
+from .models import AgeGroup, Course, Location, Testimonial
+
+
+class ViewQueryBudgetTests(query_budget.QueryBudgetTestCase):
+    """Paginile publice: N cursuri, N locații, N grupe de vârstă, N testimoniale per curs"""
+
+    def build_world(self, size):
+        prefix = f'qb{size}'
+        age_groups = AgeGroup.objects.bulk_create([
+            AgeGroup(name=f'{prefix} {age}-{age + 2}', min_age=age, max_age=age + 2)
+            for age in range(3, 3 + size)
+        ])
+        locations = Location.objects.bulk_create([
+            Location(name=f'{prefix} Locația {i}', address=f'Str. Exemplu nr. {i}', is_online=(i == 0))
+            for i in range(size)
+        ])
+        courses = Course.objects.bulk_create([
+            Course(
+                title=f'{prefix} Curs {i}', slug=f'{prefix}-curs-{i}', description='Descriere',
+                age_group=age_groups[i % len(age_groups)], price=250, frequency='Săptămânal',
+                group_size=10, featured=True,
+            )
+            for i in range(size)
+        ])
+        for course in courses:
+            course.locations.set(locations)
+        Testimonial.objects.bulk_create([
+            Testimonial(course=course, parent_name=f'Părinte {i}', text='Foarte mulțumit', rating=5, is_approved=True)
+            for course in courses
+            for i in range(size)
+        ])
+        return SimpleNamespace(course=courses[0])
+
+    def view_requests(self, world):
+        return [
+            ('home', {}, {}, None),
+            ('courses_list', {}, {}, None),
+            ('course_detail', {'slug': world.course.slug}, {}, None),
+            ('demo_lesson', {}, {}, None),
+            ('contact', {}, {}, None),
+            ('locations', {}, {}, None),
+            ('terms', {}, {}, None),
+        ]
+
+
+class BootCommandTests(TestCase):
+    """boot sare peste migrate / collectstatic / superuser când nu au ce face"""
+
+    def setUp(self):
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root)
+        settings_override = override_settings(STATIC_ROOT=self.static_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        environ = mock.patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.environ.pop('SUPERUSER_PASSWORD', None)
+
+    def boot(self, *args):
+        out = io.StringIO()
+        call_command('boot', *args, verbosity=0, stdout=out)
+        return out.getvalue()
+
+    def test_second_boot_skips_everything(self):
+        first = self.boot()
+        self.assertIn('migrate: sărit', first)
+        self.assertIn('collectstatic: colectat', first)
+        self.assertIn('superuser: sărit', first)
+        self.assertEqual(boot.collected_fingerprint(), boot.static_fingerprint())
+        self.assertTrue(os.path.exists(os.path.join(self.static_root, 'admin', 'css', 'base.css')))
+
+        second = self.boot()
+        self.assertIn('collectstatic: sărit', second)
+
+        forced = self.boot('--force')
+        self.assertIn('collectstatic: colectat', forced)
+
+    def test_changed_fingerprint_collects_again(self):
+        self.boot()
+        boot.save_fingerprint('0' * 64)
+        self.assertIn('collectstatic: colectat', self.boot())
+        self.assertEqual(boot.collected_fingerprint(), boot.static_fingerprint())
+
+
+MANIFEST_STORAGES = {
+    **settings.STORAGES,
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'},
+}
+
+
+class StaticFingerprintTests(SimpleTestCase):
+    """Amprenta fișierelor statice și condițiile în care e considerată validă"""
+
+    def setUp(self):
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root)
+
+    def test_fingerprint_depends_on_storage_backend(self):
+        plain = boot.static_fingerprint()
+        self.assertEqual(boot.static_fingerprint(), plain)
+        with override_settings(STORAGES=MANIFEST_STORAGES):
+            self.assertNotEqual(boot.static_fingerprint(), plain)
+
+    def test_missing_manifest_invalidates_saved_fingerprint(self):
+        with override_settings(STATIC_ROOT=self.static_root, STORAGES=MANIFEST_STORAGES):
+            boot.save_fingerprint('abc')
+            self.assertIsNone(boot.collected_fingerprint())
+            with open(os.path.join(self.static_root, 'staticfiles.json'), 'w') as handle:
+                handle.write('{}')
+            self.assertEqual(boot.collected_fingerprint(), 'abc')
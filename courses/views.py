@@ -1,12 +1,14 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
+from mathcourses.query_budget import query_budget
 from .models import Course, Location, AgeGroup, Testimonial
 from .forms import DemoLessonForm, ContactForm
 
 
+@query_budget(3)
 def home(request):
-    featured_courses = Course.objects.filter(is_active=True, featured=True)[:3]
-    testimonials = Testimonial.objects.filter(is_approved=True)[:6]
+    featured_courses = Course.objects.filter(is_active=True, featured=True).select_related('age_group')[:3]
+    testimonials = Testimonial.objects.filter(is_approved=True).select_related('course')[:6]
     context = {
         'featured_courses': featured_courses,
         'testimonials': testimonials,
@@ -14,8 +16,9 @@ def home(request):
     return render(request, 'courses/home.html', context)
 
 
+@query_budget(5)
 def courses_list(request):
-    courses = Course.objects.filter(is_active=True)
+    courses = Course.objects.filter(is_active=True).select_related('age_group').prefetch_related('locations')
     locations = Location.objects.filter(is_active=True)
     age_groups = AgeGroup.objects.all()
 
@@ -38,8 +41,13 @@ def courses_list(request):
     return render(request, 'courses/courses_list.html', context)
 
 
+@query_budget(5)
 def course_detail(request, slug):
-    course = get_object_or_404(Course, slug=slug, is_active=True)
+    course = get_object_or_404(
+        Course.objects.select_related('age_group').prefetch_related('locations'),
+        slug=slug,
+        is_active=True
+    )
     testimonials = course.testimonials.filter(is_approved=True)
     recommended_courses = Course.objects.filter(
         is_active=True,
@@ -54,6 +62,7 @@ def course_detail(request, slug):
     return render(request, 'courses/course_detail.html', context)
 
 
+@query_budget(3)
 def demo_lesson(request):
     if request.method == 'POST':
         form = DemoLessonForm(request.POST)
@@ -69,6 +78,7 @@ def demo_lesson(request):
     return render(request, 'courses/demo_lesson.html', context)
 
 
+@query_budget(1)
 def contact(request):
     if request.method == 'POST':
         form = ContactForm(request.POST)
@@ -83,11 +93,13 @@ def contact(request):
     return render(request, 'courses/contact.html', context)
 
 
+@query_budget(2)
 def locations(request):
     all_locations = Location.objects.filter(is_active=True)
     context = {'locations': all_locations}
     return render(request, 'courses/locations.html', context)
 
 
+@query_budget(1)
 def terms(request):
     return render(request, 'courses/terms.html')
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Configurația gunicorn (citită automat din directorul de lucru).
+
+Metricile Prometheus ale workerilor sunt scrise în fișiere mapate în
+memorie din PROMETHEUS_MULTIPROC_DIR și agregate de /metrics. Directorul
+este golit la pornirea master-ului, iar fișierele workerilor opriți sunt
+marcate ca inactive.
+"""
+import os
+import shutil
+
+METRICS_DIR = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/mindacademy-metrics')
+
+
+def on_starting(server):
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)
+    os.makedirs(METRICS_DIR, exist_ok=True)
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,96 @@
+"""
+Metrici Prometheus: cereri și latență per nume de URL, interogări SQL per
+cerere și hit/miss pentru cache-urile aplicației.
+
+Cu mai mulți workeri gunicorn fiecare proces scrie valorile în fișiere
+mapate în memorie din PROMETHEUS_MULTIPROC_DIR (setat în gunicorn.conf.py),
+iar /metrics le agregă la citire. Endpoint-ul cere METRICS_TOKEN (antet
+"Authorization: Bearer <token>"; nu și în URL, unde ar ajunge în
+log-urile de acces); fără token configurat răspunde 404.
+
+prometheus_client este opțional: fără el middleware-ul nu se activează,
+record_cache nu face nimic, iar /metrics răspunde 503.
+"""
+import hmac
+import os
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+UNMATCHED_VIEW = '<unmatched>'
+
+if prometheus_client is not None:
+    REQUESTS = prometheus_client.Counter(
+        'mathcourses_http_requests_total', 'Cereri HTTP per nume de URL', ['view', 'method', 'status'],
+    )
+    LATENCY = prometheus_client.Histogram(
+        'mathcourses_http_request_duration_seconds', 'Durata cererilor HTTP', ['view'], buckets=LATENCY_BUCKETS,
+    )
+    QUERIES = prometheus_client.Histogram(
+        'mathcourses_db_queries_per_request', 'Interogări SQL per cerere', ['view'], buckets=QUERY_BUCKETS,
+    )
+    CACHE = prometheus_client.Counter(
+        'mathcourses_cache_requests_total', 'Citiri din cache-urile aplicației', ['namespace', 'result'],
+    )
+
+
+def available():
+    return prometheus_client is not None
+
+
+def view_label(request):
+    """Numele URL-ului (nu calea, ca numărul de serii să rămână mic)"""
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match and match.view_name else UNMATCHED_VIEW
+
+
+def observe_request(request, response, seconds, queries):
+    view = view_label(request)
+    REQUESTS.labels(view, request.method, str(response.status_code)).inc()
+    LATENCY.labels(view).observe(seconds)
+    QUERIES.labels(view).observe(queries)
+
+
+def record_cache(namespace, hits=0, misses=0):
+    """Numărul de chei găsite / lipsă la o citire din cache"""
+    if prometheus_client is None:
+        return
+    if hits:
+        CACHE.labels(namespace, 'hit').inc(hits)
+    if misses:
+        CACHE.labels(namespace, 'miss').inc(misses)
+
+
+def _authorized(request, token):
+    scheme, _, supplied = request.headers.get('Authorization', '').partition(' ')
+    if scheme != 'Bearer':
+        return False
+    return hmac.compare_digest(supplied.encode(), token.encode())
+
+
+def metrics_view(request):
+    """Expoziția Prometheus, agregată peste toți workerii"""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        raise Http404
+    if not _authorized(request, token):
+        response = HttpResponse('Unauthorized', status=401, content_type='text/plain')
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
+    if prometheus_client is None:
+        return HttpResponse('prometheus_client nu este instalat', status=503, content_type='text/plain')
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return HttpResponse(prometheus_client.generate_latest(registry), content_type=prometheus_client.CONTENT_TYPE_LATEST)
@@ -0,0 +1,232 @@
+"""
+Middleware de diagnostic pentru proiect.
+
+ServerTimingMiddleware măsoară, pentru un eșantion de cereri
+(SERVER_TIMING_SAMPLE_RATE), timpul SQL și numărul de interogări, timpul de
+randare a template-urilor și durata totală. Rezultatul este trimis în
+antetul Server-Timing (vizibil în DevTools) și ca o linie JSON în logger-ul
+mathcourses.timing.
+
+MetricsMiddleware alimentează metricile Prometheus (mathcourses.metrics):
+număr de cereri, latență și interogări SQL per nume de URL.
+
+ProfilingMiddleware rulează sub cProfile cererile pentru care un
+utilizator staff cere explicit profilarea (?_profile=1 sau antetul
+X-Profile: 1) și salvează profilul și log-ul SQL (mathcourses.profiling).
+
+SlowQueryMiddleware scrie în log interogările care depășesc SLOW_QUERY_MS,
+cu view-ul, parametrii, linia din cod și planul EXPLAIN
+(mathcourses.slowqueries).
+
+NPlusOneMiddleware (doar development, DEBUG=True și NPLUSONE_ENABLED)
+înregistrează toate interogările SQL ale cererii, le normalizează și
+raportează interogările repetate (semnătura N+1) cu linia din cod și din
+template de unde pornesc: în antetele X-NPlusOne-* ale răspunsului și în
+fișierul NPLUSONE_LOG_FILE.
+"""
+import cProfile
+import json
+import logging
+import os
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+
+from . import metrics, profiling
+from .slowqueries import SlowQueryLog
+from .sqlinspect import QueryRecorder
+from .timing import RequestTiming, current_timing
+
+logger = logging.getLogger('mathcourses.nplusone')
+timing_logger = logging.getLogger('mathcourses.timing')
+slow_query_logger = logging.getLogger('mathcourses.slowqueries')
+
+# Numărul maxim de constatări trimise ca antete (toate ajung în fișier)
+MAX_FINDING_HEADERS = 5
+
+
+def _add_file_handler(target, path, fmt='%(message)s'):
+    """Fișierul de log al unui instrument (o singură dată per proces)"""
+    if not path or any(getattr(handler, 'baseFilename', None) == os.path.abspath(path) for handler in target.handlers):
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    handler = logging.FileHandler(path, encoding='utf-8', delay=True)
+    handler.setFormatter(logging.Formatter(fmt))
+    target.addHandler(handler)
+    target.setLevel(logging.INFO)
+
+
+def _header_value(text):
+    """Antetele HTTP acceptă doar ASCII pe o singură linie"""
+    return ' '.join(text.split()).encode('ascii', 'backslashreplace').decode('ascii')
+
+
+class ServerTimingMiddleware:
+    def __init__(self, get_response):
+        self.sample_rate = getattr(settings, 'SERVER_TIMING_SAMPLE_RATE', 0.0)
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.send_header = getattr(settings, 'SERVER_TIMING_HEADER', True)
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(timing))
+                response = self.get_response(request)
+        finally:
+            current_timing.reset(token)
+
+        # Pentru răspunsurile streaming conținutul (și SQL-ul lui) se
+        # generează după acest punct și nu este inclus
+        metrics = timing.metrics()
+        if self.send_header:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={metrics["db"]};desc="{timing.db_queries} queries"',
+                f'tpl;dur={metrics["tpl"]}',
+                f'app;dur={metrics["app"]}',
+                f'total;dur={metrics["total"]}',
+            ])
+
+        match = request.resolver_match
+        timing_logger.info(json.dumps({
+            'ts': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'route': match.route if match else None,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'db_queries': timing.db_queries,
+            'db_ms': metrics['db'],
+            'template_ms': metrics['tpl'],
+            'app_ms': metrics['app'],
+            'total_ms': metrics['total'],
+            'streaming': response.streaming,
+        }))
+        return response
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        if not metrics.available():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(count_queries))
+            response = self.get_response(request)
+        metrics.observe_request(request, response, time.perf_counter() - started, queries)
+        return response
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profiling.is_requested(request):
+            return self.get_response(request)
+
+        sql_log = profiling.SQLLog()
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(sql_log))
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        # Conținutul răspunsurilor streaming se generează mai târziu și nu
+        # apare în profil
+        response['X-Profile-Id'] = profiling.save_profile(profiler, request, response, duration_ms, sql_log)
+        return response
+
+
+class SlowQueryMiddleware:
+    def __init__(self, get_response):
+        self.threshold_ms = getattr(settings, 'SLOW_QUERY_MS', 0)
+        if self.threshold_ms <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.explain = getattr(settings, 'SLOW_QUERY_EXPLAIN', True)
+        self.log_params = getattr(settings, 'SLOW_QUERY_LOG_PARAMS', False)
+        _add_file_handler(slow_query_logger, getattr(settings, 'SLOW_QUERY_LOG_FILE', None))
+
+    def __call__(self, request):
+        # Ca la Server-Timing: SQL-ul conținutului streaming nu este inclus
+        with ExitStack() as stack:
+            for alias in connections:
+                connection = connections[alias]
+                stack.enter_context(connection.execute_wrapper(
+                    SlowQueryLog(request, connection, self.threshold_ms, self.explain, self.log_params)
+                ))
+            return self.get_response(request)
+
+
+class NPlusOneMiddleware:
+    def __init__(self, get_response):
+        if not (settings.DEBUG and getattr(settings, 'NPLUSONE_ENABLED', False)):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'NPLUSONE_THRESHOLD', 3)
+        _add_file_handler(logger, getattr(settings, 'NPLUSONE_LOG_FILE', None), '%(asctime)s %(message)s')
+
+    def __call__(self, request):
+        # Interogările din conținutul streaming (export CSV, feed-uri) rulează
+        # după ce răspunsul părăsește middleware-ul și nu sunt numărate
+        with QueryRecorder() as recorder:
+            request._nplusone_recorder = recorder
+            response = self.get_response(request)
+
+        findings = recorder.findings(self.threshold)
+        response['X-NPlusOne-Queries'] = str(len(recorder))
+        response['X-NPlusOne-Findings'] = str(len(findings))
+        for index, finding in enumerate(findings[:MAX_FINDING_HEADERS], start=1):
+            origin = ' | '.join(part for part in (finding.code, finding.template) if part)
+            response[f'X-NPlusOne-{index}'] = _header_value(f'{finding.count}x {finding.kind} {origin} | {finding.normalized[:200]}')
+
+        if findings:
+            lines = [f'{request.method} {request.get_full_path()} -> {response.status_code}: '
+                     f'{len(recorder)} interogări, {len(findings)} repetate']
+            for finding in findings:
+                lines.append(f'  [{finding.count}x {finding.kind}] {finding.normalized}')
+                if finding.code:
+                    lines.append(f'      cod: {finding.code}')
+                if finding.template:
+                    lines.append(f'      template: {finding.template}')
+            logger.warning('\n'.join(lines))
+        return response
+
+    def process_exception(self, request, exception):
+        # Pagina de eroare din DEBUG afișează variabilele locale (querysets
+        # evaluate din nou); interogările ei nu aparțin view-ului
+        recorder = getattr(request, '_nplusone_recorder', None)
+        if recorder is not None:
+            recorder.recording = False
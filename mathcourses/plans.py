@@ -0,0 +1,115 @@
+"""
+Snapshot-uri ale planurilor de execuție pentru interogările critice.
+
+O interogare critică este o funcție fără argumente care rulează codul real
+(ex. lambda: roster_page(teacher)); toate interogările SQL executate de ea
+sunt înregistrate, normalizate (normalize_sql) și trecute prin
+EXPLAIN QUERY PLAN. Snapshot-ul (JSON, versionat) conține pentru fiecare
+nume lista de {sql, plan}.
+
+PlanSnapshotTestCase compară rularea curentă cu snapshot-ul și eșuează
+când forma SQL-ului se schimbă sau când un plan începe să citească integral
+(SCAN fără index) un tabel care înainte era căutat prin index. Alte
+schimbări de plan (ex. alt index) nu sunt erori. Snapshot-ul se
+regenerează cu comanda refresh_plan_snapshots.
+"""
+import json
+import re
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from .slowqueries import explain
+from .sqlinspect import QueryRecorder
+
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# "SCAN tabel" fără "USING ... INDEX" = citire integrală a tabelului
+_FULL_SCAN = re.compile(r'^\s*SCAN (?!CONSTANT ROW)(\w+)(?: AS \w+)?\s*$')
+
+
+def capture(func):
+    """[{sql, plan}] pentru fiecare interogare executată de `func` (planul doar pentru SELECT)"""
+    with QueryRecorder(origins=False) as recorder:
+        func()
+    captured = []
+    for query in recorder.queries:
+        is_select = query.sql.lstrip()[:6].upper() == 'SELECT'
+        plan = explain(connection, query.sql, query.params) if is_select else None
+        captured.append({'sql': query.normalized, 'plan': plan})
+    return captured
+
+
+def capture_all(hot_queries):
+    """{nume: capture(funcție)} în ordinea numelor"""
+    return {name: capture(hot_queries[name]) for name in sorted(hot_queries)}
+
+
+def full_scans(plan):
+    """Tabelele citite integral într-un plan"""
+    return {match.group(1) for match in map(_FULL_SCAN.match, plan or []) if match}
+
+
+def compare(name, expected, actual):
+    """Lista diferențelor care sunt regresii (goală dacă interogarea e în regulă)"""
+    if expected is None:
+        return [f'{name}: lipsește din snapshot']
+    if [query['sql'] for query in expected] != [query['sql'] for query in actual]:
+        lines = [f'{name}: forma SQL s-a schimbat']
+        lines += [f'  - {query["sql"]}' for query in expected]
+        lines += [f'  + {query["sql"]}' for query in actual]
+        return lines
+
+    problems = []
+    for index, (before, after) in enumerate(zip(expected, actual), start=1):
+        new_scans = full_scans(after['plan']) - full_scans(before['plan'])
+        if new_scans:
+            problems.append(f'{name} #{index}: citire integrală pentru {", ".join(sorted(new_scans))}')
+            problems.append(f'  SQL: {after["sql"]}')
+            problems += [f'  înainte: {line}' for line in before['plan'] or []]
+            problems += [f'  acum:    {line}' for line in after['plan'] or []]
+    return problems
+
+
+def load_snapshot(path):
+    try:
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+
+
+def save_snapshot(path, snapshot):
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(snapshot, handle, ensure_ascii=False, indent=2)
+        handle.write('\n')
+
+
+@override_settings(CACHES=TEST_CACHES, SLOW_QUERY_MS=0)
+class PlanSnapshotTestCase(TestCase):
+    """
+    Subclasele setează snapshot_path și implementează build_world() și
+    hot_queries(world) -> {nume: funcție fără argumente}.
+    """
+    snapshot_path = None
+
+    def build_world(self):
+        raise NotImplementedError
+
+    def hot_queries(self, world):
+        raise NotImplementedError
+
+    def test_query_plans(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Snapshot-urile sunt generate pe SQLite')
+        world = self.build_world()
+        snapshot = load_snapshot(self.snapshot_path)
+        problems = []
+        for name, captured in capture_all(self.hot_queries(world)).items():
+            problems += compare(name, snapshot.get(name), captured)
+        if problems:
+            self.fail(
+                'Planurile interogărilor critice diferă de snapshot '
+                '(dacă schimbarea este intenționată: python manage.py refresh_plan_snapshots):\n'
+                + '\n'.join(problems)
+            )
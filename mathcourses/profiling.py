@@ -0,0 +1,202 @@
+"""
+Profilarea la cerere a unei cereri, pentru staff.
+
+Un utilizator staff adaugă ?_profile=1 la URL (sau trimite antetul
+"X-Profile: 1"), iar ProfilingMiddleware rulează cererea sub cProfile și
+înregistrează toate interogările SQL (durată, parametri, linia din cod).
+Rezultatul este salvat în PROFILE_DIR ca <id>.prof (format pstats, deschis
+cu snakeviz / python -m pstats) și <id>.json (detaliile cererii și SQL-ul);
+se păstrează doar ultimele PROFILE_RETENTION profiluri.
+
+Paginile din admin (/admin/profiles/) listează profilurile, afișează
+primele funcții după timpul cumulat și oferă descărcarea fișierului .prof.
+"""
+import io
+import json
+import os
+import pstats
+import re
+import secrets
+import time
+
+from django.conf import settings
+from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+from django.utils import timezone
+
+from .sqlinspect import query_origin
+
+QUERY_PARAM = '_profile'
+HEADER = 'X-Profile'
+SORT_KEYS = {'cumulative': 'timp cumulat', 'tottime': 'timp propriu', 'ncalls': 'număr de apeluri'}
+# Data și ora (cu microsecunde) în id: ordinea alfabetică este cea cronologică
+_PROFILE_ID = re.compile(r'^\d{8}-\d{6}-\d{6}-[0-9a-f]{4}$')
+
+
+def profile_dir():
+    return str(getattr(settings, 'PROFILE_DIR', settings.BASE_DIR / 'logs' / 'profiles'))
+
+
+def is_requested(request):
+    """Cererea cere profilare și utilizatorul are voie (doar staff)"""
+    if request.GET.get(QUERY_PARAM) != '1' and request.headers.get(HEADER) != '1':
+        return False
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_active and user.is_staff)
+
+
+class SQLLog:
+    """execute_wrapper: fiecare interogare cu parametrii, durata și originea din cod"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            code, template = query_origin()
+            self.queries.append({
+                'sql': sql,
+                'params': repr(params)[:1000],
+                'ms': round((time.perf_counter() - started) * 1000, 3),
+                'code': code,
+                'template': template,
+            })
+
+
+# ==================== STOCARE ====================
+
+def _path(profile_id, extension):
+    if not _PROFILE_ID.match(profile_id):
+        raise Http404
+    return os.path.join(profile_dir(), f'{profile_id}.{extension}')
+
+
+def save_profile(profiler, request, response, duration_ms, sql_log):
+    """Scrie .prof și .json, aplică limita de retenție și întoarce id-ul"""
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    now = timezone.now()
+    profile_id = f'{timezone.localtime(now):%Y%m%d-%H%M%S-%f}-{secrets.token_hex(2)}'
+
+    profiler.dump_stats(_path(profile_id, 'prof'))
+    match = request.resolver_match
+    meta = {
+        'id': profile_id,
+        'created': now.isoformat(),
+        'user': request.user.get_username(),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'view': match.view_name if match else None,
+        'status': response.status_code,
+        'duration_ms': round(duration_ms, 2),
+        'db_ms': round(sum(query['ms'] for query in sql_log.queries), 2),
+        'queries': sql_log.queries,
+    }
+    with open(_path(profile_id, 'json'), 'w', encoding='utf-8') as handle:
+        json.dump(meta, handle, ensure_ascii=False, indent=1)
+
+    prune(getattr(settings, 'PROFILE_RETENTION', 50))
+    return profile_id
+
+
+def prune(keep):
+    """Șterge profilurile cele mai vechi peste limita `keep`"""
+    for profile_id in list_profile_ids()[keep:]:
+        for extension in ('prof', 'json'):
+            try:
+                os.remove(_path(profile_id, extension))
+            except FileNotFoundError:  # șters deja de alt worker
+                pass
+
+
+def list_profile_ids():
+    """Id-urile profilurilor salvate, cele mai noi primele"""
+    try:
+        names = os.listdir(profile_dir())
+    except FileNotFoundError:
+        return []
+    ids = {name[:-len('.json')] for name in names if name.endswith('.json')}
+    return sorted((profile_id for profile_id in ids if _PROFILE_ID.match(profile_id)), reverse=True)
+
+
+def load_meta(profile_id):
+    try:
+        with open(_path(profile_id, 'json'), encoding='utf-8') as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        raise Http404
+
+
+def summary(profile_id, sort='cumulative', limit=40):
+    """Tabelul pstats: primele `limit` funcții după criteriul `sort`"""
+    stream = io.StringIO()
+    try:
+        stats = pstats.Stats(_path(profile_id, 'prof'), stream=stream)
+    except FileNotFoundError:
+        raise Http404
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+# ==================== ADMIN ====================
+
+@admin.site.admin_view
+def profiles_list(request):
+    """Lista profilurilor salvate"""
+    profiles = []
+    for profile_id in list_profile_ids():
+        try:
+            meta = load_meta(profile_id)
+        except (Http404, ValueError):  # șters sau încă în scriere
+            continue
+        meta['query_count'] = len(meta.pop('queries'))
+        profiles.append(meta)
+
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Profiluri cereri',
+        'profiles': profiles,
+        'retention': getattr(settings, 'PROFILE_RETENTION', 50),
+        'query_param': QUERY_PARAM,
+        'header': HEADER,
+    }
+    return render(request, 'admin/profiles/list.html', context)
+
+
+@admin.site.admin_view
+def profile_detail(request, profile_id):
+    """Top N funcții și log-ul SQL al unui profil"""
+    sort = request.GET.get('sort', 'cumulative')
+    if sort not in SORT_KEYS:
+        sort = 'cumulative'
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 40)), 500))
+    except ValueError:
+        limit = 40
+
+    meta = load_meta(profile_id)
+    context = {
+        **admin.site.each_context(request),
+        'title': f'Profil {profile_id}',
+        'profile': meta,
+        'summary': summary(profile_id, sort, limit),
+        'sort': sort,
+        'sort_label': SORT_KEYS[sort],
+        'sort_keys': SORT_KEYS,
+        'limit': limit,
+    }
+    return render(request, 'admin/profiles/detail.html', context)
+
+
+@admin.site.admin_view
+def profile_download(request, profile_id):
+    """Fișierul .prof (pstats) ca atașament"""
+    path = _path(profile_id, 'prof')
+    if not os.path.exists(path):
+        raise Http404
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'{profile_id}.prof',
+                        content_type='application/octet-stream')
@@ -0,0 +1,102 @@
+"""
+Bugete de interogări SQL per view.
+
+Bugetul se declară lângă view, ca decorator exterior:
+
+    @query_budget(8)
+    @login_required
+    @teacher_required
+    def group_detail(request, group_id):
+
+QueryBudgetTestCase randează fiecare view pe două seturi de date, de
+mărime N și 10N, și verifică că numărul de interogări nu crește cu N și nu
+depășește bugetul. La eșec mesajul conține interogările care s-au
+înmulțit, cu SQL-ul concret, linia din cod și linia din template de unde
+pornesc.
+"""
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import resolve, reverse
+
+from .sqlinspect import QueryRecorder
+
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def query_budget(queries):
+    """Numărul maxim de interogări ale view-ului, indiferent de volumul datelor"""
+    def decorator(view_func):
+        view_func.query_budget = queries
+        return view_func
+    return decorator
+
+
+def _describe(recorder, normalized, count, previous=None):
+    example = recorder.example(normalized)
+    growth = f'{previous} -> {count}' if previous is not None else f'{count}'
+    lines = [f'  [{growth}x] {example.sql}']
+    if example.code:
+        lines.append(f'      cod: {example.code}')
+    if example.template:
+        lines.append(f'      template: {example.template}')
+    return '\n'.join(lines)
+
+
+@override_settings(CACHES=TEST_CACHES, SERVER_TIMING_SAMPLE_RATE=0, SLOW_QUERY_MS=0)
+class QueryBudgetTestCase(TestCase):
+    """
+    Subclasele implementează build_world(size) (datele pentru un profesor /
+    un catalog de mărime `size`) și view_requests(world), care returnează
+    tupluri (nume URL, kwargs, query GET, utilizator sau None).
+    """
+    size = 2
+    factor = 10
+
+    def build_world(self, size):
+        raise NotImplementedError
+
+    def view_requests(self, world):
+        raise NotImplementedError
+
+    def record(self, name, kwargs, query, user):
+        url = reverse(name, kwargs=kwargs)
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        # Cache rece: ambele seturi de date plătesc aceleași interogări
+        cache.clear()
+        with QueryRecorder() as recorder:
+            response = client.get(url, query)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        return name, url, response, recorder
+
+    def test_query_budgets(self):
+        # Setul mic este măsurat înainte de a crea setul mare (paginile
+        # publice listează toate rândurile, nu doar pe cele ale unui profesor)
+        small = [self.record(*request) for request in self.view_requests(self.build_world(self.size))]
+        large = [self.record(*request) for request in self.view_requests(self.build_world(self.size * self.factor))]
+        self.assertEqual([result[0] for result in small], [result[0] for result in large])
+
+        for (name, _, small_response, small_queries), (_, url, large_response, large_queries) in zip(small, large):
+            with self.subTest(view=name):
+                self.assertEqual(large_response.status_code, 200, f'{name}: status {large_response.status_code}')
+
+                if len(large_queries) != len(small_queries):
+                    before = small_queries.counts()
+                    grown = [
+                        (sql, count) for sql, count in large_queries.counts().most_common()
+                        if count > before.get(sql, 0)
+                    ]
+                    self.fail(
+                        f'{name}: numărul de interogări crește cu datele '
+                        f'({len(small_queries)} la N={self.size}, {len(large_queries)} la N={self.size * self.factor}):\n'
+                        + '\n'.join(_describe(large_queries, sql, count, before.get(sql, 0)) for sql, count in grown)
+                    )
+                budget = getattr(resolve(url).func, 'query_budget', None)
+                self.assertIsNotNone(budget, f'{name}: view-ul nu are @query_budget ({len(large_queries)} interogări)')
+                if len(large_queries) > budget:
+                    self.fail(
+                        f'{name}: {len(large_queries)} interogări, bugetul este {budget}:\n'
+                        + '\n'.join(_describe(large_queries, sql, count) for sql, count in large_queries.counts().most_common())
+                    )
@@ -43,6 +43,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'mathcourses.middleware.ServerTimingMiddleware',  # primul: durata totală include restul
+    'mathcourses.middleware.MetricsMiddleware',  # metrici Prometheus (dacă prometheus_client e instalat)
+    'mathcourses.middleware.SlowQueryMiddleware',  # interogări peste SLOW_QUERY_MS, cu EXPLAIN
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # WhiteNoise for static files in production
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -51,13 +54,15 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'mathcourses.middleware.ProfilingMiddleware',  # după autentificare: doar staff, la cerere
+    'mathcourses.middleware.NPlusOneMiddleware',  # doar cu DEBUG și NPLUSONE_ENABLED
 ]
 
 ROOT_URLCONF = 'mathcourses.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'mathcourses.timing.TimedDjangoTemplates',  # DjangoTemplates + timp de randare
         'DIRS': [BASE_DIR / 'templates'],  # ACTUALIZAT
         'APP_DIRS': True,
         'OPTIONS': {
@@ -135,6 +140,72 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# ==================== CACHE ====================
+# Implicit LocMem (per proces). Invalidările (generațiile din caching.py) ajung
+# la toți workerii gunicorn doar printr-un cache partajat, deci în producție cu
+# mai mulți workeri: CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# și CACHE_LOCATION=redis://... Cache-ul pe fișiere nu este recomandat: fiecare
+# scriere listează tot directorul ca să decidă ștergerea cheilor vechi.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+# Backend-urile Django cu limită proprie păstrează implicit doar 300 de chei și
+# șterg o treime la depășire; calendarul are o cheie per profesor și lună
+if CACHES['default']['BACKEND'].rsplit('.', 1)[-1] in ('LocMemCache', 'DatabaseCache'):
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=50000, cast=int)}
+
+# ==================== SERVER-TIMING ====================
+# Fracțiunea cererilor măsurate (0 = dezactivat, 1 = toate): timp SQL,
+# template și total în antetul Server-Timing și ca linie JSON în log.
+# Implicit dezactivat, și în DEBUG; se activează explicit din .env
+SERVER_TIMING_SAMPLE_RATE = config('SERVER_TIMING_SAMPLE_RATE', default=0.0, cast=float)
+SERVER_TIMING_HEADER = config('SERVER_TIMING_HEADER', default=True, cast=bool)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'timing': {'class': 'logging.StreamHandler', 'formatter': 'message'},
+    },
+    'loggers': {
+        'mathcourses.timing': {'handlers': ['timing'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# ==================== METRICI PROMETHEUS ====================
+# /metrics cere acest token (Authorization: Bearer ...); gol = endpoint dezactivat.
+# Agregarea între workeri: PROMETHEUS_MULTIPROC_DIR, setat în gunicorn.conf.py
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# ==================== INTEROGĂRI LENTE ====================
+# Interogările peste prag (ms) sunt scrise ca JSON în SLOW_QUERY_LOG_FILE, cu
+# planul EXPLAIN pentru SELECT (PostgreSQL / SQLite); 0 = dezactivat.
+# Raport: python manage.py slow_query_report
+SLOW_QUERY_MS = config('SLOW_QUERY_MS', default=200, cast=float)
+SLOW_QUERY_EXPLAIN = config('SLOW_QUERY_EXPLAIN', default=True, cast=bool)
+SLOW_QUERY_LOG_PARAMS = config('SLOW_QUERY_LOG_PARAMS', default=False, cast=bool)  # pot conține hash-uri de parole
+SLOW_QUERY_LOG_FILE = config('SLOW_QUERY_LOG_FILE', default=str(BASE_DIR / 'logs' / 'slow_queries.log'))
+
+# ==================== PROFILARE LA CERERE ====================
+# Staff: ?_profile=1 sau antetul "X-Profile: 1" -> profil cProfile + log SQL,
+# vizibile în /admin/profiles/. Se păstrează ultimele PROFILE_RETENTION.
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=True, cast=bool)
+PROFILE_DIR = config('PROFILE_DIR', default=str(BASE_DIR / 'logs' / 'profiles'))
+PROFILE_RETENTION = config('PROFILE_RETENTION', default=50, cast=int)
+
+# ==================== DETECTOR N+1 (development) ====================
+# Raportează interogările repetate ale fiecărei cereri (antete X-NPlusOne-*
+# și fișierul de log). Ignorat complet când DEBUG=False.
+NPLUSONE_ENABLED = config('NPLUSONE_ENABLED', default=DEBUG, cast=bool)
+NPLUSONE_THRESHOLD = config('NPLUSONE_THRESHOLD', default=3, cast=int)  # execuții ale aceleiași interogări
+NPLUSONE_LOG_FILE = config('NPLUSONE_LOG_FILE', default=str(BASE_DIR / 'logs' / 'nplusone.log'))
+
 # ==================== CUSTOM USER MODEL ====================
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -164,6 +235,9 @@ SESSION_SAVE_EVERY_REQUEST = True
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 
+# Fire pentru hash-urile parolelor la importul de elevi (PBKDF2 eliberează GIL-ul)
+STUDENT_IMPORT_HASH_WORKERS = config('STUDENT_IMPORT_HASH_WORKERS', default=4, cast=int)
+
 # ==================== CUSTOM SETTINGS ====================
 MINDACADEMY_SETTINGS = {
     'DEFAULT_STUDENT_PASSWORD': 'mindacademy',
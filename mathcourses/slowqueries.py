@@ -0,0 +1,159 @@
+"""
+Log-ul interogărilor lente.
+
+SlowQueryLog (execute_wrapper instalat de SlowQueryMiddleware pe fiecare
+conexiune) cronometrează fiecare interogare a cererii; cele peste
+SLOW_QUERY_MS sunt scrise ca o linie JSON în logger-ul
+mathcourses.slowqueries (fișierul SLOW_QUERY_LOG_FILE): view-ul, SQL-ul,
+durata, cea mai apropiată linie din codul aplicației (în afara Django) și,
+pentru SELECT pe PostgreSQL / SQLite, planul EXPLAIN. Parametrii legați pot
+conține date personale sau hash-uri de parole, deci intră în log doar cu
+SLOW_QUERY_LOG_PARAMS=True.
+
+Comanda slow_query_report agregă fișierul pe amprente de interogare
+(normalize_sql) ordonate după timpul total.
+"""
+import json
+import logging
+import time
+
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .sqlinspect import normalize_sql, query_origin
+
+logger = logging.getLogger('mathcourses.slowqueries')
+
+EXPLAIN_PREFIXES = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+}
+MAX_PARAMS_LENGTH = 2000
+
+
+def _explain_rows(connection, sql, params):
+    """
+    Rulează EXPLAIN pe cursorul driverului, fără execute_wrappers: EXPLAIN-ul
+    și savepoint-ul lui nu sunt numărate de Server-Timing / metrici / profiler.
+    """
+    with connection.cursor() as wrapper, connection.wrap_database_errors:
+        cursor = wrapper.cursor
+        if not connection.in_atomic_block:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+        # Savepoint: un EXPLAIN eșuat nu trebuie să anuleze tranzacția cererii
+        cursor.execute('SAVEPOINT mathcourses_explain')
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        except Exception:
+            cursor.execute('ROLLBACK TO SAVEPOINT mathcourses_explain')
+            raise
+        finally:
+            cursor.execute('RELEASE SAVEPOINT mathcourses_explain')
+
+
+def explain(connection, sql, params):
+    """Planul interogării ca listă de linii (None dacă nu se poate obține)"""
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None:
+        return None
+    try:
+        rows = _explain_rows(connection, prefix + sql, params)
+    except DatabaseError:
+        return None
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail): indentarea urmează arborele planului
+        depth = {0: -1}
+        lines = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, -1) + 1
+            lines.append('  ' * depth[node_id] + detail)
+        return lines
+    return [row[0] for row in rows]
+
+
+class SlowQueryLog:
+    """execute_wrapper: interogările peste `threshold_ms` ajung în log"""
+
+    def __init__(self, request, connection, threshold_ms, explain_plans=True, log_params=False):
+        self.request = request
+        self.connection = connection
+        self.threshold_ms = threshold_ms
+        self.explain_plans = explain_plans
+        self.log_params = log_params
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            if elapsed >= self.threshold_ms:
+                self.record(sql, params, many, elapsed)
+
+    def record(self, sql, params, many, elapsed):
+        code, template = query_origin()
+        plan = None
+        if self.explain_plans and not many and sql.lstrip()[:6].upper() == 'SELECT':
+            plan = explain(self.connection, sql, params)
+
+        match = getattr(self.request, 'resolver_match', None)
+        logger.warning(json.dumps({
+            'ts': timezone.now().isoformat(),
+            'db': self.connection.alias,
+            'view': match.view_name if match else None,
+            'method': self.request.method,
+            'path': self.request.path,
+            'ms': round(elapsed, 2),
+            'sql': sql,
+            'params': repr(params)[:MAX_PARAMS_LENGTH] if self.log_params else None,
+            'many': many,
+            'code': code,
+            'template': template,
+            'explain': plan,
+        }, ensure_ascii=False))
+
+
+def read_log(path):
+    """Înregistrările din fișierul de log (liniile invalide sunt ignorate)"""
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            start = line.find('{')
+            if start < 0:
+                continue
+            try:
+                yield json.loads(line[start:])
+            except ValueError:
+                continue
+
+
+def aggregate(entries):
+    """
+    Statistici per amprentă (SQL normalizat), ordonate după timpul total:
+    număr, total / medie / maxim (ms), view-urile și originile din cod,
+    plus cea mai lentă execuție (SQL concret, parametri, plan)
+    """
+    groups = {}
+    for entry in entries:
+        fingerprint = normalize_sql(entry['sql'])
+        group = groups.setdefault(fingerprint, {
+            'fingerprint': fingerprint, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+            'views': {}, 'origins': {}, 'slowest': None,
+        })
+        group['count'] += 1
+        group['total_ms'] += entry['ms']
+        if entry['ms'] >= group['max_ms']:
+            group['max_ms'] = entry['ms']
+            group['slowest'] = entry
+        view = entry.get('view') or '-'
+        group['views'][view] = group['views'].get(view, 0) + 1
+        if entry.get('code'):
+            group['origins'][entry['code']] = group['origins'].get(entry['code'], 0) + 1
+
+    report = sorted(groups.values(), key=lambda group: group['total_ms'], reverse=True)
+    for group in report:
+        group['total_ms'] = round(group['total_ms'], 2)
+        group['mean_ms'] = round(group['total_ms'] / group['count'], 2)
+    return report
@@ -0,0 +1,148 @@
+"""
+Utilitare pentru inspectarea interogărilor SQL ale unei cereri.
+
+QueryRecorder înregistrează (prin connection.execute_wrapper) fiecare
+interogare împreună cu originea ei: linia din codul proiectului și, dacă
+interogarea pornește dintr-un template, tag-ul / variabila de pe linia
+respectivă. normalize_sql aduce interogările la o formă comună (fără
+valori literale), astfel încât aceeași interogare repetată per rând să
+poată fi numărată.
+"""
+import os
+import re
+import sys
+from collections import Counter, namedtuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+RecordedQuery = namedtuple('RecordedQuery', ['sql', 'params', 'normalized', 'code', 'template'])
+# kind: 'n+1' (aceeași interogare cu parametri diferiți) sau 'duplicate' (identică)
+Finding = namedtuple('Finding', ['kind', 'count', 'normalized', 'example', 'code', 'template'])
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_IN_LIST = re.compile(r'\bIN \(\?(?:, \?)*\)', re.IGNORECASE)
+_SPACES = re.compile(r'\s+')
+# Savepoint-urile (transaction.atomic imbricat, ex. salvarea sesiunii) nu sunt
+# interogări de date și apar sau nu în funcție de starea tranzacției
+_TRANSACTION_CONTROL = re.compile(r'^\s*(?:SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b', re.IGNORECASE)
+
+_PROJECT_DIR = str(settings.BASE_DIR) + os.sep
+# Fișierele instrumentelor de diagnostic nu sunt raportate ca origine
+_TOOLING_FILES = {
+    os.path.abspath(__file__),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'middleware.py'),
+}
+
+
+def normalize_sql(sql):
+    """SQL fără literali și cu listele IN (...) comprimate"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+def _is_project_frame(filename):
+    return (
+        filename.startswith(_PROJECT_DIR)
+        and filename not in _TOOLING_FILES
+        and 'site-packages' not in filename
+    )
+
+
+def query_origin(frame=None):
+    """
+    (cod, template) pentru interogarea curentă: primul cadru din proiect
+    ('fișier:linie în funcție') și cel mai adânc nod de template aflat în
+    randare ('template:linie {% tag %}'); None unde nu există
+    """
+    frame = frame or sys._getframe(1)
+    # Cadrele dintre cursor.execute și execute_wrapper-e (ex. cel al
+    # benchmark-ului) aparțin lanțului de wrapper-e, nu apelantului
+    caller = frame
+    while caller is not None and caller.f_code.co_name != '_execute_with_wrappers':
+        caller = caller.f_back
+    frame = caller.f_back if caller is not None else frame
+
+    code = template = None
+    while frame is not None and (code is None or template is None):
+        filename = frame.f_code.co_filename
+        if code is None and _is_project_frame(filename):
+            code = f'{os.path.relpath(filename, _PROJECT_DIR)}:{frame.f_lineno} în {frame.f_code.co_name}'
+        if template is None and frame.f_code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            token = getattr(node, 'token', None)
+            origin = getattr(node, 'origin', None)
+            if token is not None and origin is not None:
+                source = f'{{{{ {token.contents} }}}}' if token.token_type.name == 'VAR' else f'{{% {token.contents} %}}'
+                template = f'{origin.template_name or origin.name}:{token.lineno} {source}'
+        frame = frame.f_back
+    return code, template
+
+
+class QueryRecorder:
+    """
+    Context manager care înregistrează interogările executate pe o conexiune
+    (fără savepoint-uri):
+
+        with QueryRecorder() as recorder:
+            client.get(url)
+        recorder.repeated()  # interogările executate de mai multe ori
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, origins=True):
+        self.connection = connections[using]
+        self.origins = origins
+        self.queries = []
+        self.recording = True
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        if not self.recording or _TRANSACTION_CONTROL.match(sql):
+            return execute(sql, params, many, context)
+        code, template = query_origin(sys._getframe(1)) if self.origins else (None, None)
+        self.queries.append(RecordedQuery(sql, params, normalize_sql(sql), code, template))
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+        self._wrapper = None
+
+    def __len__(self):
+        return len(self.queries)
+
+    def counts(self):
+        """Counter: SQL normalizat -> numărul de execuții"""
+        return Counter(query.normalized for query in self.queries)
+
+    def repeated(self, threshold=2):
+        """[(SQL normalizat, număr)] pentru interogările repetate de cel puțin `threshold` ori"""
+        return [(sql, count) for sql, count in self.counts().most_common() if count >= threshold]
+
+    def example(self, normalized):
+        """Prima execuție a unei interogări normalizate (pentru SQL-ul concret și origine)"""
+        return next(query for query in self.queries if query.normalized == normalized)
+
+    def findings(self, threshold=3):
+        """
+        Interogările repetate de cel puțin `threshold` ori, cele mai
+        frecvente primele. Originea raportată este cea mai frecventă
+        pereche (cod, template) dintre execuții.
+        """
+        found = []
+        for normalized, count in self.repeated(threshold):
+            executions = [query for query in self.queries if query.normalized == normalized]
+            distinct = {(query.sql, repr(query.params)) for query in executions}
+            (code, template), _ = Counter((query.code, query.template) for query in executions).most_common(1)[0]
+            kind = 'duplicate' if len(distinct) == 1 else 'n+1'
+            found.append(Finding(kind, count, normalized, executions[0], code, template))
+        return found
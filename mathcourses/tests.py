@@ -0,0 +1,234 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock, skipUnless
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connection, transaction
+from django.http import Http404, HttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.client import RequestFactory
+from django.urls import reverse
+
+from accounts.models import User
+
+from . import metrics, profiling
+from .middleware import NPlusOneMiddleware, ServerTimingMiddleware, SlowQueryMiddleware
+from .slowqueries import aggregate, explain, read_log
+from .sqlinspect import normalize_sql
+
+
+class NormalizeSqlTests(SimpleTestCase):
+    """Amprenta interogărilor: fără literali, listele IN comprimate"""
+
+    def test_literals_and_in_lists(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE a = 'x''y' AND b = 12.5 AND c IN (%s, %s, %s)\n  LIMIT 21"),
+            'SELECT * FROM t WHERE a = ? AND b = ? AND c IN (...) LIMIT ?',
+        )
+        self.assertEqual(normalize_sql('SELECT "t2"."id" FROM "t2"'), 'SELECT "t2"."id" FROM "t2"')
+
+
+@override_settings(DEBUG=True, NPLUSONE_ENABLED=True, NPLUSONE_THRESHOLD=3, NPLUSONE_LOG_FILE='')
+class NPlusOneMiddlewareTests(TestCase):
+    """Interogările repetate ale unei cereri, raportate în antete și în log"""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(f'elev{i}', password='x') for i in range(4)]
+
+    def view(self, request):
+        for user in self.users:  # N+1: aceeași interogare, alt parametru
+            User.objects.filter(pk=user.pk).first()
+        for _ in range(3):  # identică de fiecare dată
+            User.objects.count()
+        User.objects.exists()
+        return HttpResponse()
+
+    def test_findings(self):
+        middleware = NPlusOneMiddleware(self.view)
+        with self.assertLogs('mathcourses.nplusone', 'WARNING') as logs:
+            response = middleware(RequestFactory().get('/pagina/'))
+
+        self.assertEqual(response['X-NPlusOne-Queries'], '8')
+        self.assertEqual(response['X-NPlusOne-Findings'], '2')
+        self.assertTrue(response['X-NPlusOne-1'].startswith('4x n+1 mathcourses/tests.py:'))
+        self.assertTrue(response['X-NPlusOne-2'].startswith('3x duplicate '))
+        self.assertNotIn('X-NPlusOne-3', response)
+        self.assertIn('GET /pagina/ -> 200: 8 interogări, 2 repetate', logs.output[0])
+
+    def test_below_threshold(self):
+        with self.settings(NPLUSONE_THRESHOLD=5), self.assertNoLogs('mathcourses.nplusone'):
+            response = NPlusOneMiddleware(self.view)(RequestFactory().get('/'))
+        self.assertEqual(response['X-NPlusOne-Findings'], '0')
+
+    def test_development_only(self):
+        for overrides in ({'DEBUG': False}, {'NPLUSONE_ENABLED': False}):
+            with self.settings(**overrides), self.assertRaises(MiddlewareNotUsed):
+                NPlusOneMiddleware(self.view)
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1, SERVER_TIMING_HEADER=True)
+class ServerTimingTests(TestCase):
+    """Antetul Server-Timing și linia JSON din mathcourses.timing"""
+
+    def test_header_and_log_line(self):
+        with self.assertLogs('mathcourses.timing', 'INFO') as logs:
+            response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual((entry['view'], entry['route'], entry['status']), ('home', '', 200))
+        self.assertGreater(entry['db_queries'], 0)
+        self.assertAlmostEqual(entry['db_ms'] + entry['template_ms'] + entry['app_ms'], entry['total_ms'], delta=0.05)
+
+        parts = [part.strip() for part in response['Server-Timing'].split(',')]
+        self.assertEqual(parts[0], f'db;dur={entry["db_ms"]};desc="{entry["db_queries"]} queries"')
+        self.assertEqual([part.split(';')[0] for part in parts], ['db', 'tpl', 'app', 'total'])
+
+    def test_header_can_be_disabled(self):
+        with self.settings(SERVER_TIMING_HEADER=False), self.assertLogs('mathcourses.timing', 'INFO'):
+            response = self.client.get(reverse('home'))
+        self.assertNotIn('Server-Timing', response)
+
+    def test_off_by_default(self):
+        with self.settings(SERVER_TIMING_SAMPLE_RATE=0), self.assertRaises(MiddlewareNotUsed):
+            ServerTimingMiddleware(lambda request: HttpResponse())
+
+
+@override_settings(METRICS_TOKEN='secret')
+@mock.patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': ''})
+class MetricsEndpointTests(TestCase):
+    """/metrics: token doar în antetul Authorization, 404 fără token configurat"""
+
+    @skipUnless(metrics.available(), 'prometheus_client nu este instalat')
+    def test_bearer_token(self):
+        url = reverse('metrics')
+        self.client.get(reverse('home'))
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'mathcourses_http_requests_total{method="GET",status="200",view="home"}')
+
+        for headers in ({}, {'HTTP_AUTHORIZATION': 'Bearer wrong'}, {'HTTP_AUTHORIZATION': 'Token secret'}):
+            response = self.client.get(url, **headers)
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(response['WWW-Authenticate'], 'Bearer')
+        self.assertEqual(self.client.get(url, {'token': 'secret'}).status_code, 401)
+
+    def test_disabled_without_token(self):
+        with self.settings(METRICS_TOKEN=''):
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer ')
+        self.assertEqual(response.status_code, 404)
+
+    def test_without_prometheus_client(self):
+        with mock.patch.object(metrics, 'prometheus_client', None):
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+            metrics.record_cache('calendar', hits=1)
+        self.assertEqual(response.status_code, 503)
+
+
+class ProfilingTests(TestCase):
+    """Profilarea la cerere: doar pentru staff, id-uri validate, retenție"""
+
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir)
+        overrides = self.settings(PROFILING_ENABLED=True, PROFILE_DIR=self.profile_dir, PROFILE_RETENTION=2)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.staff = User.objects.create_user('admin', password='x', is_staff=True)
+
+    def test_staff_only(self):
+        url = reverse('home')
+        self.assertNotIn('X-Profile-Id', self.client.get(url, {'_profile': '1'}))
+        self.client.force_login(User.objects.create_user('prof', password='x', role='teacher'))
+        self.assertNotIn('X-Profile-Id', self.client.get(url, {'_profile': '1'}))
+        self.assertEqual(profiling.list_profile_ids(), [])
+
+        self.client.force_login(self.staff)
+        self.assertNotIn('X-Profile-Id', self.client.get(url))
+        profile_id = self.client.get(url, {'_profile': '1'})['X-Profile-Id']
+        self.assertEqual(self.client.get(url, HTTP_X_PROFILE='1').status_code, 200)
+
+        meta = profiling.load_meta(profile_id)
+        self.assertEqual((meta['user'], meta['view'], meta['status']), ('admin', 'home', 200))
+        self.assertTrue(meta['queries'])
+        self.assertContains(self.client.get(reverse('profile_detail', args=[profile_id])), profile_id)
+        download = self.client.get(reverse('profile_download', args=[profile_id]))
+        self.assertEqual(download['Content-Disposition'], f'attachment; filename="{profile_id}.prof"')
+
+    def test_bad_ids(self):
+        for profile_id in ('..', '../../settings', '20260101-000000-000000-XYZW', '20260101-000000-000000-abcd.x'):
+            with self.assertRaises(Http404):
+                profiling._path(profile_id, 'prof')
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(reverse('profile_download', args=['..'])).status_code, 404)
+
+    def test_prune_keeps_newest(self):
+        ids = [f'2026010{day}-120000-000000-abcd' for day in range(1, 5)]
+        for name in [f'{profile_id}.{extension}' for profile_id in ids for extension in ('prof', 'json')] + ['notes.json']:
+            open(os.path.join(self.profile_dir, name), 'w').close()
+        profiling.prune(2)
+        self.assertEqual(profiling.list_profile_ids(), ids[:1:-1])
+        self.assertEqual(sorted(os.listdir(self.profile_dir)), sorted(
+            [f'{profile_id}.{extension}' for profile_id in ids[2:] for extension in ('prof', 'json')] + ['notes.json']
+        ))
+
+
+class SlowQueryTests(TestCase):
+    """Log-ul interogărilor lente: EXPLAIN, parametrii și agregarea pe amprente"""
+
+    def test_explain_is_not_counted(self):
+        sql, params = User.objects.filter(username='elev').query.sql_with_params()
+        with self.assertNumQueries(0):
+            plan = explain(connection, sql, params)
+        self.assertTrue(plan)
+
+    def test_failed_explain_keeps_the_transaction(self):
+        with transaction.atomic():
+            User.objects.create_user('elev', password='x')
+            self.assertIsNone(explain(connection, 'SELECT * FROM tabel_inexistent', []))
+            self.assertFalse(connection.needs_rollback)
+            self.assertTrue(User.objects.filter(username='elev').exists())
+            # Savepoint-ul EXPLAIN-ului a fost eliberat
+            with self.assertRaises(DatabaseError), connection.cursor() as cursor:
+                cursor.execute('RELEASE SAVEPOINT mathcourses_explain')
+        self.assertTrue(User.objects.filter(username='elev').exists())
+
+    @override_settings(SLOW_QUERY_MS=0.000001, SLOW_QUERY_EXPLAIN=True, SLOW_QUERY_LOG_PARAMS=False, SLOW_QUERY_LOG_FILE='')
+    def test_middleware_log_line(self):
+        def view(request):
+            User.objects.filter(username='elev').exists()
+            return HttpResponse()
+
+        with self.assertLogs('mathcourses.slowqueries', 'WARNING') as logs:
+            SlowQueryMiddleware(view)(RequestFactory().get('/pagina/'))
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual((entry['path'], entry['params'], entry['many']), ('/pagina/', None, False))
+        self.assertTrue(entry['code'].startswith('mathcourses/tests.py:'))
+        self.assertTrue(entry['explain'])
+
+        with self.settings(SLOW_QUERY_LOG_PARAMS=True), self.assertLogs('mathcourses.slowqueries', 'WARNING') as logs:
+            SlowQueryMiddleware(view)(RequestFactory().get('/pagina/'))
+        self.assertIn('elev', json.loads(logs.records[0].getMessage())['params'])
+
+    def test_aggregate(self):
+        entries = [
+            {'sql': 'SELECT * FROM t WHERE id = 1', 'ms': 300.0, 'view': 'a', 'code': 'x.py:1'},
+            {'sql': 'SELECT * FROM t WHERE id = 2', 'ms': 500.0, 'view': 'b', 'code': 'x.py:1'},
+            {'sql': 'SELECT * FROM u', 'ms': 700.0, 'view': None, 'code': None},
+        ]
+        report = aggregate(entries)
+        self.assertEqual([group['fingerprint'] for group in report], ['SELECT * FROM t WHERE id = ?', 'SELECT * FROM u'])
+        first = report[0]
+        self.assertEqual((first['count'], first['total_ms'], first['mean_ms'], first['max_ms']), (2, 800.0, 400.0, 500.0))
+        self.assertIs(first['slowest'], entries[1])
+        self.assertEqual((first['views'], first['origins']), ({'a': 1, 'b': 1}, {'x.py:1': 2}))
+        self.assertEqual((report[1]['views'], report[1]['origins']), ({'-': 1}, {}))
+
+    def test_read_log_skips_bad_lines(self):
+        path = os.path.join(tempfile.mkdtemp(), 'slow.log')
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write('2026-01-05 WARNING {"sql": "SELECT 1", "ms": 250}\nfără json\n{trunchiat\n{"sql": "SELECT 2", "ms": 1}\n')
+        self.assertEqual([entry['sql'] for entry in read_log(path)], ['SELECT 1', 'SELECT 2'])
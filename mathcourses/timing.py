@@ -0,0 +1,87 @@
+"""
+Măsurarea timpului per cerere: SQL, randare template și restul (Python).
+
+RequestTiming este activ doar pentru cererile eșantionate de
+ServerTimingMiddleware (ContextVar); în rest backend-ul de template și
+middleware-ul doar verifică variabila și continuă, fără cost măsurabil.
+
+Timpul SQL executat în timpul randării (querysets leneșe din template) este
+scăzut din timpul template-ului, astfel încât db + tpl + app = total.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template as DjangoTemplate, reraise
+
+current_timing = ContextVar('current_timing', default=None)
+
+
+class RequestTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_ms = 0.0
+        self.db_queries = 0
+        self.template_ms = 0.0
+        self.template_db_ms = 0.0
+        self._template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """execute_wrapper: durata și numărul interogărilor"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.db_ms += elapsed
+            self.db_queries += 1
+            if self._template_depth:
+                self.template_db_ms += elapsed
+
+    @contextmanager
+    def template(self):
+        """Randarea unui template; doar nivelul exterior este cronometrat"""
+        self._template_depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._template_depth -= 1
+            if not self._template_depth:
+                self.template_ms += (time.perf_counter() - started) * 1000
+
+    def metrics(self):
+        """{nume: milisecunde} pentru db, tpl (fără SQL), app și total"""
+        total = (time.perf_counter() - self.started) * 1000
+        template = max(self.template_ms - self.template_db_ms, 0.0)
+        return {
+            'db': round(self.db_ms, 2),
+            'tpl': round(template, 2),
+            'app': round(max(total - self.db_ms - template, 0.0), 2),
+            'total': round(total, 2),
+        }
+
+
+# ==================== BACKEND DE TEMPLATE ====================
+
+class Template(DjangoTemplate):
+    def render(self, context=None, request=None):
+        timing = current_timing.get()
+        if timing is None:
+            return super().render(context, request)
+        with timing.template():
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates care raportează durata randării cererii eșantionate"""
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
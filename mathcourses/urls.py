@@ -18,10 +18,21 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from . import profiling
+from .metrics import metrics_view
+
 urlpatterns = [
+    # Profiluri cereri (înaintea admin-ului, care ar răspunde 404)
+    path('admin/profiles/', profiling.profiles_list, name='profiles_list'),
+    path('admin/profiles/<str:profile_id>/', profiling.profile_detail, name='profile_detail'),
+    path('admin/profiles/<str:profile_id>/download/', profiling.profile_download, name='profile_download'),
+
     # Admin
     path('admin/', admin.site.urls),
 
+    # Metrici Prometheus (protejate prin METRICS_TOKEN)
+    path('metrics', metrics_view, name='metrics'),
+
     # Cursuri publice (homepage, cursuri, contact, etc.)
     path('', include('courses.urls')),
 
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from teacher_platform.exports import EXPORT_ACTIONS
 from .models import SorobanExercise, SorobanSession, SorobanProgress
 
 
@@ -26,6 +27,7 @@ class SorobanExerciseAdmin(admin.ModelAdmin):
 
 @admin.register(SorobanSession)
 class SorobanSessionAdmin(admin.ModelAdmin):
+    actions = EXPORT_ACTIONS
     list_display = ('student', 'exercise', 'started_at', 'completed_at', 'problems_attempted', 'problems_correct',
                     'points_earned', 'get_accuracy')
     list_filter = ('started_at', 'completed_at')
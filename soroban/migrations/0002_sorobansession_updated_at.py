@@ -0,0 +1,26 @@
+# Generated by Django 5.2.10 on 2026-10-19 16:32
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_updated_at(apps, schema_editor):
+    """Sesiunile existente primesc data terminării (sau a începerii)"""
+    SorobanSession = apps.get_model('soroban', 'SorobanSession')
+    SorobanSession.objects.update(updated_at=Coalesce('completed_at', 'started_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soroban', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sorobansession',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
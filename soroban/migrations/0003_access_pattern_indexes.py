@@ -0,0 +1,27 @@
+# Generated by Django 5.2.10 on 2026-10-19 17:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soroban', '0002_sorobansession_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sorobanprogress',
+            index=models.Index(fields=['-total_points'], name='soroban_progress_points_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sorobansession',
+            index=models.Index(fields=['student', 'started_at'], name='soroban_session_started_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sorobansession',
+            index=models.Index(fields=['student', 'completed_at'], name='soroban_session_completed_idx'),
+        ),
+    ]
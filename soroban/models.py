@@ -88,10 +88,18 @@ class SorobanSession(models.Model):
     # Structură: [{"problem": "5+3", "answer": 8, "correct": true, "time": 12}, ...]
     answers_detail = models.JSONField(default=list, blank=True, verbose_name="Detalii Răspunsuri")
 
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
     class Meta:
         verbose_name = "Sesiune Soroban"
         verbose_name_plural = "Sesiuni Soroban"
         ordering = ['-started_at']
+        indexes = [
+            # Sesiunile recente ale elevului, deja în ordinea cronologică
+            models.Index(fields=['student', 'started_at'], name='soroban_session_started_idx'),
+            # Agregările pe sesiunile terminate ale elevului
+            models.Index(fields=['student', 'completed_at'], name='soroban_session_completed_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.get_full_name()} - {self.exercise.title if self.exercise else 'Practică Liberă'}"
@@ -145,6 +153,10 @@ class SorobanProgress(models.Model):
     class Meta:
         verbose_name = "Progres Soroban"
         verbose_name_plural = "Progres Soroban"
+        indexes = [
+            # Clasamentul (ORDER BY total_points DESC) și poziția în clasament
+            models.Index(fields=['-total_points'], name='soroban_progress_points_idx'),
+        ]
 
     def __str__(self):
         return f"Progres {self.student.get_full_name()} - Nivel {self.current_level}"
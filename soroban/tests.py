@@ -1,3 +1,136 @@
-from django.test import TestCase
+import datetime
+import importlib
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import include, path, reverse
+from django.utils import timezone
+
+from accounts.models import User
+from mathcourses import query_budget
+from teacher_platform.models import Group, GroupStudent
+
+from .models import SorobanExercise, SorobanProgress, SorobanSession
+
+# soroban.urls nu este montat în mathcourses.urls: testele îl adaugă sub
+# /soroban/, ca benchmarks.urlpatterns
+urlpatterns = list(importlib.import_module(settings.ROOT_URLCONF).urlpatterns) + [
+    path('soroban/', include('soroban.urls')),
+]
+
+# Template-urile aplicației lipsesc din proiect; acestea parcurg tot contextul
+# (inclusiv relațiile afișate), ca interogările leneșe să fie numărate
+PAGE_TEMPLATES = {
+    'soroban/simulator.html': (
+        '{{ progress.current_level }}'
+        '{% for exercise in available_exercises %}{{ exercise.title }}{% endfor %}'
+        '{% for session in recent_sessions %}{{ session.exercise.title }} {{ session.points_earned }}{% endfor %}'
+    ),
+    'soroban/stats.html': (
+        '{{ progress.total_points }} {{ stats.total_sessions }} {{ stats.avg_accuracy }}'
+        '{% for session in recent_sessions %}{{ session.exercise.title }} {{ session.started_at }}{% endfor %}'
+        '{% for day in week_data %}{{ day.date }} {{ day.sessions }} {{ day.points }} {{ day.accuracy }}{% endfor %}'
+    ),
+    'soroban/leaderboard.html': (
+        '{% for progress in top_students %}{{ progress.student.get_full_name }} {{ progress.total_points }}{% endfor %}'
+        '{{ user_progress.total_points }} {{ user_rank }}'
+    ),
+    'teacher_platform/soroban_overview.html': (
+        '{% for progress in students_progress %}{{ progress.student.get_full_name }} {{ progress.current_level }}{% endfor %}'
+        '{{ total_sessions }} {{ avg_level }}'
+    ),
+}
+TEST_TEMPLATES = [{
+    **settings.TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **settings.TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.locmem.Loader', PAGE_TEMPLATES),
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ],
+    },
+}]
+
+
+@override_settings(ROOT_URLCONF=__name__, TEMPLATES=TEST_TEMPLATES)
+class ViewQueryBudgetTests(query_budget.QueryBudgetTestCase):
+    """Paginile soroban: N exerciții, N sesiuni pe zilele săptămânii, N elevi în clasament și în grupă"""
+
+    def build_world(self, size):
+        prefix = f'qb{size}'
+        exercises = SorobanExercise.objects.bulk_create([
+            SorobanExercise(title=f'{prefix} Exercițiu {i}', difficulty='beginner', operation_type='addition')
+            for i in range(size)
+        ])
+        teacher = User.objects.create_user(f'{prefix}-prof', password='x', role='teacher')
+        group = Group.objects.create(
+            name=f'{prefix} Grupa', teacher=teacher, weekday=0, start_time=datetime.time(10),
+            start_date=datetime.date(2026, 1, 5), max_students=size,
+        )
+        students = [User.objects.create_user(f'{prefix}-elev{i}', password='x', role='student') for i in range(size)]
+        for student in students:
+            GroupStudent.objects.create(group=group, student=student)
+        SorobanProgress.objects.bulk_create([
+            SorobanProgress(student=student, total_points=i * 10) for i, student in enumerate(students)
+        ])
+
+        student = students[0]
+        now = timezone.now()
+        sessions = SorobanSession.objects.bulk_create([
+            SorobanSession(
+                student=student, exercise=exercises[i % size], problems_attempted=10, problems_correct=7,
+                points_earned=70, completed_at=now,
+            )
+            for i in range(size * 7)
+        ])
+        # Sesiuni răspândite pe ultimele 7 zile
+        for i, session in enumerate(sessions):
+            SorobanSession.objects.filter(pk=session.pk).update(started_at=now - datetime.timedelta(days=i % 7))
+        return SimpleNamespace(teacher=teacher, student=student)
+
+    def view_requests(self, world):
+        return [
+            ('soroban:simulator', {}, {}, world.student),
+            ('soroban:stats', {}, {}, world.student),
+            ('soroban:leaderboard', {}, {}, world.student),
+            ('soroban:teacher_overview', {}, {}, world.teacher),
+        ]
+
+
+@override_settings(ROOT_URLCONF=__name__, TEMPLATES=TEST_TEMPLATES, CACHES=query_budget.TEST_CACHES)
+class StatsPageTests(TestCase):
+    """Statisticile elevului: totalurile și graficul pe ultimele 7 zile (ora locală)"""
+
+    def setUp(self):
+        self.student = User.objects.create_user('elev', password='x', role='student')
+        now = timezone.now()
+        for days_ago, correct, points in [(0, 8, 80), (0, 6, 60), (2, 5, 50), (9, 10, 100)]:
+            session = SorobanSession.objects.create(
+                student=self.student, problems_attempted=10, problems_correct=correct,
+                points_earned=points, completed_at=now,
+            )
+            SorobanSession.objects.filter(pk=session.pk).update(started_at=now - datetime.timedelta(days=days_ago))
+        SorobanSession.objects.create(student=self.student)  # neterminată: doar în grafic
+        self.client.force_login(self.student)
+
+    def test_stats(self):
+        response = self.client.get(reverse('soroban:stats'))
+        self.assertEqual(response.status_code, 200)
+        stats = response.context['stats']
+        self.assertEqual((stats['total_sessions'], stats['total_points']), (4, 290))
+        self.assertAlmostEqual(stats['avg_accuracy'], 72.5)
+
+        today = timezone.localdate()
+        week = response.context['week_data']
+        self.assertEqual([day['date'] for day in week],
+                         [(today - datetime.timedelta(days=i)).strftime('%d/%m') for i in range(6, -1, -1)])
+        self.assertEqual([day['sessions'] for day in week], [0, 0, 0, 0, 1, 0, 3])
+        self.assertEqual(week[-1]['points'], 140)
+
+    def test_no_sessions(self):
+        SorobanSession.objects.all().delete()
+        stats = self.client.get(reverse('soroban:stats')).context['stats']
+        self.assertEqual((stats['total_sessions'], stats['avg_accuracy']), (0, 0))
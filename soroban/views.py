@@ -4,11 +4,15 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.utils import timezone
 from django.db.models import Sum, Avg, Count
+from django.db.models.functions import NullIf, TruncDate
 from .models import SorobanExercise, SorobanSession, SorobanProgress
 from accounts.models import User
+from mathcourses.query_budget import query_budget
 import json
+from datetime import timedelta
 
 
+@query_budget(6)
 @login_required
 def soroban_simulator(request):
     """
@@ -30,7 +34,7 @@ def soroban_simulator(request):
     # Ultimele 5 sesiuni
     recent_sessions = SorobanSession.objects.filter(
         student=request.user
-    ).order_by('-started_at')[:5]
+    ).select_related('exercise').order_by('-started_at')[:5]
 
     context = {
         'progress': progress,
@@ -149,6 +153,7 @@ def complete_session(request, session_id):
     return redirect('soroban_simulator')
 
 
+@query_budget(7)
 @login_required
 def soroban_stats(request):
     """
@@ -161,15 +166,14 @@ def soroban_stats(request):
     progress, created = SorobanProgress.objects.get_or_create(student=request.user)
 
     # Statistici pe ultimele 30 de zile
-    from datetime import timedelta
     thirty_days_ago = timezone.now() - timedelta(days=30)
 
     recent_sessions = SorobanSession.objects.filter(
         student=request.user,
         started_at__gte=thirty_days_ago
-    ).order_by('-started_at')
+    ).select_related('exercise').order_by('-started_at')
 
-    # Agregări
+    # Agregări (acuratețea medie = corecte / încercate, NULL fără probleme încercate)
     stats = SorobanSession.objects.filter(
         student=request.user,
         completed_at__isnull=False
@@ -178,30 +182,36 @@ def soroban_stats(request):
         total_problems=Sum('problems_attempted'),
         total_correct=Sum('problems_correct'),
         total_points=Sum('points_earned'),
-        avg_accuracy=Avg('problems_correct') * 100 / Avg('problems_attempted') if Count('id') > 0 else 0
+        avg_accuracy=Sum('problems_correct') * 100.0 / NullIf(Sum('problems_attempted'), 0),
     )
-
-    # Grafic progres pe zile (ultimele 7 zile)
-    from datetime import datetime
-    week_data = []
-    for i in range(7):
-        day = timezone.now() - timedelta(days=i)
-        day_sessions = SorobanSession.objects.filter(
+    stats['avg_accuracy'] = stats['avg_accuracy'] or 0
+
+    # Grafic progres pe zile (ultimele 7 zile), o singură interogare grupată pe zi
+    today = timezone.localdate()
+    days = [today - timedelta(days=i) for i in range(6, -1, -1)]
+    per_day = {
+        row['day']: row
+        for row in SorobanSession.objects.filter(
             student=request.user,
-            started_at__date=day.date()
-        )
+            started_at__date__gte=days[0],
+            started_at__date__lte=today,
+        ).annotate(day=TruncDate('started_at')).values('day').annotate(
+            sessions=Count('id'),
+            points=Sum('points_earned'),
+            correct_avg=Avg('problems_correct'),
+        ).order_by()
+    }
 
+    week_data = []
+    for day in days:
+        row = per_day.get(day)
         week_data.append({
             'date': day.strftime('%d/%m'),
-            'sessions': day_sessions.count(),
-            'points': day_sessions.aggregate(Sum('points_earned'))['points_earned__sum'] or 0,
-            'accuracy': (day_sessions.aggregate(
-                Avg('problems_correct')
-            )['problems_correct__avg'] or 0) * 100 if day_sessions.count() > 0 else 0
+            'sessions': row['sessions'] if row else 0,
+            'points': (row['points'] or 0) if row else 0,
+            'accuracy': (row['correct_avg'] or 0) * 100 if row else 0,
         })
 
-    week_data.reverse()
-
     context = {
         'progress': progress,
         'recent_sessions': recent_sessions[:10],
@@ -212,22 +222,29 @@ def soroban_stats(request):
     return render(request, 'soroban/stats.html', context)
 
 
+def leaderboard_top(limit=20):
+    """Primii `limit` elevi după puncte totale"""
+    return SorobanProgress.objects.select_related('student').order_by('-total_points')[:limit]
+
+
+def leaderboard_rank(total_points):
+    """Poziția în clasament pentru un punctaj"""
+    return SorobanProgress.objects.filter(total_points__gt=total_points).count() + 1
+
+
+@query_budget(6)
 @login_required
 def leaderboard(request):
     """
     Clasament global Soroban
     """
     # Top 20 elevi după puncte totale
-    top_students = SorobanProgress.objects.select_related('student').order_by(
-        '-total_points'
-    )[:20]
+    top_students = leaderboard_top()
 
     # Poziția utilizatorului curent
     if request.user.role == 'student':
         user_progress, created = SorobanProgress.objects.get_or_create(student=request.user)
-        user_rank = SorobanProgress.objects.filter(
-            total_points__gt=user_progress.total_points
-        ).count() + 1
+        user_rank = leaderboard_rank(user_progress.total_points)
     else:
         user_progress = None
         user_rank = None
@@ -243,6 +260,7 @@ def leaderboard(request):
 
 # ==================== ADMIN/TEACHER VIEWS ====================
 
+@query_budget(6)
 @login_required
 def teacher_soroban_overview(request):
     """
@@ -1,21 +1,12 @@
 #!/usr/bin/env bash
-# Railway startup script - runs migrations then starts gunicorn
+# Railway startup script - prepares the database and static files then starts gunicorn
 
 set -e
 
-echo "Running database migrations..."
-python manage.py migrate --no-input
-
-echo "Collecting static files..."
-python manage.py collectstatic --no-input
-
-# Create superuser only if password is set
-if [ -n "$SUPERUSER_PASSWORD" ]; then
-    echo "Creating superuser if needed..."
-    python manage.py create_superuser_if_none || echo "Superuser creation skipped or failed"
-else
-    echo "SUPERUSER_PASSWORD not set, skipping superuser creation"
-fi
+# migrate / collectstatic (skipped when nothing changed) and the superuser
+# (only if SUPERUSER_PASSWORD is set), in a single Django process
+echo "Booting..."
+python manage.py boot
 
 echo "Starting gunicorn..."
 exec gunicorn mathcourses.wsgi --log-file -
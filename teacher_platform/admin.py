@@ -1,17 +1,59 @@
-from django.contrib import admin
-from .models import Group, GroupStudent, Lesson, Attendance, Assignment, AssignmentSubmission, LessonNote
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
+from django.forms.models import BaseInlineFormSet
+from django.http import HttpResponseRedirect
+from .exports import EXPORT_ACTIONS
+from .models import Group, GroupCodeCounter, GroupFullError, GroupStudent, DeletionLog, ExportWatermark, GroupWaitlistEntry, Lesson, Attendance, Assignment, AssignmentSubmission, LessonNote
+
+
+class GroupStudentFormSet(BaseInlineFormSet):
+    """Verifică locurile pentru toate rândurile inline-ului împreună, nu doar per rând"""
+
+    def clean(self):
+        super().clean()
+        group = self.instance
+        taken = released = 0
+        for form in self.forms:
+            if not hasattr(form, 'cleaned_data') or (form.instance.pk is None and not form.has_changed()):
+                continue
+            enrollment = form.instance
+            was_active = enrollment.pk is not None and getattr(enrollment, '_was_active', False)
+            if self.can_delete and self._should_delete_form(form):
+                released += was_active
+            elif enrollment.takes_new_seat():
+                taken += 1
+            elif was_active and not enrollment.is_active:
+                released += 1
+        if taken and group.active_student_count - released + taken > group.max_students:
+            raise ValidationError(f'Grupa are doar {group.max_students} locuri.')
+
+
+class SeatErrorAdminMixin:
+    """
+    GroupFullError apărut la salvare (înscriere concurentă după validare):
+    tranzacția formularului este anulată și utilizatorul primește mesajul
+    """
+
+    def changeform_view(self, request, *args, **kwargs):
+        try:
+            return super().changeform_view(request, *args, **kwargs)
+        except GroupFullError as e:
+            self.message_user(request, f'Modificările nu au fost salvate: {e}', messages.ERROR)
+            return HttpResponseRedirect(request.get_full_path())
 
 
 class GroupStudentInline(admin.TabularInline):
     """Inline pentru elevi în grupă"""
     model = GroupStudent
+    formset = GroupStudentFormSet
     extra = 0
     fields = ['student', 'enrolled_date', 'is_active', 'lessons_attended', 'lessons_missed']
     readonly_fields = ['enrolled_date']
 
 
 @admin.register(Group)
-class GroupAdmin(admin.ModelAdmin):
+class GroupAdmin(SeatErrorAdminMixin, admin.ModelAdmin):
+    actions = EXPORT_ACTIONS
     list_display = ['name', 'code', 'teacher', 'course', 'module', 'location', 'weekday', 'start_time', 'is_active']
     list_filter = ['is_active', 'course', 'module', 'location', 'weekday', 'teacher']
     search_fields = ['name', 'code', 'teacher__first_name', 'teacher__last_name', 'course__title']
@@ -44,8 +86,27 @@ class GroupAdmin(admin.ModelAdmin):
         return self.readonly_fields
 
 
+@admin.register(GroupCodeCounter)
+class GroupCodeCounterAdmin(admin.ModelAdmin):
+    list_display = ['prefix', 'last_number']
+    search_fields = ['prefix']
+
+
+@admin.register(ExportWatermark)
+class ExportWatermarkAdmin(admin.ModelAdmin):
+    list_display = ['feed', 'last_timestamp', 'last_id', 'last_run_at']
+
+
+@admin.register(DeletionLog)
+class DeletionLogAdmin(admin.ModelAdmin):
+    list_display = ['model_label', 'object_id', 'deleted_at']
+    list_filter = ['model_label']
+    date_hierarchy = 'deleted_at'
+
+
 @admin.register(GroupStudent)
-class GroupStudentAdmin(admin.ModelAdmin):
+class GroupStudentAdmin(SeatErrorAdminMixin, admin.ModelAdmin):
+    actions = EXPORT_ACTIONS
     list_display = ['student', 'group', 'enrolled_date', 'is_active', 'lessons_attended', 'lessons_missed', 'get_attendance_rate']
     list_filter = ['is_active', 'group', 'enrolled_date']
     search_fields = ['student__first_name', 'student__last_name', 'group__name']
@@ -67,8 +128,17 @@ class GroupStudentAdmin(admin.ModelAdmin):
     get_attendance_rate.short_description = 'Rată Prezență'
 
 
+@admin.register(GroupWaitlistEntry)
+class GroupWaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ['student', 'group', 'requested_at', 'notes']
+    list_filter = ['group__teacher', 'group']
+    search_fields = ['student__first_name', 'student__last_name', 'group__name', 'group__code']
+    date_hierarchy = 'requested_at'
+
+
 @admin.register(Lesson)
 class LessonAdmin(admin.ModelAdmin):
+    actions = EXPORT_ACTIONS
     list_display = ['group', 'lesson_template', 'date', 'start_time', 'end_time', 'status']
     list_filter = ['status', 'date', 'group__course', 'group']
     search_fields = ['group__name', 'topic', 'lesson_template__name']
@@ -92,6 +162,7 @@ class LessonAdmin(admin.ModelAdmin):
 
 @admin.register(Attendance)
 class AttendanceAdmin(admin.ModelAdmin):
+    actions = EXPORT_ACTIONS
     list_display = ['student', 'lesson', 'is_present', 'performance_rating', 'created_at']
     list_filter = ['is_present', 'performance_rating', 'lesson__date', 'lesson__group']
     search_fields = ['student__first_name', 'student__last_name', 'lesson__group__name']
@@ -129,6 +200,7 @@ class AssignmentAdmin(admin.ModelAdmin):
 
 @admin.register(AssignmentSubmission)
 class AssignmentSubmissionAdmin(admin.ModelAdmin):
+    actions = EXPORT_ACTIONS
     list_display = ['student', 'assignment', 'submitted_at', 'is_graded', 'score']
     list_filter = ['is_graded', 'submitted_at', 'assignment__group']
     search_fields = ['student__first_name', 'student__last_name', 'assignment__title']
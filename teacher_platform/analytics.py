@@ -0,0 +1,143 @@
+"""
+Statistici pentru pagina unui elev (student_detail).
+
+Prezențele și predările sunt agregate condiționat, grupate pe grupă, într-o
+singură interogare (UNION ALL între cele două agregări). Rezultatul este
+păstrat în cache per (profesor, elev) și invalidat de semnalele pe
+Attendance și AssignmentSubmission.
+"""
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum, Value, CharField
+
+from .caching import make_key, count_lookup, DEFAULT_TIMEOUT
+from .models import Attendance, AssignmentSubmission
+
+STUDENT_STATS_NAMESPACE = 'student_stats'
+TREND_WINDOW = 8
+
+
+def stats_owner(teacher_id, student_id):
+    """Identificatorul folosit pentru generația cache-ului (profesor + elev)"""
+    return f'{teacher_id}-{student_id}'
+
+
+def _percent(part, total):
+    return round(part / total * 100, 2) if total else 0
+
+
+def _average(total, count):
+    return round(total / count, 2) if count else None
+
+
+def build_student_stats(teacher, student):
+    """Calculează statisticile elevului pentru grupele profesorului (o interogare)"""
+    attendance_rows = Attendance.objects.filter(
+        student=student,
+        lesson__group__teacher=teacher
+    ).order_by().values(
+        group_id=F('lesson__group_id'),
+        group_name=F('lesson__group__name'),
+    ).annotate(
+        kind=Value('attendance', output_field=CharField()),
+        total=Count('id'),
+        hits=Count('id', filter=Q(is_present=True)),
+        score_sum=Sum('performance_rating'),
+        score_count=Count('performance_rating'),
+    ).values('group_id', 'group_name', 'kind', 'total', 'hits', 'score_sum', 'score_count')
+
+    submission_rows = AssignmentSubmission.objects.filter(
+        student=student,
+        assignment__group__teacher=teacher
+    ).order_by().values(
+        group_id=F('assignment__group_id'),
+        group_name=F('assignment__group__name'),
+    ).annotate(
+        kind=Value('submission', output_field=CharField()),
+        total=Count('id'),
+        hits=Count('id', filter=Q(submitted_at__date__lte=F('assignment__due_date'))),
+        score_sum=Sum('score', filter=Q(is_graded=True)),
+        score_count=Count('score', filter=Q(is_graded=True)),
+    ).values('group_id', 'group_name', 'kind', 'total', 'hits', 'score_sum', 'score_count')
+
+    groups = {}
+    totals = {
+        'attendance': {'total': 0, 'hits': 0, 'score_sum': 0, 'score_count': 0},
+        'submission': {'total': 0, 'hits': 0, 'score_sum': 0, 'score_count': 0},
+    }
+    for row in attendance_rows.union(submission_rows, all=True):
+        group = groups.setdefault(row['group_id'], {
+            'group_id': row['group_id'],
+            'group_name': row['group_name'],
+            'attendance': {'total': 0, 'hits': 0, 'score_sum': 0, 'score_count': 0},
+            'submission': {'total': 0, 'hits': 0, 'score_sum': 0, 'score_count': 0},
+        })
+        for bucket in (group[row['kind']], totals[row['kind']]):
+            bucket['total'] += row['total']
+            bucket['hits'] += row['hits']
+            bucket['score_sum'] += row['score_sum'] or 0
+            bucket['score_count'] += row['score_count']
+
+    def summarize(data):
+        attendance = data['attendance']
+        submission = data['submission']
+        return {
+            'lessons_total': attendance['total'],
+            'lessons_present': attendance['hits'],
+            'attendance_rate': _percent(attendance['hits'], attendance['total']),
+            'avg_performance': _average(attendance['score_sum'], attendance['score_count']),
+            'submissions_total': submission['total'],
+            'on_time_rate': _percent(submission['hits'], submission['total']),
+            'avg_score': _average(submission['score_sum'], submission['score_count']),
+        }
+
+    breakdown = []
+    for group in sorted(groups.values(), key=lambda item: item['group_name']):
+        breakdown.append({
+            'group_id': group['group_id'],
+            'group_name': group['group_name'],
+            **summarize(group),
+        })
+
+    return {**summarize(totals), 'groups': breakdown}
+
+
+def get_student_stats(teacher, student):
+    """Statisticile elevului din cache (recalculate doar după invalidare)"""
+    key = make_key(STUDENT_STATS_NAMESPACE, stats_owner(teacher.id, student.id), 'stats')
+    stats = cache.get(key)
+    count_lookup(STUDENT_STATS_NAMESPACE, stats is not None)
+    if stats is None:
+        stats = build_student_stats(teacher, student)
+        cache.set(key, stats, DEFAULT_TIMEOUT)
+    return stats
+
+
+def rolling_trend(attendances, window=TREND_WINDOW):
+    """
+    Tendința prezenței pe ultimele `window` lecții, calculată din prezențele
+    deja încărcate pentru pagină (ordonate descrescător după dată).
+    Returnează o listă de puncte în ordine cronologică.
+    """
+    chronological = list(reversed(attendances))
+    points = []
+    for index, attendance in enumerate(chronological):
+        recent = chronological[max(0, index - window + 1):index + 1]
+        present = sum(1 for item in recent if item.is_present)
+        ratings = [item.performance_rating for item in recent if item.performance_rating]
+        points.append({
+            'date': attendance.lesson.date,
+            'attendance_rate': _percent(present, len(recent)),
+            'avg_performance': _average(sum(ratings), len(ratings)),
+        })
+    return points
+
+
+def trend_polyline(points, width=300, height=60):
+    """Coordonatele SVG (polyline) pentru rata de prezență din tendință"""
+    if len(points) < 2:
+        return ''
+    step = width / (len(points) - 1)
+    return ' '.join(
+        f"{round(index * step, 1)},{round(height - point['attendance_rate'] / 100 * height, 1)}"
+        for index, point in enumerate(points)
+    )
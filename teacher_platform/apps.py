@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TeacherPlatformConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'teacher_platform'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,460 @@
+"""
+Backup logic per profesor: grupele, elevii, lecțiile, prezențele, temele și
+notițele unui profesor într-o arhivă ZIP autonomă și versionată.
+
+Arhiva conține manifest.json (versiune, profesor, coloane și număr de rânduri
+per tabel), câte un <tabel>.jsonl cu toate câmpurile concrete și, sub files/,
+fișierele încărcate (materiale, atașamente, avatare).
+
+Restaurarea creează rânduri noi (cheile primare sunt remapate), cu
+bulk_create tabel cu tabel în ordinea dependențelor, într-o singură
+tranzacție. Utilizatorii care există deja (după username) sunt refolosiți;
+cursurile, modulele, locațiile și șabloanele nu fac parte din arhivă și sunt
+legate doar dacă există în baza de date.
+"""
+import io
+import json
+import shutil
+import zipfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import User, TeacherProfile, StudentProfile
+from .analytics import STUDENT_STATS_NAMESPACE, stats_owner
+from .caching import bump_generation_on_commit
+from .changes import TRACKED_MODELS
+from .calendar_api import CALENDAR_NAMESPACE
+from .exports import DEFAULT_BATCH_SIZE, iter_batches, iter_jsonl
+from .models import (
+    Group, GroupCodeCounter, GroupStudent, GroupWaitlistEntry, Lesson, Attendance,
+    Assignment, AssignmentSubmission, LessonNote, DeletionLog,
+)
+from .signals import row_delete_receivers_disconnected
+from .summaries import DASHBOARD_NAMESPACE
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+FILES_PREFIX = 'files/'
+# Limită sub numărul maxim de parametri SQLite pentru filtrele id__in
+LOOKUP_CHUNK_SIZE = 2000
+
+TeacherLocation = TeacherProfile.locations.through
+
+# Tabelele arhivei, în ordinea în care sunt restaurate (dependențele înaintea dependenților)
+TABLES = [
+    ('users', User),
+    ('teacher_profiles', TeacherProfile),
+    ('teacher_locations', TeacherLocation),
+    ('groups', Group),
+    ('student_profiles', StudentProfile),
+    ('group_students', GroupStudent),
+    ('waitlist', GroupWaitlistEntry),
+    ('lessons', Lesson),
+    ('attendance', Attendance),
+    ('assignments', Assignment),
+    ('submissions', AssignmentSubmission),
+    ('lesson_notes', LessonNote),
+]
+ARCHIVED_MODELS = {model for _, model in TABLES}
+
+
+class BackupError(Exception):
+    """Arhiva nu poate fi scrisă sau restaurată"""
+
+
+def _columns(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def teacher_querysets(teacher):
+    """Rândurile fiecărui tabel care aparțin profesorului"""
+    students = (
+        Q(id__in=GroupStudent.objects.filter(group__teacher=teacher).values('student_id')) |
+        Q(id__in=GroupWaitlistEntry.objects.filter(group__teacher=teacher).values('student_id')) |
+        Q(id__in=StudentProfile.objects.filter(teacher=teacher).values('user_id')) |
+        Q(id__in=Attendance.objects.filter(lesson__group__teacher=teacher).values('student_id')) |
+        Q(id__in=AssignmentSubmission.objects.filter(assignment__group__teacher=teacher).values('student_id'))
+    )
+    parents = Q(id__in=User.objects.filter(students, parent__isnull=False).values('parent_id'))
+    return {
+        'users': User.objects.filter(Q(pk=teacher.pk) | students | parents),
+        'teacher_profiles': TeacherProfile.objects.filter(user=teacher),
+        'teacher_locations': TeacherLocation.objects.filter(teacherprofile__user=teacher),
+        'groups': Group.objects.filter(teacher=teacher),
+        'student_profiles': StudentProfile.objects.filter(user__in=User.objects.filter(students)),
+        'group_students': GroupStudent.objects.filter(group__teacher=teacher),
+        'waitlist': GroupWaitlistEntry.objects.filter(group__teacher=teacher),
+        'lessons': Lesson.objects.filter(group__teacher=teacher),
+        'attendance': Attendance.objects.filter(lesson__group__teacher=teacher),
+        'assignments': Assignment.objects.filter(group__teacher=teacher),
+        'submissions': AssignmentSubmission.objects.filter(assignment__group__teacher=teacher),
+        'lesson_notes': LessonNote.objects.filter(group__teacher=teacher),
+    }
+
+
+def _file_fields(model):
+    return [field for field in model._meta.concrete_fields if isinstance(field, models.FileField)]
+
+
+# ==================== BACKUP ====================
+
+def write_backup(teacher, path, batch_size=DEFAULT_BATCH_SIZE):
+    """Scrie arhiva profesorului; returnează manifestul"""
+    querysets = teacher_querysets(teacher)
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'created_at': timezone.now().isoformat(),
+        'teacher': teacher.username,
+        'tables': {},
+    }
+    files = set()
+
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, model in TABLES:
+            columns = _columns(model)
+            file_indexes = [columns.index(field.attname) for field in _file_fields(model)]
+            count = 0
+            with archive.open(f'{name}.jsonl', 'w') as output:
+                for batch in iter_batches(querysets[name], columns, batch_size):
+                    count += len(batch)
+                    for index in file_indexes:
+                        files.update(row[index] for row in batch if row[index])
+                    for chunk in iter_jsonl([batch], columns):
+                        output.write(chunk.encode('utf-8'))
+            manifest['tables'][name] = {'columns': columns, 'rows': count}
+
+        manifest['files'] = []
+        for name in sorted(files):
+            if not default_storage.exists(name):
+                continue
+            with default_storage.open(name, 'rb') as source, archive.open(FILES_PREFIX + name, 'w') as target:
+                shutil.copyfileobj(source, target)
+            manifest['files'].append(name)
+
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+    return manifest
+
+
+# ==================== RESTORE ====================
+
+# Ce șterge cascada grupelor unui profesor: model -> calea până la profesor
+PURGE_LOOKUPS = {
+    Group: 'teacher',
+    GroupStudent: 'group__teacher',
+    GroupWaitlistEntry: 'group__teacher',
+    Lesson: 'group__teacher',
+    Attendance: 'lesson__group__teacher',
+    Assignment: 'group__teacher',
+    AssignmentSubmission: 'assignment__group__teacher',
+    LessonNote: 'group__teacher',
+}
+
+
+def purge_teacher_groups(teacher, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Șterge grupele profesorului cu tot ce depinde de ele, în câțiva pași în
+    loc de semnale per rând: tombstone-urile (DeletionLog) cu bulk_create per
+    model, generațiile de cache o singură dată (după commit), apoi ștergerea
+    prin QuerySet.delete() cu receiver-ele per rând deconectate.
+    Trebuie apelată într-o tranzacție.
+    """
+    querysets = {model: model.objects.filter(**{lookup: teacher}) for model, lookup in PURGE_LOOKUPS.items()}
+    for model, queryset in querysets.items():
+        if model not in TRACKED_MODELS:
+            continue
+        label = model._meta.label_lower
+        for batch in iter_batches(queryset, ['id'], batch_size):
+            DeletionLog.objects.bulk_create([DeletionLog(model_label=label, object_id=pk) for pk, in batch])
+
+    student_ids = set(querysets[Attendance].order_by().values_list('student_id', flat=True).distinct())
+    student_ids.update(querysets[AssignmentSubmission].order_by().values_list('student_id', flat=True).distinct())
+    bump_generation_on_commit(CALENDAR_NAMESPACE, teacher.id)
+    bump_generation_on_commit(DASHBOARD_NAMESPACE, teacher.id)
+    for student_id in student_ids:
+        bump_generation_on_commit(STUDENT_STATS_NAMESPACE, stats_owner(teacher.id, student_id))
+
+    with row_delete_receivers_disconnected():
+        querysets[Group].delete()
+
+
+def read_manifest(archive):
+    try:
+        manifest = json.loads(archive.read(MANIFEST_NAME))
+    except KeyError:
+        raise BackupError('Arhiva nu conține manifest.json.')
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise BackupError(
+            f'Versiune de arhivă necunoscută: {manifest.get("format_version")} (suportată: {FORMAT_VERSION}).'
+        )
+    return manifest
+
+
+def _read_table(archive, name):
+    """Rândurile unui tabel ca dicționare (valorile încă în forma JSON)"""
+    with archive.open(f'{name}.jsonl') as source:
+        return [json.loads(line) for line in io.TextIOWrapper(source, encoding='utf-8')]
+
+
+def _chunks(values, size=LOOKUP_CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _existing_ids(model, ids):
+    existing = set()
+    for chunk in _chunks(ids):
+        existing.update(model.objects.filter(pk__in=chunk).values_list('pk', flat=True))
+    return existing
+
+
+def creation_date_fields(model):
+    return [field for field in model._meta.concrete_fields if getattr(field, 'auto_now_add', False)]
+
+
+def bulk_create_keeping_dates(model, objects, batch_size=None, **kwargs):
+    """
+    bulk_create care păstrează datele de creare date explicit (din arhivă,
+    din seed_scale) direct în INSERT. pre_save ar suprascrie câmpurile
+    auto_now_add (created_at, submitted_at...) cu momentul inserării, deci
+    obiectele fără dată o primesc înainte (prin același pre_save), iar
+    auto_now_add este oprit pe durata inserării. Oprirea e globală pentru
+    proces, deci funcția se folosește doar din comenzi. updated_at (auto_now)
+    rămâne momentul inserării, deci rândurile apar și în export_changes.
+    """
+    objects = list(objects)
+    fields = creation_date_fields(model)
+    for obj in objects:
+        for field in fields:
+            if getattr(obj, field.attname) is None:
+                field.pre_save(obj, add=True)
+
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        return model.objects.bulk_create(objects, batch_size=batch_size, **kwargs)
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class _Restorer:
+    def __init__(self, archive, manifest, batch_size):
+        self.archive = archive
+        self.manifest = manifest
+        self.batch_size = batch_size
+        self.archived_files = set(manifest.get('files', []))
+        # model -> {id vechi: id nou}
+        self.id_maps = {model: {} for model in ARCHIVED_MODELS}
+        # model extern (curs, locație...) -> id-urile care există în baza de date
+        self.shared_ids = {}
+        self.counts = {}
+        self.skipped = {}
+
+    # ---------- conversia rândurilor ----------
+
+    def _converters(self, model, columns):
+        converters = {}
+        for field in model._meta.concrete_fields:
+            if field.attname in columns and isinstance(
+                field, (models.DateField, models.TimeField, models.DecimalField)
+            ):
+                converters[field.attname] = field.to_python
+        return converters
+
+    def _load_shared_ids(self, model, rows):
+        """Pentru FK-urile spre modele din afara arhivei, ce id-uri există încă"""
+        for field in model._meta.concrete_fields:
+            target = field.related_model if field.is_relation else None
+            if target is None or target in ARCHIVED_MODELS:
+                continue
+            wanted = {row.get(field.attname) for row in rows} - {None}
+            known = self.shared_ids.setdefault(target, set())
+            known.update(_existing_ids(target, wanted - known))
+
+    def _restore_file(self, name):
+        if not name or default_storage.exists(name) or name not in self.archived_files:
+            return name
+        return default_storage.save(name, ContentFile(self.archive.read(FILES_PREFIX + name)))
+
+    def build(self, model, row, converters):
+        """
+        Instanța nesalvată pentru un rând din arhivă, cu FK-urile remapate;
+        None dacă o referință obligatorie lipsește
+        """
+        values = {}
+        for field in model._meta.concrete_fields:
+            if field.primary_key or field.attname not in row:
+                continue
+            value = row[field.attname]
+            if value is not None and field.is_relation:
+                target = field.related_model
+                if target in ARCHIVED_MODELS:
+                    value = self.id_maps[target].get(value)
+                elif value not in self.shared_ids.get(target, ()):
+                    value = None
+                if value is None and not field.null:
+                    return None
+            elif field.attname in converters and value is not None:
+                value = converters[field.attname](value)
+            elif isinstance(field, models.FileField):
+                value = self._restore_file(value)
+            values[field.attname] = value
+        return model(**values)
+
+    def restore_table(self, name, model, rows=None, prepare=None, ignore_conflicts=False):
+        """
+        Creează rândurile tabelului și completează harta de id-uri
+        (ignore_conflicts doar pentru tabele fără dependenți, id-urile nu se întorc)
+        """
+        rows = _read_table(self.archive, name) if rows is None else rows
+        columns = self.manifest['tables'][name]['columns']
+        converters = self._converters(model, columns)
+        self._load_shared_ids(model, rows)
+
+        old_ids, objects = [], []
+        for row in rows:
+            instance = self.build(model, row, converters)
+            if instance is None:
+                continue
+            old_ids.append(row['id'])
+            objects.append(instance)
+        if prepare is not None:
+            prepare(objects)
+
+        created = bulk_create_keeping_dates(model, objects, batch_size=self.batch_size, ignore_conflicts=ignore_conflicts)
+        if not ignore_conflicts:
+            self.id_maps[model].update(zip(old_ids, (instance.pk for instance in created)))
+        self.counts[name] = self.counts.get(name, 0) + len(created)
+        self.skipped[name] = self.skipped.get(name, 0) + len(rows) - len(objects)
+        return created
+
+    # ---------- tabelele cu reguli speciale ----------
+
+    def restore_users(self):
+        """Utilizatorii existenți (după username) sunt refolosiți, nu dublați"""
+        rows = _read_table(self.archive, 'users')
+        existing = {}
+        for chunk in _chunks(row['username'] for row in rows):
+            existing.update(User.objects.filter(username__in=chunk).values_list('username', 'id'))
+
+        new_rows = []
+        for row in rows:
+            if row['username'] in existing:
+                self.id_maps[User][row['id']] = existing[row['username']]
+            else:
+                new_rows.append(row)
+        self.reused_users = set(existing.values())
+
+        # Părinții pot fi în același lot, deci legătura se pune după inserare
+        parents = {row['id']: row.get('parent_id') for row in new_rows if row.get('parent_id')}
+        for row in new_rows:
+            row['parent_id'] = None
+        self.restore_table('users', User, new_rows)
+        self.counts['users_reused'] = len(existing)
+
+        children = []
+        for old_id, old_parent in parents.items():
+            parent_id = self.id_maps[User].get(old_parent)
+            if parent_id is not None:
+                children.append(User(pk=self.id_maps[User][old_id], parent_id=parent_id))
+        User.objects.bulk_update(children, ['parent'], batch_size=self.batch_size)
+
+    def restore_profiles(self, name, model):
+        """Un utilizator refolosit își păstrează profilul existent (OneToOne)"""
+        rows = _read_table(self.archive, name)
+        existing = dict(
+            model.objects.filter(user_id__in=self.reused_users).values_list('user_id', 'id')
+        ) if self.reused_users else {}
+        new_rows = []
+        for row in rows:
+            user_id = self.id_maps[User].get(row['user_id'])
+            if user_id in existing:
+                self.id_maps[model][row['id']] = existing[user_id]
+            else:
+                new_rows.append(row)
+        self.restore_table(name, model, new_rows)
+
+    def restore_groups(self):
+        """
+        Codurile originale sunt păstrate dacă sunt libere (iar contoarele sunt
+        aduse peste ele), altfel se alocă altele. active_student_count se
+        calculează din înscrierile arhivate, fiindcă bulk_create ocolește
+        GroupStudent.save.
+        """
+        rows = _read_table(self.archive, 'groups')
+        enrolments = _read_table(self.archive, 'group_students')
+        active = {}
+        for row in enrolments:
+            if row['is_active']:
+                active[row['group_id']] = active.get(row['group_id'], 0) + 1
+
+        codes = [row['code'] for row in rows if row.get('code')]
+        taken = set()
+        for chunk in _chunks(codes):
+            taken.update(Group.objects.filter(code__in=chunk).values_list('code', flat=True))
+        for row in rows:
+            row['active_student_count'] = active.get(row['id'], 0)
+            if row.get('code') in taken:
+                row['code'] = ''
+
+        def prepare(groups):
+            last_numbers = {}
+            for group in groups:
+                prefix, _, number = group.code.rpartition('-')
+                if prefix and number.isdigit():
+                    last_numbers[prefix] = max(last_numbers.get(prefix, 0), int(number))
+            for prefix, number in last_numbers.items():
+                GroupCodeCounter.objects.get_or_create(prefix=prefix)
+                GroupCodeCounter.objects.filter(prefix=prefix, last_number__lt=number).update(last_number=number)
+            Group.assign_codes(groups)
+
+        self.restore_table('groups', Group, rows, prepare=prepare)
+        self._enrolments = enrolments
+
+    def run(self):
+        self.restore_users()
+        self.restore_profiles('teacher_profiles', TeacherProfile)
+        self.restore_table('teacher_locations', TeacherLocation, ignore_conflicts=True)
+        self.restore_groups()
+        self.restore_profiles('student_profiles', StudentProfile)
+        self.restore_table('group_students', GroupStudent, self._enrolments)
+        for name, model in TABLES[6:]:
+            self.restore_table(name, model)
+
+
+def restore_backup(path, replace=False, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Restaurează arhiva într-o singură tranzacție. Cu replace=True, grupele
+    existente ale profesorului (cu lecțiile, prezențele și temele lor) sunt
+    șterse înainte. Returnează (profesor, număr de rânduri per tabel, rânduri sărite).
+    """
+    if not connection.features.can_return_rows_from_bulk_insert:
+        raise BackupError('Restaurarea necesită o bază de date care returnează id-urile din bulk_create.')
+
+    with zipfile.ZipFile(path) as archive:
+        manifest = read_manifest(archive)
+        restorer = _Restorer(archive, manifest, batch_size)
+        with transaction.atomic():
+            teacher = User.objects.filter(username=manifest['teacher']).first()
+            if teacher is not None:
+                if replace:
+                    purge_teacher_groups(teacher)
+                elif Group.objects.filter(teacher=teacher).exists():
+                    raise BackupError(
+                        f'Profesorul {teacher.username} are deja grupe. Folosește --replace pentru a le înlocui.'
+                    )
+            restorer.run()
+            teacher = User.objects.get(username=manifest['teacher'])
+
+            # bulk_create nu trimite post_save, deci invalidăm manual cache-ul (după commit)
+            bump_generation_on_commit(CALENDAR_NAMESPACE, teacher.id)
+            bump_generation_on_commit(DASHBOARD_NAMESPACE, teacher.id)
+            for student_id in restorer.id_maps[User].values():
+                bump_generation_on_commit(STUDENT_STATS_NAMESPACE, stats_owner(teacher.id, student_id))
+
+    return teacher, restorer.counts, {name: count for name, count in restorer.skipped.items() if count}
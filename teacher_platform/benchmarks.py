@@ -0,0 +1,280 @@
+"""
+Benchmark HTTP în proces: fiecare URL din courses.urls, teacher_platform.urls
+și soroban.urls este cerut cu test client-ul Django, pe baza de date curentă
+(de obicei populată cu seed_scale), ca profesor, elev sau vizitator anonim.
+
+Pentru fiecare view se raportează p50 / p95 / medie, numărul de interogări
+SQL și dimensiunea răspunsului. Interogările sunt numărate (execute_wrapper)
+într-o cerere separată, nemăsurată, care servește și ca încălzire: cache-ul
+calendarului / dashboard-ului este deci cald în timpul măsurătorii.
+
+Modulul este și URLconf-ul benchmark-ului: aplicațiile care nu sunt
+montate în mathcourses.urls (soroban) sunt adăugate aici sub prefixul lor.
+"""
+import datetime
+import importlib
+import platform
+import re
+import subprocess
+import threading
+import time
+
+import django
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import Count
+from django.test import Client
+from django.urls import URLPattern, URLResolver, get_resolver, include, path
+from django.utils import timezone
+
+from accounts.models import User
+from soroban.models import SorobanSession
+from .ics import make_feed_token
+from .models import Assignment, Group, GroupStudent, GroupWaitlistEntry, Lesson
+
+# (urlconf, prefix implicit dacă aplicația nu e montată, rolul implicit)
+BENCHMARK_APPS = [
+    ('courses.urls', '', 'anonymous'),
+    ('teacher_platform.urls', 'teacher/', 'teacher'),
+    ('soroban.urls', 'soroban/', 'student'),
+]
+ROLE_OVERRIDES = {
+    'soroban:teacher_overview': 'teacher',
+}
+DEFAULT_REQUESTS = 20
+
+_ROUTE_PARAMETER = re.compile(r'<(?:\w+:)?(\w+)>')
+
+
+def _mounted_prefixes():
+    """Prefixul sub care fiecare urlconf este inclus în ROOT_URLCONF"""
+    prefixes = {}
+    for entry in get_resolver(settings.ROOT_URLCONF).url_patterns:
+        if isinstance(entry, URLResolver) and isinstance(entry.urlconf_name, str):
+            prefixes[entry.urlconf_name] = str(entry.pattern)
+    return prefixes
+
+
+def _build_urlpatterns():
+    root = list(importlib.import_module(settings.ROOT_URLCONF).urlpatterns)
+    mounted = _mounted_prefixes()
+    for urlconf, prefix, _ in BENCHMARK_APPS:
+        if urlconf not in mounted:
+            root.append(path(prefix, include(urlconf)))
+    return root
+
+
+urlpatterns = _build_urlpatterns()
+
+
+# ==================== DATELE CERERILOR ====================
+
+class BenchmarkFixture:
+    """Obiectele reale din baza de date folosite pentru parametrii URL-urilor"""
+
+    def __init__(self, teacher=None, student=None):
+        self.teacher = teacher or User.objects.filter(role='teacher').annotate(
+            lesson_count=Count('taught_groups__lessons')
+        ).order_by('-lesson_count', 'id').first()
+        if self.teacher is None:
+            raise ValueError('Nu există niciun profesor în baza de date (rulează seed_scale).')
+
+        self.group = Group.objects.filter(teacher=self.teacher).order_by('-active_student_count', 'id').first()
+        enrolment = GroupStudent.objects.filter(group=self.group, is_active=True).order_by('id').first()
+        self.student = student or (enrolment.student if enrolment else None)
+        self.lesson = Lesson.objects.filter(
+            group=self.group, status='completed'
+        ).order_by('-date').first() or Lesson.objects.filter(group=self.group).first()
+        self.assignment = Assignment.objects.filter(group=self.group).order_by('-due_date').first()
+        self.waitlist_entry = GroupWaitlistEntry.objects.filter(group=self.group).first()
+        self.soroban_session = SorobanSession.objects.filter(student=self.student).order_by('-id').first()
+
+    def users(self):
+        return {'teacher': self.teacher, 'student': self.student, 'anonymous': None}
+
+    def kwargs_for(self, name):
+        """Valorile parametrilor de rută; None dacă lipsesc datele"""
+        day = self.lesson.date if self.lesson else timezone.localdate()
+        if name.endswith('group_calendar_feed'):
+            token = make_feed_token('group', self.group.id) if self.group else None
+        else:
+            token = make_feed_token('teacher', self.teacher.id)
+        return {
+            'group_id': self.group.id if self.group else None,
+            'student_id': self.student.id if self.student else None,
+            'lesson_id': self.lesson.id if self.lesson else None,
+            'assignment_id': self.assignment.id if self.assignment else None,
+            'entry_id': self.waitlist_entry.id if self.waitlist_entry else None,
+            'session_id': self.soroban_session.id if self.soroban_session else None,
+            'slug': self.group.course.slug if self.group and self.group.course else None,
+            'token': token,
+        }, {
+            'teacher_platform:lessons_range_api': {
+                'from': (day - datetime.timedelta(days=30)).isoformat(),
+                'to': day.isoformat(),
+            },
+            'teacher_platform:calendar': {'year': day.year, 'month': day.month},
+            'teacher_platform:get_modules_for_course': {
+                'course_id': self.group.course_id if self.group else '',
+            },
+        }.get(name, {})
+
+
+def iter_views(fixture):
+    """(nume, cale, query, rol) pentru fiecare URL; cale None dacă lipsesc datele"""
+    mounted = _mounted_prefixes()
+    for urlconf, default_prefix, default_role in BENCHMARK_APPS:
+        module = importlib.import_module(urlconf)
+        namespace = getattr(module, 'app_name', None)
+        prefix = mounted.get(urlconf, default_prefix)
+        for pattern in module.urlpatterns:
+            if not isinstance(pattern, URLPattern):
+                continue
+            name = f'{namespace}:{pattern.name}' if namespace else pattern.name
+            kwargs, query = fixture.kwargs_for(name)
+            missing = [param for param in _ROUTE_PARAMETER.findall(str(pattern.pattern)) if kwargs.get(param) is None]
+            url = None
+            if not missing:
+                url = '/' + prefix + _ROUTE_PARAMETER.sub(lambda m: str(kwargs[m.group(1)]), str(pattern.pattern))
+            yield name, url, query, ROLE_OVERRIDES.get(name, default_role)
+
+
+# ==================== MĂSURARE ====================
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _make_client(user):
+    client = Client(raise_request_exception=False)
+    if user is not None:
+        client.force_login(user)
+    return client
+
+
+def _fetch(client, url, query):
+    """O cerere GET completă (inclusiv conținutul streaming); returnează (status, bytes)"""
+    response = client.get(url, query)
+    if response.streaming:
+        size = sum(len(chunk) for chunk in response.streaming_content)
+    else:
+        size = len(response.content)
+    response.close()
+    return response.status_code, size
+
+
+def _timed_requests(user, url, query, count, threads):
+    """Durata fiecărei cereri, în secunde, plus durata totală"""
+    durations = []
+    lock = threading.Lock()
+
+    def worker(share):
+        client = _make_client(user)
+        local = []
+        try:
+            for _ in range(share):
+                started = time.perf_counter()
+                _fetch(client, url, query)
+                local.append(time.perf_counter() - started)
+        finally:
+            if threads > 1:
+                connections.close_all()
+        with lock:
+            durations.extend(local)
+
+    shares = [count // threads + (1 if index < count % threads else 0) for index in range(threads)]
+    started = time.perf_counter()
+    if threads == 1:
+        worker(count)
+    else:
+        workers = [threading.Thread(target=worker, args=(share,)) for share in shares if share]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    return durations, time.perf_counter() - started
+
+
+def benchmark_view(user, url, query, requests=DEFAULT_REQUESTS, threads=1):
+    client = _make_client(user)
+    executed = []
+
+    def count_queries(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_queries):
+        status, size = _fetch(client, url, query)
+
+    durations, wall = _timed_requests(user, url, query, requests, threads)
+    return {
+        'status': status,
+        'queries': len(executed),
+        'bytes': size,
+        'requests': len(durations),
+        'p50_ms': round(_percentile(durations, 0.50) * 1000, 2),
+        'p95_ms': round(_percentile(durations, 0.95) * 1000, 2),
+        'mean_ms': round(sum(durations) / len(durations) * 1000, 2),
+        'throughput_rps': round(len(durations) / wall, 1) if wall else None,
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(fixture, requests=DEFAULT_REQUESTS, threads=1, only=None, on_result=None):
+    """
+    Rulează benchmark-ul pe toate URL-urile (sau doar cele care conțin `only`)
+    și returnează raportul ca dicționar serializabil JSON
+    """
+    users = fixture.users()
+    results = []
+    for name, url, query, role in iter_views(fixture):
+        if only and not any(part in name for part in only):
+            continue
+        result = {'name': name, 'url': url, 'role': role}
+        if url is None:
+            result['skipped'] = 'lipsesc datele pentru parametrii URL-ului'
+        elif role != 'anonymous' and users[role] is None:
+            result['skipped'] = f'nu există utilizator cu rolul {role}'
+        else:
+            result.update(benchmark_view(users[role], url, query, requests, threads))
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    return {
+        'meta': {
+            'created_at': timezone.now().isoformat(),
+            'git_revision': _git_revision(),
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'requests_per_view': requests,
+            'threads': threads,
+            'teacher': fixture.teacher.username,
+            'student': fixture.student.username if fixture.student else None,
+        },
+        'results': results,
+    }
+
+
+def compare_reports(baseline, current):
+    """(nume, p50 vechi, p50 nou, variație %) pentru view-urile măsurate în ambele rulări"""
+    previous = {result['name']: result for result in baseline['results'] if 'p50_ms' in result}
+    rows = []
+    for result in current['results']:
+        old = previous.get(result['name'])
+        if old is None or 'p50_ms' not in result:
+            continue
+        change = (result['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100 if old['p50_ms'] else 0
+        rows.append((result['name'], old['p50_ms'], result['p50_ms'], round(change, 1)))
+    return rows
@@ -0,0 +1,88 @@
+"""
+Cache per profesor cu invalidare prin generații.
+
+Fiecare profesor are un număr de generație per namespace (ex: 'calendar').
+Cheile de date includ generația, deci o modificare doar schimbă generația,
+iar intrările vechi expiră singure - nu trebuie șterse una câte una.
+
+Semnalele folosesc bump_generation_on_commit: o tranzacție care modifică
+multe rânduri (ex. ștergerea în cascadă a unei grupe) schimbă fiecare
+generație o singură dată, după commit, nu la fiecare rând.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from mathcourses.metrics import record_cache
+
+KEY_PREFIX = 'teacher_platform'
+GENERATION_TIMEOUT = None  # generațiile nu expiră
+DEFAULT_TIMEOUT = 60 * 60
+
+
+def _generation_key(namespace, teacher_id):
+    return f'{KEY_PREFIX}:{namespace}:gen:{teacher_id}'
+
+
+def get_generation(namespace, teacher_id):
+    """Returnează generația curentă (o creează dacă lipsește)"""
+    key = _generation_key(namespace, teacher_id)
+    generation = cache.get(key)
+    if generation is None:
+        generation = time.time_ns()
+        cache.add(key, generation, GENERATION_TIMEOUT)
+        generation = cache.get(key, generation)
+    return generation
+
+
+def bump_generation(namespace, teacher_id):
+    """Invalidează toate intrările profesorului din namespace"""
+    if teacher_id is None:
+        return
+    cache.set(_generation_key(namespace, teacher_id), time.time_ns(), GENERATION_TIMEOUT)
+
+
+_pending = threading.local()
+
+
+def _pending_bumps(using):
+    """Generațiile de schimbat la commit, per conexiune (conexiunile sunt per thread)"""
+    if not hasattr(_pending, 'by_alias'):
+        _pending.by_alias = {}
+    return _pending.by_alias.setdefault(using, set())
+
+
+def _flush_bumps(using):
+    pending = _pending_bumps(using)
+    while pending:
+        bump_generation(*pending.pop())
+
+
+def bump_generation_on_commit(namespace, teacher_id, using=None):
+    """
+    Ca bump_generation, dar după commit-ul tranzacției curente și o singură
+    dată per (namespace, profesor), oricâte rânduri ar schimba tranzacția.
+    În afara unei tranzacții generația se schimbă imediat.
+    """
+    if teacher_id is None:
+        return
+    using = using or DEFAULT_DB_ALIAS
+    _pending_bumps(using).add((namespace, teacher_id))
+    # Înregistrat la fiecare apel: dacă un savepoint cu apelurile anterioare este
+    # anulat, callback-urile lui dispar, dar perechile rămân și se aplică la
+    # următorul commit. Primul callback golește setul, restul nu mai fac nimic.
+    transaction.on_commit(lambda: _flush_bumps(using), using=using)
+
+
+def make_key(namespace, teacher_id, *parts):
+    """Cheie versionată pentru o intrare a profesorului"""
+    generation = get_generation(namespace, teacher_id)
+    suffix = ':'.join(str(part) for part in parts)
+    return f'{KEY_PREFIX}:{namespace}:{teacher_id}:{generation}:{suffix}'
+
+
+def count_lookup(namespace, found, requested=1):
+    """Hit / miss pentru metricile de cache (found = câte chei au fost găsite)"""
+    record_cache(namespace, hits=int(found), misses=requested - int(found))
@@ -0,0 +1,107 @@
+"""
+Payload-uri lunare pentru API-ul de calendar.
+
+Lecțiile unui profesor sunt serializate compact și ținute în cache per lună,
+astfel încât navigarea între luni să nu mai interogheze baza de date.
+"""
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from .caching import make_key, count_lookup, DEFAULT_TIMEOUT
+from .models import Lesson
+
+CALENDAR_NAMESPACE = 'calendar'
+DEFAULT_MODULE_COLOR = '#667eea'
+MAX_RANGE_DAYS = 366
+# Face parte din cheie: schimbarea formatului payload-ului nu citește intrări vechi
+PAYLOAD_VERSION = 2
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(day):
+    if day.month == 12:
+        return date(day.year + 1, 1, 1)
+    return date(day.year, day.month + 1, 1)
+
+
+def months_in_range(date_from, date_to):
+    """Lista (an, lună) care acoperă intervalul [date_from, date_to]"""
+    months = []
+    current = month_start(date_from)
+    while current <= date_to:
+        months.append((current.year, current.month))
+        current = next_month(current)
+    return months
+
+
+def serialize_lesson(lesson):
+    module = lesson.group.module
+    if lesson.lesson_template:
+        title = lesson.lesson_template.name
+    else:
+        title = lesson.topic
+    return {
+        'id': lesson.id,
+        'date': lesson.date.isoformat(),
+        'start': lesson.start_time.strftime('%H:%M'),
+        'end': lesson.end_time.strftime('%H:%M') if lesson.end_time else None,
+        'status': lesson.status,
+        'status_display': lesson.get_status_display(),
+        'group_id': lesson.group_id,
+        'group': lesson.group.name,
+        'title': title,
+        'module': module.name if module else None,
+        'color': module.color if module else DEFAULT_MODULE_COLOR,
+        'url': reverse('teacher_platform:lesson_detail', args=[lesson.id]),
+    }
+
+
+def _load_months(teacher, months):
+    """Construiește payload-urile pentru lunile cerute dintr-o singură interogare"""
+    first = date(*months[0], 1)
+    last = next_month(date(*months[-1], 1)) - timedelta(days=1)
+
+    payloads = {month: [] for month in months}
+    lessons = Lesson.objects.filter(
+        group__teacher=teacher,
+        date__range=[first, last]
+    ).select_related('group', 'group__module', 'lesson_template').order_by('date', 'start_time')
+
+    for lesson in lessons:
+        month = (lesson.date.year, lesson.date.month)
+        if month in payloads:
+            payloads[month].append(serialize_lesson(lesson))
+    return payloads
+
+
+def get_lessons_payload(teacher, date_from, date_to):
+    """
+    Lecțiile profesorului din intervalul dat, servite din cache-ul lunar.
+    Lunile lipsă din cache sunt încărcate împreună și salvate înapoi.
+    """
+    months = months_in_range(date_from, date_to)
+    keys = {month: make_key(CALENDAR_NAMESPACE, teacher.id, f'v{PAYLOAD_VERSION}', f'{month[0]}-{month[1]:02d}') for month in months}
+
+    cached = cache.get_many(keys.values())
+    count_lookup(CALENDAR_NAMESPACE, len(cached), len(keys))
+    missing = [month for month in months if keys[month] not in cached]
+
+    if missing:
+        loaded = _load_months(teacher, missing)
+        cache.set_many({keys[month]: loaded[month] for month in missing}, DEFAULT_TIMEOUT)
+        cached.update({keys[month]: loaded[month] for month in missing})
+
+    start = date_from.isoformat()
+    end = date_to.isoformat()
+    lessons = []
+    for month in months:
+        lessons.extend(
+            lesson for lesson in cached[keys[month]]
+            if start <= lesson['date'] <= end
+        )
+    return lessons
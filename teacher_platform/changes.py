@@ -0,0 +1,182 @@
+"""
+Export incremental (change data) pentru pipeline-ul BI: doar rândurile
+modificate de la ultima rulare, plus ștergerile înregistrate în DeletionLog.
+
+Fiecare flux are un watermark persistent (ExportWatermark) cu ultima poziție
+(updated_at, id) exportată. Rândurile noi sunt citite în loturi keyset
+WHERE (updated_at, id) > watermark ORDER BY updated_at, id, deci fiecare lot
+este un range scan pe indexul updated_at, indiferent de mărimea tabelei.
+
+Fișierele sunt partiționate după ziua (UTC) modificării:
+<director>/<flux>/dt=YYYY-MM-DD/part-<rulare>.jsonl.gz
+Exportul este „cel puțin o dată”: dacă o rulare se oprește înainte de
+salvarea watermark-ului, rândurile reapar în rularea următoare, deci
+consumatorul deduplică pe (id, updated_at).
+"""
+import datetime
+import gzip
+import os
+from dataclasses import dataclass
+
+from django.db.models import Q
+from django.utils import timezone
+
+from courses.models import Module, LessonTemplate
+from soroban.models import SorobanSession
+from .exports import DEFAULT_BATCH_SIZE, GZIP_LEVEL, iter_jsonl
+from .models import (
+    Group, GroupStudent, Lesson, LessonNote, Attendance, AssignmentSubmission,
+    DeletionLog, ExportWatermark,
+)
+
+# Rândurile modificate în ultimele secunde nu sunt încă exportate: updated_at
+# se setează înainte de commit, iar o tranzacție lungă poate face vizibil
+# mai târziu un rând cu timestamp mai vechi decât watermark-ul
+DEFAULT_LAG_SECONDS = 60
+
+# Flux -> model. Coloanele sunt toate câmpurile concrete ale modelului.
+FEEDS = {
+    'groups': Group,
+    'enrolments': GroupStudent,
+    'lessons': Lesson,
+    'lesson_notes': LessonNote,
+    'attendance': Attendance,
+    'submissions': AssignmentSubmission,
+    'soroban_sessions': SorobanSession,
+    'modules': Module,
+    'lesson_templates': LessonTemplate,
+}
+DELETIONS_FEED = 'deletions'
+
+# Modelele pentru care ștergerile sunt înregistrate (vezi signals.py)
+TRACKED_MODELS = tuple(FEEDS.values())
+
+
+@dataclass
+class FeedResult:
+    feed: str
+    rows: int
+    files: list
+    watermark: tuple
+
+
+def feed_names():
+    return list(FEEDS) + [DELETIONS_FEED]
+
+
+def _feed_source(feed):
+    """(queryset, coloane, câmpul de timp) pentru un flux"""
+    if feed == DELETIONS_FEED:
+        return DeletionLog.objects.all(), ['id', 'model_label', 'object_id', 'deleted_at'], 'deleted_at'
+    model = FEEDS[feed]
+    columns = [field.attname for field in model._meta.concrete_fields]
+    return model.objects.all(), columns, 'updated_at'
+
+
+def iter_changed_batches(queryset, columns, timestamp_field, since=None, last_id=0, until=None,
+                         batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Loturi de tupluri cu (timestamp, id) strict după (since, last_id) și
+    timestamp <= until, în ordinea (timestamp, id)
+    """
+    queryset = queryset.order_by(timestamp_field, 'pk').values_list(*columns)
+    if until is not None:
+        queryset = queryset.filter(**{f'{timestamp_field}__lte': until})
+    ts_index = columns.index(timestamp_field)
+    pk_index = columns.index('id')
+    while True:
+        page = queryset
+        if since is not None:
+            page = queryset.filter(
+                Q(**{f'{timestamp_field}__gt': since}) | Q(**{timestamp_field: since, 'pk__gt': last_id})
+            )
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        since, last_id = batch[-1][ts_index], batch[-1][pk_index]
+
+
+class _PartitionWriter:
+    """
+    Scrie rândurile în fișierul zilei lor. Rândurile vin sortate după timp,
+    deci un singur fișier e deschis la un moment dat; fiecare e scris sub un
+    nume temporar și redenumit abia după închidere.
+    """
+
+    def __init__(self, output_dir, feed, run_stamp, columns):
+        self.base_dir = os.path.join(output_dir, feed)
+        self.run_stamp = run_stamp
+        self.columns = columns
+        self.current_day = None
+        self.handle = None
+        self.paths = []
+
+    def write(self, day, rows):
+        if day != self.current_day:
+            self.close()
+            directory = os.path.join(self.base_dir, f'dt={day.isoformat()}')
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f'part-{self.run_stamp}.jsonl.gz')
+            self.handle = gzip.open(path + '.tmp', 'wt', encoding='utf-8', compresslevel=GZIP_LEVEL)
+            self.paths.append(path)
+            self.current_day = day
+        for chunk in iter_jsonl([rows], self.columns):
+            self.handle.write(chunk)
+
+    def close(self):
+        if self.handle is not None:
+            self.handle.close()
+            os.replace(self.paths[-1] + '.tmp', self.paths[-1])
+            self.handle = None
+
+
+def _utc_day(value):
+    return value.astimezone(datetime.timezone.utc).date()
+
+
+def export_feed(feed, output_dir, since=None, lag_seconds=DEFAULT_LAG_SECONDS,
+                batch_size=DEFAULT_BATCH_SIZE, run_stamp=None):
+    """
+    Exportă modificările unui flux de la watermark (sau de la `since`, dacă e
+    dat) și avansează watermark-ul după ce fișierele sunt complete
+    """
+    queryset, columns, timestamp_field = _feed_source(feed)
+    watermark, _ = ExportWatermark.objects.get_or_create(feed=feed)
+    if since is not None:
+        start, start_id = since, 0
+    else:
+        start, start_id = watermark.last_timestamp, watermark.last_id
+
+    now = timezone.now()
+    until = now - datetime.timedelta(seconds=lag_seconds)
+    run_stamp = run_stamp or now.strftime('%Y%m%dT%H%M%S')
+    ts_index = columns.index(timestamp_field)
+    pk_index = columns.index('id')
+
+    writer = _PartitionWriter(output_dir, feed, run_stamp, columns)
+    count = 0
+    last_row = None
+    try:
+        for batch in iter_changed_batches(queryset, columns, timestamp_field, start, start_id, until, batch_size):
+            # Lotul e sortat după timp, deci zilele formează secvențe contigue
+            day_start = 0
+            for index in range(1, len(batch) + 1):
+                if index == len(batch) or _utc_day(batch[index][ts_index]) != _utc_day(batch[day_start][ts_index]):
+                    writer.write(_utc_day(batch[day_start][ts_index]), batch[day_start:index])
+                    day_start = index
+            count += len(batch)
+            last_row = batch[-1]
+    finally:
+        writer.close()
+
+    if last_row is not None:
+        position = (last_row[ts_index], last_row[pk_index])
+        # Un --since mai vechi re-exportă istoric, dar nu dă watermark-ul înapoi
+        if watermark.last_timestamp is None or position > (watermark.last_timestamp, watermark.last_id):
+            watermark.last_timestamp, watermark.last_id = position
+    watermark.last_run_at = now
+    watermark.save()
+    return FeedResult(feed, count, writer.paths, (watermark.last_timestamp, watermark.last_id))
@@ -0,0 +1,198 @@
+"""
+Exporturi complete (CSV și JSONL comprimat gzip) pentru contabilitate și
+raportare: grupe, înscrieri, lecții, prezențe, teme predate și sesiuni soroban.
+
+Tabelele sunt citite în loturi cu paginare keyset pe cheia primară
+(WHERE id > ultimul_id ORDER BY id LIMIT n), nu cu OFFSET și nu toate odată.
+Câmpurile din relații sunt aduse prin JOIN în aceeași interogare
+(values_list pe căi `relatie__camp`), deci nu există interogări per rând și
+nici obiecte model construite pentru fiecare rând.
+"""
+import csv
+import gzip
+import json
+import zlib
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from soroban.models import SorobanSession
+from .models import Group, GroupStudent, Lesson, Attendance, AssignmentSubmission
+
+DEFAULT_BATCH_SIZE = 5000
+# Nivelul 6 (implicit zlib) comprimă aproape cât 9, de câteva ori mai repede
+GZIP_LEVEL = 6
+
+# Nume export -> (model, coloane). Coloanele sunt căi values_list.
+EXPORTS = {
+    'groups': (Group, [
+        'id', 'code', 'name', 'teacher_id', 'teacher__username', 'course__title', 'module__name',
+        'location__name', 'weekday', 'start_time', 'duration_minutes', 'start_date', 'end_date',
+        'max_students', 'active_student_count', 'is_active', 'created_date', 'created_at', 'updated_at',
+    ]),
+    'enrolments': (GroupStudent, [
+        'id', 'group_id', 'group__code', 'student_id', 'student__username', 'student__first_name',
+        'student__last_name', 'enrolled_date', 'is_active', 'lessons_attended', 'lessons_missed',
+    ]),
+    'lessons': (Lesson, [
+        'id', 'group_id', 'group__code', 'group__teacher__username', 'lesson_template__name',
+        'date', 'start_time', 'end_time', 'status', 'topic', 'created_at', 'updated_at',
+    ]),
+    'attendance': (Attendance, [
+        'id', 'lesson_id', 'lesson__date', 'lesson__group_id', 'lesson__group__code', 'student_id',
+        'student__username', 'is_present', 'performance_rating', 'notes', 'created_at',
+    ]),
+    'submissions': (AssignmentSubmission, [
+        'id', 'assignment_id', 'assignment__title', 'assignment__due_date', 'assignment__group__code',
+        'student_id', 'student__username', 'submitted_at', 'is_graded', 'score', 'graded_at',
+    ]),
+    'soroban_sessions': (SorobanSession, [
+        'id', 'student_id', 'student__username', 'exercise_id', 'exercise__title', 'started_at',
+        'completed_at', 'total_time_seconds', 'problems_attempted', 'problems_correct', 'points_earned',
+    ]),
+}
+
+FORMATS = ('csv', 'jsonl')
+
+
+def get_export(name):
+    """(model, coloane) pentru un export; ridică KeyError pentru nume necunoscute"""
+    return EXPORTS[name]
+
+
+def export_name_for_model(model):
+    for name, (export_model, _) in EXPORTS.items():
+        if export_model is model:
+            return name
+    raise KeyError(model)
+
+
+def iter_batches(queryset, columns, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Loturi de tupluri, paginate keyset pe `id`: fiecare lot este o interogare
+    separată pornind de la ultimul id văzut, deci memoria rămâne constantă
+    """
+    queryset = queryset.order_by('pk').values_list(*columns)
+    pk_index = columns.index('id')
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        last_pk = batch[-1][pk_index]
+
+
+# ==================== FORMATE ====================
+
+class _LineBuffer:
+    """Obiect „fișier” pentru csv.writer care adună liniile într-o listă"""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def write(self, value):
+        self.lines.append(value)
+
+
+def iter_csv(batches, columns):
+    """Text CSV (antet + rânduri), un bloc per lot"""
+    buffer = []
+    writer = csv.writer(_LineBuffer(buffer))
+    writer.writerow(columns)
+    yield ''.join(buffer)
+    for batch in batches:
+        buffer.clear()
+        writer.writerows(batch)
+        yield ''.join(buffer)
+
+
+def _json_default(value):
+    """Date, ore și Decimal ca text ISO (mai rapid decât DjangoJSONEncoder)"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_jsonl(batches, columns):
+    """Text JSONL (un obiect per rând), un bloc per lot"""
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_json_default).encode
+    for batch in batches:
+        yield ''.join(encode(dict(zip(columns, row))) + '\n' for row in batch)
+
+
+def iter_gzip(chunks, level=GZIP_LEVEL):
+    """Comprimă gzip din mers un flux de blocuri text"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_export(queryset, columns, export_format, batch_size=DEFAULT_BATCH_SIZE):
+    """Blocurile exportului: text pentru CSV, bytes gzip pentru JSONL"""
+    batches = iter_batches(queryset, columns, batch_size)
+    if export_format == 'csv':
+        return iter_csv(batches, columns)
+    return iter_gzip(iter_jsonl(batches, columns))
+
+
+def export_filename(name, export_format):
+    stamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+    extension = 'csv' if export_format == 'csv' else 'jsonl.gz'
+    return f'{name}-{stamp}.{extension}'
+
+
+def write_export(name, export_format, path, queryset=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Scrie exportul într-un fișier; returnează numărul de rânduri"""
+    model, columns = get_export(name)
+    queryset = model.objects.all() if queryset is None else queryset
+    count = 0
+
+    def counted(batches):
+        nonlocal count
+        for batch in batches:
+            count += len(batch)
+            yield batch
+
+    batches = counted(iter_batches(queryset, columns, batch_size))
+    if export_format == 'csv':
+        with open(path, 'w', newline='', encoding='utf-8') as output:
+            for chunk in iter_csv(batches, columns):
+                output.write(chunk)
+    else:
+        with gzip.open(path, 'wt', encoding='utf-8', compresslevel=GZIP_LEVEL) as output:
+            for chunk in iter_jsonl(batches, columns):
+                output.write(chunk)
+    return count
+
+
+def export_response(name, export_format, queryset=None):
+    """Răspuns HTTP streaming cu exportul (folosit de acțiunile din admin)"""
+    model, columns = get_export(name)
+    queryset = model.objects.all() if queryset is None else queryset
+    content_type = 'text/csv; charset=utf-8' if export_format == 'csv' else 'application/gzip'
+    response = StreamingHttpResponse(iter_export(queryset, columns, export_format), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(name, export_format)}"'
+    return response
+
+
+# ==================== ACȚIUNI ADMIN ====================
+
+def _make_action(export_format, description):
+    def action(modeladmin, request, queryset):
+        return export_response(export_name_for_model(queryset.model), export_format, queryset)
+
+    action.__name__ = f'export_{export_format}'
+    action.short_description = description
+    return action
+
+
+export_as_csv = _make_action('csv', 'Exportă selecția (CSV)')
+export_as_jsonl = _make_action('jsonl', 'Exportă selecția (JSONL.gz)')
+EXPORT_ACTIONS = [export_as_csv, export_as_jsonl]
@@ -1,7 +1,8 @@
 from django import forms
 from django.contrib.auth.hashers import make_password
+from django.db import transaction
 from django.utils import timezone
-from .models import Group, GroupStudent, Lesson
+from .models import Group, GroupStudent, GroupWaitlistEntry, Lesson
 from accounts.models import User, StudentProfile, TeacherProfile
 from courses.models import Course, Module, Location
 
@@ -52,6 +53,9 @@ class GroupForm(forms.ModelForm):
         elif self.instance.pk and self.instance.course:
             self.fields['module'].queryset = Module.objects.filter(course=self.instance.course, is_active=True)
 
+        # Module.__str__ afișează cursul: fără interogare per opțiune din listă
+        self.fields['module'].queryset = self.fields['module'].queryset.select_related('course')
+
 
 class StudentForm(forms.ModelForm):
     """
@@ -153,8 +157,16 @@ class StudentForm(forms.ModelForm):
             raise forms.ValidationError('Acest username este deja folosit. Te rog alege altul.')
         return username
 
+    def clean_group(self):
+        """Verifică dacă grupa mai are locuri libere"""
+        group = self.cleaned_data.get('group')
+        if group and not group.has_available_spots():
+            raise forms.ValidationError('Grupa a atins numărul maxim de elevi.')
+        return group
+
+    @transaction.atomic
     def save(self, commit=True):
-        """Creează User și StudentProfile"""
+        """Creează User și StudentProfile (GroupFullError anulează tot)"""
         user = super().save(commit=False)
         user.role = 'student'
 
@@ -191,6 +203,62 @@ class StudentForm(forms.ModelForm):
         return user
 
 
+class StudentImportForm(forms.Form):
+    """
+    Formular pentru importul în masă al elevilor dintr-un fișier CSV sau XLSX
+    """
+    file = forms.FileField(
+        label="Fișier",
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.xlsx'}),
+        help_text="Coloane: Prenume, Nume și opțional Username, Data Nașterii, Email Părinte, "
+                  "Telefon Părinte, Sex, Avatar, Școala, Clasa"
+    )
+    group = forms.ModelChoiceField(
+        queryset=Group.objects.none(),
+        required=False,
+        label="Grupă",
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        help_text="Opțional: toți elevii importați vor fi înscriși în această grupă"
+    )
+
+    def __init__(self, *args, teacher=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if teacher:
+            self.fields['group'].queryset = Group.objects.filter(teacher=teacher, is_active=True)
+
+
+class WaitlistEntryForm(forms.ModelForm):
+    """
+    Formular pentru adăugarea unui elev în lista de așteptare a unei grupe
+    """
+    class Meta:
+        model = GroupWaitlistEntry
+        fields = ['student', 'notes']
+        widgets = {
+            'student': forms.Select(attrs={'class': 'form-select'}),
+            'notes': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Opțional'}),
+        }
+        labels = {
+            'student': 'Elev',
+            'notes': 'Observații',
+        }
+
+    def __init__(self, *args, teacher=None, group=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.group = group
+
+        # Elevii profesorului care nu sunt deja în grupă sau în coadă
+        if teacher and group:
+            self.fields['student'].queryset = User.objects.filter(
+                role='student',
+                student_profile__teacher=teacher
+            ).exclude(
+                id__in=GroupStudent.objects.filter(group=group, is_active=True).values('student_id')
+            ).exclude(
+                id__in=GroupWaitlistEntry.objects.filter(group=group).values('student_id')
+            ).order_by('first_name', 'last_name')
+
+
 class EditStudentForm(forms.ModelForm):
     """
     Formular pentru editarea informațiilor elevului
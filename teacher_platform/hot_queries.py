@@ -0,0 +1,50 @@
+"""
+Interogările critice ale platformei, urmărite prin snapshot-uri de plan
+(mathcourses.plans): calendarul pe interval, numărătorile dashboard-ului,
+lista de elevi și clasamentul Soroban.
+
+Setul de date este generat determinist cu ScaleSeeder, astfel încât testul
+(PlanSnapshotTests) și comanda refresh_plan_snapshots văd aceleași
+interogări.
+"""
+from pathlib import Path
+
+from soroban.views import leaderboard_rank, leaderboard_top
+from .benchmarks import BenchmarkFixture
+from .calendar_api import _load_months
+from .queries import roster_page
+from .seeding import ScaleConfig, ScaleSeeder
+from .summaries import build_dashboard_summary
+
+SNAPSHOT_PATH = Path(__file__).resolve().parent / 'plan_snapshots.json'
+
+DATASET = ScaleConfig(
+    locations=3,
+    teachers=4,
+    students=240,
+    groups_per_teacher=4,
+    max_students_per_group=10,
+    years=1,
+    soroban_sessions=5,
+    prefix='plans',
+)
+
+
+def build_world():
+    """Populează baza de date (goală) și întoarce obiectele folosite ca parametri"""
+    seeder = ScaleSeeder(DATASET)
+    seeder.run()
+    return BenchmarkFixture(teacher=seeder.teachers[0])
+
+
+def hot_queries(world):
+    """{nume: funcție} - fiecare funcție rulează codul real al paginii"""
+    teacher = world.teacher
+    day = world.lesson.date
+    return {
+        'calendar_range': lambda: _load_months(teacher, [(day.year, day.month)]),
+        'dashboard_counts': lambda: build_dashboard_summary(teacher, day),
+        'students_list': lambda: roster_page(teacher),
+        'students_list_group': lambda: roster_page(teacher, group_id=world.group.id),
+        'leaderboard': lambda: (list(leaderboard_top()), leaderboard_rank(100)),
+    }
@@ -0,0 +1,176 @@
+"""
+Feed-uri iCalendar (.ics) pentru lecțiile unui profesor sau ale unei grupe.
+
+Feed-urile sunt publice (aplicațiile de calendar nu au sesiune), deci accesul
+se face printr-un token semnat care identifică profesorul sau grupa.
+"""
+import zlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .caching import get_generation
+from .calendar_api import CALENDAR_NAMESPACE
+
+FEED_SALT = 'teacher_platform.ics'
+ITERATOR_CHUNK_SIZE = 500
+
+
+def make_feed_token(kind, object_id):
+    """Generează tokenul semnat pentru feed-ul unui profesor ('teacher') sau al unei grupe ('group')"""
+    return signing.Signer(salt=FEED_SALT).sign(f'{kind}-{object_id}')
+
+
+def read_feed_token(token, kind):
+    """Returnează id-ul din token sau None dacă tokenul e invalid / de alt tip"""
+    try:
+        value = signing.Signer(salt=FEED_SALT).unsign(token)
+    except signing.BadSignature:
+        return None
+    token_kind, _, object_id = value.partition('-')
+    if token_kind != kind or not object_id.isdigit():
+        return None
+    return int(object_id)
+
+
+def feed_state(lessons, teacher_id):
+    """
+    Starea feed-ului (ultima modificare + număr lecții) într-o singură interogare.
+    Numărul de lecții intră în ETag ca ștergerile să invalideze feed-ul.
+    Grupa, locația și șablonul apar în evenimente, dar au propriul updated_at
+    (sau niciunul): schimbările lor mută generația de calendar a profesorului
+    (vezi signals.py), care intră și ea în ETag / Last-Modified.
+    """
+    state = lessons.aggregate(last_modified=Max('updated_at'), total=Count('id'))
+    state['generation'] = get_generation(CALENDAR_NAMESPACE, teacher_id)
+    # Generația este momentul ultimei invalidări (time.time_ns)
+    changed = datetime.fromtimestamp(state['generation'] / 1e9, tz=dt_timezone.utc)
+    if state['last_modified'] is None or changed > state['last_modified']:
+        state['last_modified'] = changed
+    return state
+
+
+def feed_etag(state, calendar_name):
+    last_modified = state['last_modified']
+    stamp = int(last_modified.timestamp() * 1000000) if last_modified else 0
+    name = zlib.crc32(calendar_name.encode())
+    return quote_etag(f"{stamp}-{state['total']}-{state['generation']}-{name:08x}")
+
+
+def _escape(value):
+    """Escape pentru câmpurile TEXT din RFC 5545"""
+    return (
+        value.replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Împarte liniile mai lungi de 75 de octeți (RFC 5545, secțiunea 3.1)"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+
+    parts = []
+    current = ''
+    limit = 75
+    for char in line:
+        if len((current + char).encode('utf-8')) > limit:
+            parts.append(current)
+            current = char
+            limit = 74  # liniile de continuare încep cu un spațiu
+        else:
+            current += char
+    parts.append(current)
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _utc_stamp(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _lesson_event(lesson, local_tz, host):
+    start = datetime.combine(lesson.date, lesson.start_time, tzinfo=local_tz)
+    if lesson.end_time:
+        end = datetime.combine(lesson.date, lesson.end_time, tzinfo=local_tz)
+    else:
+        end = start + timedelta(minutes=lesson.group.duration_minutes or 90)
+
+    summary = lesson.group.name
+    if lesson.lesson_template:
+        summary = f'{summary} - {lesson.lesson_template.name}'
+    elif lesson.topic:
+        summary = f'{summary} - {lesson.topic}'
+
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:lesson-{lesson.id}@{host}',
+        f'DTSTAMP:{_utc_stamp(lesson.updated_at)}',
+        f'LAST-MODIFIED:{_utc_stamp(lesson.updated_at)}',
+        f'DTSTART:{_utc_stamp(start)}',
+        f'DTEND:{_utc_stamp(end)}',
+        f'SUMMARY:{_escape(summary)}',
+    ]
+    if lesson.group.location:
+        lines.append(f'LOCATION:{_escape(lesson.group.location.name)}')
+    if lesson.description:
+        lines.append(f'DESCRIPTION:{_escape(lesson.description)}')
+    lines.append('STATUS:CANCELLED' if lesson.status == 'cancelled' else 'STATUS:CONFIRMED')
+    lines.append('END:VEVENT')
+    return ''.join(_fold(line) for line in lines)
+
+
+def iter_calendar(lessons, calendar_name, host):
+    """
+    Generează feed-ul bucată cu bucată, fără a construi tot documentul în memorie.
+    `lessons` trebuie să aibă deja select_related pe group, group__location și lesson_template.
+    """
+    local_tz = ZoneInfo(settings.TIME_ZONE)
+
+    yield ''.join(_fold(line) for line in [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//MindAcademy//Calendar Lecții//RO',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{_escape(calendar_name)}',
+        f'X-WR-TIMEZONE:{settings.TIME_ZONE}',
+    ])
+
+    for lesson in lessons.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield _lesson_event(lesson, local_tz, host)
+
+    yield 'END:VCALENDAR\r\n'
+
+
+def feed_response(request, lessons, calendar_name, teacher_id):
+    """
+    Răspuns pentru feed cu suport de GET condițional (ETag / Last-Modified).
+    Aplicațiile care interoghează periodic primesc 304 fără regenerarea feed-ului.
+    """
+    state = feed_state(lessons, teacher_id)
+    etag = feed_etag(state, calendar_name)
+    last_modified = int(state['last_modified'].timestamp()) if state['last_modified'] else None
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    response = StreamingHttpResponse(
+        iter_calendar(lessons, calendar_name, request.get_host()),
+        content_type='text/calendar; charset=utf-8'
+    )
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Content-Disposition'] = 'inline; filename="lectii.ics"'
+    return response
@@ -0,0 +1,321 @@
+"""
+Import în masă de elevi din CSV / XLSX.
+
+Pipeline-ul: citește toate rândurile, le validează într-o singură trecere,
+alocă username-uri unice cu o singură interogare pe prefixe, calculează
+hash-urile parolelor în paralel (câteva fire - PBKDF2 e intenționat lent, dar
+hashlib eliberează GIL-ul) și scrie User / StudentProfile / GroupStudent cu
+bulk_create într-o singură tranzacție. Dacă un rând are erori, nu se importă
+nimic.
+"""
+import csv
+import io
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from django import forms
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from accounts.models import User, StudentProfile
+from .caching import bump_generation
+from .models import Group, GroupStudent
+from .summaries import DASHBOARD_NAMESPACE
+
+MAX_IMPORT_ROWS = 1000
+# Sub acest număr de rânduri hash-urile sunt calculate direct
+PARALLEL_HASH_THRESHOLD = 8
+# Încercări când un username alocat este luat între timp de alt cont
+IMPORT_ATTEMPTS = 3
+USERNAME_MAX_LENGTH = 150
+
+# Antetele acceptate în fișier (română sau engleză) -> câmpul din formular
+HEADER_ALIASES = {
+    'prenume': 'first_name',
+    'first_name': 'first_name',
+    'nume': 'last_name',
+    'last_name': 'last_name',
+    'username': 'username',
+    'data_nasterii': 'date_of_birth',
+    'date_of_birth': 'date_of_birth',
+    'email_parinte': 'parent_email',
+    'parent_email': 'parent_email',
+    'telefon_parinte': 'parent_phone',
+    'parent_phone': 'parent_phone',
+    'sex': 'sex',
+    'avatar': 'avatar',
+    'scoala': 'school_name',
+    'school_name': 'school_name',
+    'clasa': 'grade',
+    'grade': 'grade',
+}
+
+
+class StudentImportError(Exception):
+    """Fișierul nu poate fi citit (format greșit, antet lipsă etc.)"""
+
+
+class StudentImportRowForm(forms.Form):
+    """
+    Validarea unui rând din fișier - aceleași reguli ca StudentForm,
+    fără interogări (unicitatea username-urilor e verificată pe tot lotul)
+    """
+    first_name = forms.CharField(max_length=150)
+    last_name = forms.CharField(max_length=150)
+    username = forms.CharField(max_length=USERNAME_MAX_LENGTH, required=False)
+    date_of_birth = forms.DateField(required=False, input_formats=['%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y'])
+    parent_email = forms.EmailField(required=False)
+    parent_phone = forms.CharField(max_length=15, required=False)
+    sex = forms.ChoiceField(choices=[('', '')] + list(StudentProfile.SEX_CHOICES), required=False)
+    avatar = forms.ChoiceField(choices=StudentProfile.AVATAR_CHOICES, required=False)
+    school_name = forms.CharField(max_length=200, required=False)
+    grade = forms.CharField(max_length=50, required=False)
+
+    def clean_username(self):
+        username = self.cleaned_data.get('username', '').strip()
+        if username and not re.fullmatch(r'[\w.@+-]+', username):
+            raise forms.ValidationError('Username-ul poate conține doar litere, cifre și @/./+/-/_')
+        return username
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('avatar'):
+            cleaned_data['avatar'] = 'girl' if cleaned_data.get('sex') == 'F' else 'boy'
+        return cleaned_data
+
+
+# ==================== CITIRE FIȘIER ====================
+
+def _normalize_header(value):
+    return slugify(str(value or '')).replace('-', '_')
+
+
+def _read_csv(uploaded_file):
+    content = uploaded_file.read().decode('utf-8-sig')
+    try:
+        dialect = csv.Sniffer().sniff(content[:4096], delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(io.StringIO(content), dialect)
+    return list(reader)
+
+
+def _read_xlsx(uploaded_file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise StudentImportError('Importul din XLSX necesită pachetul openpyxl. Folosește un fișier CSV.')
+
+    workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+    sheet = workbook.active
+    rows = []
+    for row in sheet.iter_rows(values_only=True):
+        rows.append([
+            value.strftime('%Y-%m-%d') if hasattr(value, 'strftime') else ('' if value is None else str(value))
+            for value in row
+        ])
+    workbook.close()
+    return rows
+
+
+def read_rows(uploaded_file):
+    """Returnează lista de dicționare (câmp -> valoare) din fișierul încărcat"""
+    name = uploaded_file.name.lower()
+    if name.endswith('.csv'):
+        raw_rows = _read_csv(uploaded_file)
+    elif name.endswith('.xlsx'):
+        raw_rows = _read_xlsx(uploaded_file)
+    else:
+        raise StudentImportError('Format nesuportat. Încarcă un fișier .csv sau .xlsx.')
+
+    raw_rows = [row for row in raw_rows if any(str(cell).strip() for cell in row)]
+    if not raw_rows:
+        raise StudentImportError('Fișierul este gol.')
+
+    header = [HEADER_ALIASES.get(_normalize_header(cell)) for cell in raw_rows[0]]
+    if 'first_name' not in header or 'last_name' not in header:
+        raise StudentImportError('Antetul trebuie să conțină coloanele "Prenume" și "Nume".')
+    if len(raw_rows) - 1 > MAX_IMPORT_ROWS:
+        raise StudentImportError(f'Maxim {MAX_IMPORT_ROWS} de elevi per import.')
+
+    rows = []
+    for raw in raw_rows[1:]:
+        rows.append({
+            field: str(value).strip()
+            for field, value in zip(header, raw)
+            if field
+        })
+    return rows
+
+
+# ==================== USERNAME-URI ====================
+
+def _username_base(first_name, last_name):
+    parts = [slugify(part).replace('-', '') for part in (first_name, last_name)]
+    base = '.'.join(part for part in parts if part)
+    return (base or 'elev')[:USERNAME_MAX_LENGTH - 4]
+
+
+def allocate_usernames(cleaned_rows):
+    """
+    Completează username-urile lipsă și verifică unicitatea pe tot lotul.
+    Folosește o singură interogare pentru toate prefixele.
+    Returnează dict {index_rând: mesaj_eroare}.
+    """
+    errors = {}
+    explicit = {row['username'] for row in cleaned_rows if row['username']}
+    bases = {
+        index: _username_base(row['first_name'], row['last_name'])
+        for index, row in enumerate(cleaned_rows)
+        if not row['username']
+    }
+
+    lookup = Q(username__in=explicit)
+    for base in set(bases.values()):
+        lookup |= Q(username__startswith=base)
+    taken = set(User.objects.filter(lookup).values_list('username', flat=True)) if (explicit or bases) else set()
+
+    # Username-urile explicite: nu pot exista deja și nu se pot repeta în fișier
+    seen = set()
+    for index, row in enumerate(cleaned_rows):
+        username = row['username']
+        if not username:
+            continue
+        if username in taken:
+            errors[index] = f'Username-ul "{username}" este deja folosit.'
+        elif username in seen:
+            errors[index] = f'Username-ul "{username}" apare de mai multe ori în fișier.'
+        seen.add(username)
+    taken |= seen
+
+    # Username-urile generate: prenume.nume, apoi prenume.nume2, prenume.nume3 ...
+    for index, base in bases.items():
+        candidate = base
+        suffix = 1
+        while candidate in taken:
+            suffix += 1
+            candidate = f'{base}{suffix}'
+        taken.add(candidate)
+        cleaned_rows[index]['username'] = candidate
+
+    return errors
+
+
+# ==================== PAROLE ====================
+
+def hash_passwords(passwords, max_workers=None):
+    """Hash-uri PBKDF2 calculate în paralel pe câteva fire (STUDENT_IMPORT_HASH_WORKERS)"""
+    max_workers = max_workers or getattr(settings, 'STUDENT_IMPORT_HASH_WORKERS', 4)
+    if len(passwords) < PARALLEL_HASH_THRESHOLD or max_workers <= 1:
+        return [make_password(password) for password in passwords]
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='import-hash') as executor:
+        return list(executor.map(make_password, passwords))
+
+
+# ==================== IMPORT ====================
+
+def validate_rows(rows):
+    """
+    Validează toate rândurile. Returnează (rânduri_curate, erori) unde erori
+    e o listă de (număr_rând_în_fișier, mesaj). Rândul 1 este antetul.
+    """
+    row_numbers = []
+    valid = []
+    errors = []
+    for index, row in enumerate(rows):
+        form = StudentImportRowForm(row)
+        if form.is_valid():
+            row_numbers.append(index + 2)
+            valid.append(form.cleaned_data)
+        else:
+            messages = [f'{field}: {", ".join(field_errors)}' for field, field_errors in form.errors.items()]
+            errors.append((index + 2, '; '.join(messages)))
+
+    for index, message in allocate_usernames(valid).items():
+        errors.append((row_numbers[index], message))
+
+    return valid, sorted(errors)
+
+
+def import_students(rows, teacher, group=None):
+    """
+    Validează și creează elevii. Returnează (utilizatori_creați, erori).
+    Parola temporară este username-ul, ca la StudentForm.
+    Ridică StudentImportError dacă grupa nu are locuri pentru toți elevii.
+
+    Un username poate fi luat de alt cont între alocare și inserare
+    (IntegrityError): lotul este revalidat și reîncercat.
+    """
+    for _ in range(IMPORT_ATTEMPTS):
+        cleaned_rows, errors = validate_rows(rows)
+        if errors:
+            return [], errors
+        try:
+            users = _create_students(cleaned_rows, teacher, group)
+        except IntegrityError:
+            continue
+
+        # bulk_create nu trimite post_save, deci invalidăm manual dashboard-ul
+        bump_generation(DASHBOARD_NAMESPACE, teacher.id)
+        return users, []
+
+    raise StudentImportError('Username-urile alocate au fost ocupate între timp de alte conturi. Încearcă din nou.')
+
+
+def _create_students(cleaned_rows, teacher, group):
+    """Scrie lotul validat într-o singură tranzacție"""
+    passwords = hash_passwords([row['username'] for row in cleaned_rows])
+    location = None
+    if hasattr(teacher, 'teacher_profile'):
+        location = teacher.teacher_profile.locations.first()
+    today = timezone.now().date()
+
+    with transaction.atomic():
+        # bulk_create ocolește GroupStudent.save, deci ocupăm locurile dintr-o dată
+        if group and not Group.reserve_seats(group.id, len(cleaned_rows)):
+            raise StudentImportError(
+                f'Grupa {group.name} nu are {len(cleaned_rows)} locuri libere '
+                f'({group.max_students - group.active_student_count} disponibile).'
+            )
+
+        users = User.objects.bulk_create([
+            User(
+                username=row['username'],
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+                date_of_birth=row['date_of_birth'],
+                parent_email=row['parent_email'],
+                parent_phone=row['parent_phone'],
+                role='student',
+                password=password,
+                must_change_password=True,
+            )
+            for row, password in zip(cleaned_rows, passwords)
+        ])
+
+        StudentProfile.objects.bulk_create([
+            StudentProfile(
+                user=user,
+                sex=row['sex'],
+                avatar=row['avatar'],
+                account_created_date=today,
+                school_name=row['school_name'],
+                grade=row['grade'],
+                teacher=teacher,
+                location=location,
+                group=group,
+            )
+            for user, row in zip(users, cleaned_rows)
+        ])
+
+        if group:
+            GroupStudent.objects.bulk_create([
+                GroupStudent(group=group, student=user, is_active=True)
+                for user in users
+            ])
+    return users
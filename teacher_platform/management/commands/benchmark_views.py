@@ -0,0 +1,89 @@
+"""
+Django management command pentru benchmark-ul HTTP al tuturor view-urilor.
+Usage: python manage.py seed_scale && python manage.py benchmark_views --output bench.json
+       python manage.py benchmark_views --requests 50 --threads 4 --only teacher_platform:
+       python manage.py benchmark_views --output bench-nou.json --compare bench.json
+"""
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from accounts.models import User
+from teacher_platform.benchmarks import DEFAULT_REQUESTS, BenchmarkFixture, compare_reports, run_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Măsoară p50/p95, interogările SQL și dimensiunea răspunsului pentru fiecare view (JSON)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help='Cereri măsurate per view')
+        parser.add_argument('--threads', type=int, default=1, help='Cereri concurente (fire de execuție)')
+        parser.add_argument('--only', action='append', help='Doar view-urile al căror nume conține textul (repetabil)')
+        parser.add_argument('--teacher', help='Username-ul profesorului (implicit cel cu cele mai multe lecții)')
+        parser.add_argument('--student', help='Username-ul elevului (implicit un elev din grupa profesorului)')
+        parser.add_argument('--output', help='Fișierul JSON al raportului (implicit stdout)')
+        parser.add_argument('--compare', help='Raport JSON anterior, pentru variația p50')
+
+    def _user(self, username, role):
+        if not username:
+            return None
+        user = User.objects.filter(username=username, role=role).first()
+        if user is None:
+            raise CommandError(f'Utilizatorul {username} ({role}) nu există.')
+        return user
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['threads'] < 1:
+            raise CommandError('--requests și --threads trebuie să fie cel puțin 1.')
+        try:
+            fixture = BenchmarkFixture(
+                teacher=self._user(options['teacher'], 'teacher'),
+                student=self._user(options['student'], 'student'),
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        progress = self.stdout if options['output'] else self.stderr
+
+        def on_result(result):
+            if 'skipped' in result:
+                progress.write(f'  {result["name"]}: sărit ({result["skipped"]})')
+            else:
+                progress.write(
+                    f'  {result["name"]}: {result["status"]} p50={result["p50_ms"]}ms p95={result["p95_ms"]}ms '
+                    f'q={result["queries"]} {result["bytes"]}B'
+                )
+
+        hosts = list(settings.ALLOWED_HOSTS) + ['testserver']
+        # Fără instrumentele de diagnostic (Server-Timing, detectorul N+1, interogări lente): ar intra în măsurătoare
+        with override_settings(
+            ROOT_URLCONF='teacher_platform.benchmarks',
+            ALLOWED_HOSTS=hosts,
+            SERVER_TIMING_SAMPLE_RATE=0,
+            NPLUSONE_ENABLED=False,
+            SLOW_QUERY_MS=0,
+        ):
+            report = run_benchmark(
+                fixture,
+                requests=options['requests'],
+                threads=options['threads'],
+                only=options['only'],
+                on_result=on_result,
+            )
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                handle.write(output)
+            self.stdout.write(self.style.SUCCESS(f'Raport scris: {options["output"]}'))
+        else:
+            self.stdout.write(output)
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as handle:
+                baseline = json.load(handle)
+            for name, old, new, change in compare_reports(baseline, report):
+                style = self.style.ERROR if change > 10 else self.style.SUCCESS if change < -10 else str
+                progress.write(style(f'  {name}: {old}ms -> {new}ms ({change:+}%)'))
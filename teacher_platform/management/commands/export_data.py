@@ -0,0 +1,42 @@
+"""
+Django management command pentru exporturi complete (CSV sau JSONL gzip).
+Usage: python manage.py export_data attendance submissions --format jsonl --output-dir exports/
+       python manage.py export_data all
+"""
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from teacher_platform.exports import EXPORTS, FORMATS, DEFAULT_BATCH_SIZE, export_filename, write_export
+
+
+class Command(BaseCommand):
+    help = 'Exportă grupe, înscrieri, lecții, prezențe, teme predate și sesiuni soroban'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'exports',
+            nargs='+',
+            help=f'Ce se exportă: {", ".join(EXPORTS)} sau all'
+        )
+        parser.add_argument('--format', choices=FORMATS, default='csv', help='csv sau jsonl (comprimat gzip)')
+        parser.add_argument('--output-dir', default='.', help='Directorul în care se scriu fișierele')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rânduri per interogare')
+
+    def handle(self, *args, **options):
+        names = list(EXPORTS) if 'all' in options['exports'] else options['exports']
+        unknown = [name for name in names if name not in EXPORTS]
+        if unknown:
+            raise CommandError(f'Export necunoscut: {", ".join(unknown)}. Disponibile: {", ".join(EXPORTS)}')
+
+        os.makedirs(options['output_dir'], exist_ok=True)
+        for name in names:
+            path = os.path.join(options['output_dir'], export_filename(name, options['format']))
+            started = time.perf_counter()
+            count = write_export(name, options['format'], path, batch_size=options['batch_size'])
+            elapsed = time.perf_counter() - started
+            rate = int(count / elapsed) if elapsed else count
+            self.stdout.write(
+                self.style.SUCCESS(f'{name}: {count} rânduri în {elapsed:.2f}s ({rate} rânduri/s) -> {path}')
+            )
@@ -0,0 +1,51 @@
+"""
+Django management command pentru regenerarea snapshot-urilor de plan (teacher_platform/plan_snapshots.json).
+Usage: python manage.py refresh_plan_snapshots
+       python manage.py refresh_plan_snapshots --check
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from mathcourses import plans
+from teacher_platform import hot_queries
+
+
+class Command(BaseCommand):
+    help = 'Rulează interogările critice pe setul de date generat și salvează SQL-ul normalizat și planurile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Doar compară cu snapshot-ul existent (cod 1 la regresii)')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Snapshot-urile sunt generate pe SQLite (DATABASE_URL trebuie să lipsească).')
+
+        # Baza de date de test (goală, creată și ștearsă aici): datele reale nu sunt atinse
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(CACHES=plans.TEST_CACHES, SLOW_QUERY_MS=0):
+                world = hot_queries.build_world()
+                captured = plans.capture_all(hot_queries.hot_queries(world))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        previous = plans.load_snapshot(hot_queries.SNAPSHOT_PATH)
+        problems = []
+        for name, queries in captured.items():
+            problems += plans.compare(name, previous.get(name), queries)
+            scans = set().union(*(plans.full_scans(query['plan']) for query in queries))
+            note = f' (citire integrală: {", ".join(sorted(scans))})' if scans else ''
+            self.stdout.write(f'  {name}: {len(queries)} interogări{note}')
+        for line in problems:
+            self.stdout.write(self.style.WARNING(line))
+
+        if options['check']:
+            if problems:
+                raise CommandError('Planurile diferă de snapshot.')
+            self.stdout.write(self.style.SUCCESS('Planurile corespund snapshot-ului.'))
+            return
+
+        plans.save_snapshot(hot_queries.SNAPSHOT_PATH, captured)
+        self.stdout.write(self.style.SUCCESS(f'Snapshot salvat: {hot_queries.SNAPSHOT_PATH}'))
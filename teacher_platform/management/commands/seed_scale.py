@@ -0,0 +1,71 @@
+"""
+Django management command pentru generarea unei academii sintetice (teste de încărcare).
+Usage: python manage.py seed_scale
+       python manage.py seed_scale --teachers 20 --students 500 --years 1 --seed 7 --prefix mic
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from teacher_platform.seeding import DEFAULT_PASSWORD, ScaleConfig, ScaleSeeder, SeedError
+
+defaults = ScaleConfig()
+
+
+class Command(BaseCommand):
+    help = 'Generează locații, profesori, elevi, grupe, lecții, prezențe, teme și sesiuni soroban sintetice'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--locations', type=int, default=defaults.locations)
+        parser.add_argument('--teachers', type=int, default=defaults.teachers)
+        parser.add_argument('--students', type=int, default=defaults.students)
+        parser.add_argument('--groups-per-teacher', type=int, default=defaults.groups_per_teacher)
+        parser.add_argument('--max-students-per-group', type=int, default=defaults.max_students_per_group)
+        parser.add_argument('--years', type=float, default=defaults.years, help='Câți ani de lecții săptămânale')
+        parser.add_argument('--assignment-every', type=int, default=defaults.assignment_every, help='O temă la fiecare N lecții')
+        parser.add_argument('--soroban-sessions', type=int, default=defaults.soroban_sessions, help='Sesiuni soroban per elev')
+        parser.add_argument('--seed', type=int, default=defaults.seed, help='Sămânța generatorului (date reproductibile)')
+        parser.add_argument('--prefix', default=defaults.prefix, help='Prefixul username-urilor, slug-urilor și locațiilor')
+        parser.add_argument('--end-date', help='Ultima zi a istoricului (implicit azi), YYYY-MM-DD')
+        parser.add_argument('--batch-size', type=int, default=defaults.batch_size, help='Rânduri per INSERT')
+
+    def handle(self, *args, **options):
+        end_date = None
+        if options['end_date']:
+            end_date = parse_date(options['end_date'])
+            if end_date is None:
+                raise CommandError(f'--end-date invalid: {options["end_date"]}')
+
+        config = ScaleConfig(
+            locations=options['locations'],
+            teachers=options['teachers'],
+            students=options['students'],
+            groups_per_teacher=options['groups_per_teacher'],
+            max_students_per_group=options['max_students_per_group'],
+            years=options['years'],
+            assignment_every=options['assignment_every'],
+            soroban_sessions=options['soroban_sessions'],
+            seed=options['seed'],
+            prefix=options['prefix'],
+            end_date=end_date,
+            batch_size=options['batch_size'],
+        )
+
+        def report(step, seconds):
+            self.stdout.write(f'  {step}: {seconds:.2f}s')
+
+        started = time.perf_counter()
+        try:
+            counts = ScaleSeeder(config).run(on_step=report)
+        except SeedError as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        for label, count in counts.items():
+            self.stdout.write(f'  {label}: {count}')
+        total = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} rânduri în {elapsed:.2f}s ({int(total / elapsed) if elapsed else total} rânduri/s). '
+            f'Parola conturilor: {DEFAULT_PASSWORD}'
+        ))
@@ -0,0 +1,64 @@
+"""
+Django management command pentru raportul interogărilor lente (SLOW_QUERY_LOG_FILE).
+Usage: python manage.py slow_query_report
+       python manage.py slow_query_report --limit 10 --sort count --explain
+       python manage.py slow_query_report --log /var/log/mindacademy/slow_queries.log --json
+"""
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from mathcourses.slowqueries import aggregate, read_log
+
+SORT_KEYS = ('total_ms', 'count', 'max_ms', 'mean_ms')
+
+
+class Command(BaseCommand):
+    help = 'Agregă log-ul interogărilor lente pe amprente de interogare, ordonate după timpul total'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', help='Fișierul de log (implicit SLOW_QUERY_LOG_FILE)')
+        parser.add_argument('--limit', type=int, default=20, help='Numărul de amprente afișate')
+        parser.add_argument('--sort', choices=SORT_KEYS, default='total_ms', help='Criteriul de ordonare')
+        parser.add_argument('--explain', action='store_true', help='Afișează planul celei mai lente execuții')
+        parser.add_argument('--json', action='store_true', help='Raport JSON în loc de text')
+
+    def handle(self, *args, **options):
+        path = options['log'] or getattr(settings, 'SLOW_QUERY_LOG_FILE', None)
+        if not path:
+            raise CommandError('Nu există un fișier de log (--log sau SLOW_QUERY_LOG_FILE).')
+        try:
+            report = aggregate(read_log(path))
+        except FileNotFoundError:
+            raise CommandError(f'Fișierul {path} nu există.')
+        except KeyError as e:
+            raise CommandError(f'Linie de log fără câmpul {e} în {path}.')
+
+        report.sort(key=lambda group: group[options['sort']], reverse=True)
+        report = report[:options['limit']]
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
+            return
+        if not report:
+            self.stdout.write('Nicio interogare lentă în log.')
+            return
+
+        for rank, group in enumerate(report, start=1):
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'#{rank} total {group["total_ms"]} ms, {group["count"]}x, '
+                f'medie {group["mean_ms"]} ms, max {group["max_ms"]} ms'
+            ))
+            self.stdout.write(f'  {group["fingerprint"]}')
+            views = ', '.join(f'{view} ({count})' for view, count in sorted(group['views'].items(), key=lambda item: -item[1]))
+            self.stdout.write(f'  view-uri: {views}')
+            for origin, count in sorted(group['origins'].items(), key=lambda item: -item[1])[:3]:
+                self.stdout.write(f'  cod: {origin} ({count})')
+            slowest = group['slowest']
+            params = slowest.get('params')
+            self.stdout.write(f'  cea mai lentă: {slowest["ms"]} ms' + (f', parametri {params}' if params else ''))
+            if options['explain'] and slowest.get('explain'):
+                self.stdout.write('  plan:')
+                for line in slowest['explain']:
+                    self.stdout.write(f'    {line}')
@@ -0,0 +1,72 @@
+"""
+Django management command pentru backup-ul și restaurarea datelor unui profesor.
+Usage: python manage.py teacher_backup backup ana.popescu --output ana.popescu.zip
+       python manage.py teacher_backup restore ana.popescu.zip [--replace]
+"""
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.models import User
+from teacher_platform.backups import BackupError, restore_backup, write_backup
+from teacher_platform.exports import DEFAULT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Salvează sau restaurează grupele, elevii, lecțiile, prezențele, temele și notițele unui profesor'
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest='action', required=True)
+
+        backup = subparsers.add_parser('backup', help='Scrie arhiva unui profesor')
+        backup.add_argument('username', help='Username-ul profesorului')
+        backup.add_argument('--output', help='Fișierul arhivei (implicit <username>-<dată>.zip)')
+        backup.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rânduri per interogare')
+
+        restore = subparsers.add_parser('restore', help='Restaurează o arhivă')
+        restore.add_argument('archive', help='Fișierul arhivei')
+        restore.add_argument(
+            '--replace',
+            action='store_true',
+            help='Șterge mai întâi grupele existente ale profesorului (cu lecțiile și prezențele lor)'
+        )
+        restore.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rânduri per INSERT')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['action'] == 'backup':
+            self.backup(options)
+        else:
+            self.restore(options)
+        self.stdout.write(f'Durată: {time.perf_counter() - started:.2f}s')
+
+    def backup(self, options):
+        teacher = User.objects.filter(username=options['username'], role='teacher').first()
+        if teacher is None:
+            raise CommandError(f'Profesorul {options["username"]} nu există.')
+
+        path = options['output'] or f'{teacher.username}-{timezone.now():%Y%m%d-%H%M%S}.zip'
+        manifest = write_backup(teacher, path, batch_size=options['batch_size'])
+        for name, table in manifest['tables'].items():
+            self.stdout.write(f'  {name}: {table["rows"]}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Arhivă scrisă: {path} ({os.path.getsize(path) // 1024} KB, {len(manifest["files"])} fișiere)'
+        ))
+
+    def restore(self, options):
+        if not os.path.exists(options['archive']):
+            raise CommandError(f'Arhiva {options["archive"]} nu există.')
+        try:
+            teacher, counts, skipped = restore_backup(
+                options['archive'], replace=options['replace'], batch_size=options['batch_size']
+            )
+        except BackupError as e:
+            raise CommandError(str(e))
+
+        for name, count in counts.items():
+            self.stdout.write(f'  {name}: {count}')
+        for name, count in skipped.items():
+            self.stdout.write(self.style.WARNING(f'  {name}: {count} rânduri sărite (referințe lipsă)'))
+        self.stdout.write(self.style.SUCCESS(f'Restaurat: {teacher.username}'))
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.10 on 2026-10-19 16:19
+
+from django.db import migrations, models
+
+
+def seed_counters(apps, schema_editor):
+    """Pornește fiecare contor de la cel mai mare număr din codurile existente"""
+    Group = apps.get_model('teacher_platform', 'Group')
+    GroupCodeCounter = apps.get_model('teacher_platform', 'GroupCodeCounter')
+
+    last_numbers = {}
+    for code in Group.objects.exclude(code='').values_list('code', flat=True).iterator():
+        prefix, _, number = code.rpartition('-')
+        if prefix and number.isdigit():
+            last_numbers[prefix] = max(last_numbers.get(prefix, 0), int(number))
+
+    GroupCodeCounter.objects.bulk_create([
+        GroupCodeCounter(prefix=prefix, last_number=last_number)
+        for prefix, last_number in last_numbers.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teacher_platform', '0002_group_code_group_created_date_group_location_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupCodeCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(help_text='CURS-MODUL, ca în codul grupei', max_length=100, unique=True, verbose_name='Prefix Cod')),
+                ('last_number', models.PositiveIntegerField(default=0, verbose_name='Ultimul Număr')),
+            ],
+            options={
+                'verbose_name': 'Contor Cod Grupă',
+                'verbose_name_plural': 'Contoare Coduri Grupe',
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.10 on 2026-10-19 16:21
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counts(apps, schema_editor):
+    """Completează contorul din înscrierile active existente (un singur UPDATE)"""
+    Group = apps.get_model('teacher_platform', 'Group')
+    GroupStudent = apps.get_model('teacher_platform', 'GroupStudent')
+
+    active = GroupStudent.objects.filter(
+        group=OuterRef('pk'),
+        is_active=True
+    ).order_by().values('group').annotate(total=Count('id')).values('total')
+    Group.objects.update(
+        active_student_count=Coalesce(Subquery(active, output_field=IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teacher_platform', '0003_groupcodecounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='active_student_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Elevi Activi'),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.10 on 2026-10-19 16:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teacher_platform', '0004_group_active_student_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupWaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('requested_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Data Cererii')),
+                ('notes', models.CharField(blank=True, max_length=200, verbose_name='Observații')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='teacher_platform.group', verbose_name='Grupă')),
+                ('student', models.ForeignKey(limit_choices_to={'role': 'student'}, on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to=settings.AUTH_USER_MODEL, verbose_name='Elev')),
+            ],
+            options={
+                'verbose_name': 'Elev în Așteptare',
+                'verbose_name_plural': 'Liste de Așteptare',
+                'ordering': ['requested_at', 'id'],
+                'unique_together': {('group', 'student')},
+            },
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.10 on 2026-10-19 16:32
+
+import datetime
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+
+def backfill_updated_at(apps, schema_editor):
+    """Rândurile existente primesc ultima dată cunoscută în loc de momentul migrării"""
+    Attendance = apps.get_model('teacher_platform', 'Attendance')
+    AssignmentSubmission = apps.get_model('teacher_platform', 'AssignmentSubmission')
+    GroupStudent = apps.get_model('teacher_platform', 'GroupStudent')
+    Attendance.objects.update(updated_at=F('created_at'))
+    AssignmentSubmission.objects.update(updated_at=Coalesce('graded_at', 'submitted_at'))
+    # enrolled_date este o dată: înscrierea primește miezul nopții (ora locală) din acea zi
+    dates = list(GroupStudent.objects.order_by().values_list('enrolled_date', flat=True).distinct())
+    for day in dates:
+        midnight = django.utils.timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+        GroupStudent.objects.filter(enrolled_date=day).update(updated_at=midnight)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teacher_platform', '0005_groupwaitlistentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feed', models.CharField(max_length=100, unique=True, verbose_name='Flux')),
+                ('last_timestamp', models.DateTimeField(blank=True, null=True, verbose_name='Ultimul Timestamp')),
+                ('last_id', models.BigIntegerField(default=0, verbose_name='Ultimul ID')),
+                ('last_run_at', models.DateTimeField(blank=True, null=True, verbose_name='Ultima Rulare')),
+            ],
+            options={
+                'verbose_name': 'Watermark Export',
+                'verbose_name_plural': 'Watermark-uri Export',
+            },
+        ),
+        migrations.AddField(
+            model_name='assignmentsubmission',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='groupstudent',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='group',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='lesson',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='lessonnote',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.CreateModel(
+            name='DeletionLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=100, verbose_name='Model')),
+                ('object_id', models.BigIntegerField(verbose_name='ID Obiect')),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Data Ștergerii')),
+            ],
+            options={
+                'verbose_name': 'Ștergere Înregistrată',
+                'verbose_name_plural': 'Ștergeri Înregistrate',
+                'indexes': [models.Index(fields=['deleted_at', 'id'], name='tp_deletionlog_deleted_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
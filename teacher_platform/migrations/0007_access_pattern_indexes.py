@@ -0,0 +1,40 @@
+# Generated by Django 5.2.10 on 2026-10-19 17:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_index_updated_at'),
+        ('teacher_platform', '0006_change_tracking'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['group', 'due_date'], name='tp_assignment_group_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assignmentsubmission',
+            index=models.Index(condition=models.Q(('is_graded', False)), fields=['assignment'], name='tp_submission_ungraded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['student', 'is_present'], name='tp_attendance_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groupstudent',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['group', 'student'], name='tp_groupstudent_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(fields=['group', 'date', 'start_time'], name='tp_lesson_group_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(condition=models.Q(('status', 'scheduled')), fields=['date', 'start_time'], name='tp_lesson_scheduled_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from accounts.models import User
 from courses.models import Course, Location, Module, LessonTemplate
@@ -6,6 +8,10 @@ from django.utils import timezone
 from django.utils.text import slugify
 
 
+class GroupFullError(Exception):
+    """Grupa a atins numărul maxim de elevi"""
+
+
 class Group(models.Model):
     """
     Grupă de elevi creată de profesor
@@ -90,6 +96,12 @@ class Group(models.Model):
 
     # Detalii
     max_students = models.IntegerField(default=8, verbose_name="Număr Maxim Elevi")
+    # Numărul de înscrieri active, actualizat în tranzacția înscrierii (vezi GroupStudent.save)
+    active_student_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Elevi Activi"
+    )
     description = models.TextField(blank=True, verbose_name="Descriere")
 
     # Status
@@ -97,37 +109,83 @@ class Group(models.Model):
 
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Grupă"
         verbose_name_plural = "Grupe"
         ordering = ['weekday', 'start_time']
 
+    def code_prefix(self):
+        """Prefixul codului pentru cursul și modulul grupei: CURS-MODUL"""
+        course_slug = slugify(self.course.slug if self.course else 'CURS').upper()
+        module_id = str(self.module_id) if self.module_id else '0'
+        return f"{course_slug}-{module_id}"
+
     def generate_code(self):
         """
         Generează cod unic pentru grupă în formatul: CURS-MODUL-NUMĂR
         Ex: ARITMETICA-12-001
+
+        Numărul vine din contorul (curs, modul) - trebuie apelat în aceeași
+        tranzacție cu inserarea grupei (vezi save)
         """
         if self.code:  # Dacă deja are cod, nu-l regenera
             return self.code
 
-        course_slug = slugify(self.course.slug if self.course else 'CURS').upper()
-        module_id = str(self.module.id) if self.module else '0'
-
-        # Găsește numărul următor pentru acest curs și modul
-        existing_groups = Group.objects.filter(
-            code__startswith=f"{course_slug}-{module_id}-"
-        ).count()
+        prefix = self.code_prefix()
+        next_number = GroupCodeCounter.allocate(prefix)[0]
+        return f"{prefix}-{next_number:03d}"
 
-        next_number = existing_groups + 1
-        return f"{course_slug}-{module_id}-{next_number:03d}"
+    @classmethod
+    def assign_codes(cls, groups):
+        """
+        Alocă coduri pentru mai multe grupe deodată (importuri, bulk_create):
+        o singură incrementare a contorului pentru fiecare (curs, modul).
+        Trebuie apelat în tranzacția în care grupele sunt inserate.
+        """
+        by_prefix = {}
+        for group in groups:
+            if not group.code:
+                by_prefix.setdefault(group.code_prefix(), []).append(group)
+
+        for prefix, prefix_groups in by_prefix.items():
+            numbers = GroupCodeCounter.allocate(prefix, len(prefix_groups))
+            for group, number in zip(prefix_groups, numbers):
+                group.code = f"{prefix}-{number:03d}"
+        return groups
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Capacitatea din baza de date, pentru a detecta mărirea ei la save
+        if 'max_students' in field_names:
+            instance._db_max_students = instance.max_students
+        return instance
 
     def save(self, *args, **kwargs):
-        """Override save pentru a genera cod automat"""
-        if not self.code:
-            self.code = self.generate_code()
-        super().save(*args, **kwargs)
+        """
+        Override save pentru a genera cod automat (în tranzacția inserării).
+        Mărirea lui max_students înscrie elevi din lista de așteptare pe
+        locurile noi (promoted_enrollments).
+        """
+        seats_added = not self._state.adding and self.max_students > getattr(self, '_db_max_students', self.max_students)
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # active_student_count se modifică doar prin UPDATE-uri atomice,
+            # o copie veche din memorie nu trebuie să-l suprascrie
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'active_student_count'
+            ]
+        with transaction.atomic(using=kwargs.get('using')):
+            if not self.code:
+                self.code = self.generate_code()
+            super().save(*args, **kwargs)
+            self._db_max_students = self.max_students
+
+            self.promoted_enrollments = []
+            if seats_added:
+                self.promoted_enrollments = GroupWaitlistEntry.fill_seats(self.id)
 
     def __str__(self):
         if self.code:
@@ -136,11 +194,30 @@ class Group(models.Model):
 
     def get_current_students_count(self):
         """Returnează numărul curent de elevi din grupă"""
-        return self.students.filter(is_active=True).count()
+        return self.active_student_count
 
     def has_available_spots(self):
         """Verifică dacă mai sunt locuri disponibile"""
-        return self.get_current_students_count() < self.max_students
+        return self.active_student_count < self.max_students
+
+    @classmethod
+    def reserve_seats(cls, group_id, count=1):
+        """
+        Ocupă `count` locuri printr-un UPDATE condiționat: reușește doar dacă
+        după incrementare grupa nu depășește max_students. Returnează True/False.
+        """
+        return cls.objects.filter(
+            id=group_id,
+            active_student_count__lte=F('max_students') - count
+        ).update(active_student_count=F('active_student_count') + count, updated_at=timezone.now()) == 1
+
+    @classmethod
+    def release_seats(cls, group_id, count=1):
+        """Eliberează `count` locuri (fără a coborî sub zero)"""
+        cls.objects.filter(
+            id=group_id,
+            active_student_count__gte=count
+        ).update(active_student_count=F('active_student_count') - count, updated_at=timezone.now())
 
     def get_next_lesson_date(self):
         """Calculează data următoarei lecții"""
@@ -161,6 +238,39 @@ class Group(models.Model):
         return next_date
 
 
+class GroupCodeCounter(models.Model):
+    """
+    Ultimul număr folosit în codurile grupelor pentru un (curs, modul).
+    Incrementat sub blocare de rând, deci două grupe create simultan nu
+    primesc același cod, iar numerele nu se refolosesc după ștergeri.
+    """
+    prefix = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name="Prefix Cod",
+        help_text="CURS-MODUL, ca în codul grupei"
+    )
+    last_number = models.PositiveIntegerField(default=0, verbose_name="Ultimul Număr")
+
+    class Meta:
+        verbose_name = "Contor Cod Grupă"
+        verbose_name_plural = "Contoare Coduri Grupe"
+
+    def __str__(self):
+        return f"{self.prefix}: {self.last_number}"
+
+    @classmethod
+    def allocate(cls, prefix, count=1):
+        """Rezervă `count` numere consecutive pentru prefix și le returnează"""
+        with transaction.atomic():
+            cls.objects.get_or_create(prefix=prefix)
+            counter = cls.objects.select_for_update().get(prefix=prefix)
+            first = counter.last_number + 1
+            counter.last_number += count
+            counter.save(update_fields=['last_number'])
+        return list(range(first, first + count))
+
+
 class GroupStudent(models.Model):
     """
     Relație dintre elev și grupă (membru)
@@ -181,14 +291,71 @@ class GroupStudent(models.Model):
     lessons_attended = models.IntegerField(default=0, verbose_name="Lecții Prezenți")
     lessons_missed = models.IntegerField(default=0, verbose_name="Lecții Absente")
 
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
     class Meta:
         verbose_name = "Elev în Grupă"
         verbose_name_plural = "Elevi în Grupe"
         unique_together = ['group', 'student']
+        indexes = [
+            # Elevii activi ai grupei (numărători, catalog, roster)
+            models.Index(fields=['group', 'student'], condition=Q(is_active=True), name='tp_groupstudent_active_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.get_full_name()} - {self.group.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Starea din baza de date, pentru a detecta activarea / dezactivarea la save
+        if 'is_active' in field_names:
+            instance._was_active = instance.is_active
+        if 'group_id' in field_names:
+            instance._db_group_id = instance.group_id
+        return instance
+
+    def takes_new_seat(self):
+        """Salvarea ocupă un loc în grupă: activare sau mutarea unei înscrieri active"""
+        moved = getattr(self, '_db_group_id', self.group_id) != self.group_id
+        return self.is_active and (not getattr(self, '_was_active', False) or moved)
+
+    def clean(self):
+        if self.group_id and self.takes_new_seat():
+            if not self.group.has_available_spots():
+                raise ValidationError('Grupa a atins numărul maxim de elevi.')
+
+    def save(self, *args, **kwargs):
+        """
+        Ține Group.active_student_count la zi în aceeași tranzacție.
+        La activare locul este ocupat cu un UPDATE condiționat, deci două
+        înscrieri simultane nu pot depăși max_students (GroupFullError).
+        Mutarea unei înscrieri active în altă grupă eliberează locul vechi
+        și ocupă unul în grupa nouă.
+        """
+        if self._state.adding:
+            was_active, old_group_id = False, None
+        else:
+            was_active = getattr(self, '_was_active', self.is_active)
+            old_group_id = getattr(self, '_db_group_id', self.group_id)
+        moved = old_group_id is not None and old_group_id != self.group_id
+        takes_seat = self.is_active and (not was_active or moved)
+        frees_seat = was_active and (not self.is_active or moved)
+
+        with transaction.atomic(using=kwargs.get('using')):
+            if takes_seat and not Group.reserve_seats(self.group_id):
+                raise GroupFullError(f'Grupa {self.group_id} a atins numărul maxim de elevi.')
+            if frees_seat:
+                Group.release_seats(old_group_id)
+            super().save(*args, **kwargs)
+            self._was_active = self.is_active
+            self._db_group_id = self.group_id
+
+            # Locul eliberat trece la primul elev din lista de așteptare
+            self.promoted_enrollment = None
+            if frees_seat:
+                self.promoted_enrollment = GroupWaitlistEntry.promote_next(old_group_id)
+
     def get_attendance_rate(self):
         """Calculează procentul de prezență"""
         total = self.lessons_attended + self.lessons_missed
@@ -197,6 +364,112 @@ class GroupStudent(models.Model):
         return round((self.lessons_attended / total) * 100, 2)
 
 
+class DeletionLog(models.Model):
+    """
+    Tombstone pentru rândurile șterse din modelele exportate incremental
+    (export_changes), ca extragerea să poată propaga și ștergerile
+    """
+    model_label = models.CharField(max_length=100, verbose_name="Model")
+    object_id = models.BigIntegerField(verbose_name="ID Obiect")
+    deleted_at = models.DateTimeField(default=timezone.now, verbose_name="Data Ștergerii")
+
+    class Meta:
+        verbose_name = "Ștergere Înregistrată"
+        verbose_name_plural = "Ștergeri Înregistrate"
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='tp_deletionlog_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label} #{self.object_id} ({self.deleted_at:%Y-%m-%d %H:%M})"
+
+
+class ExportWatermark(models.Model):
+    """
+    Ultima poziție (updated_at, id) exportată de export_changes pentru un flux
+    """
+    feed = models.CharField(max_length=100, unique=True, verbose_name="Flux")
+    last_timestamp = models.DateTimeField(null=True, blank=True, verbose_name="Ultimul Timestamp")
+    last_id = models.BigIntegerField(default=0, verbose_name="Ultimul ID")
+    last_run_at = models.DateTimeField(null=True, blank=True, verbose_name="Ultima Rulare")
+
+    class Meta:
+        verbose_name = "Watermark Export"
+        verbose_name_plural = "Watermark-uri Export"
+
+    def __str__(self):
+        return f"{self.feed}: {self.last_timestamp} / {self.last_id}"
+
+
+class GroupWaitlistEntry(models.Model):
+    """
+    Elev în lista de așteptare a unei grupe pline, în ordinea cererii
+    """
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name='waitlist', verbose_name="Grupă")
+    student = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='waitlist_entries',
+        limit_choices_to={'role': 'student'},
+        verbose_name="Elev"
+    )
+    requested_at = models.DateTimeField(default=timezone.now, verbose_name="Data Cererii")
+    notes = models.CharField(max_length=200, blank=True, verbose_name="Observații")
+
+    class Meta:
+        verbose_name = "Elev în Așteptare"
+        verbose_name_plural = "Liste de Așteptare"
+        ordering = ['requested_at', 'id']
+        unique_together = ['group', 'student']
+
+    def __str__(self):
+        return f"{self.student.get_full_name()} - {self.group.name} (așteptare)"
+
+    @classmethod
+    def promote_next(cls, group_id):
+        """
+        Scoate primul elev din coadă și îl înscrie în grupă.
+        Rândul din coadă este blocat cu SKIP LOCKED, deci două retrageri
+        simultane promovează elevi diferiți, niciodată același elev de două ori.
+        Returnează înscrierea creată sau None.
+        """
+        with transaction.atomic():
+            while True:
+                entry = cls.objects.select_for_update(skip_locked=True).filter(
+                    group_id=group_id
+                ).order_by('requested_at', 'id').first()
+                if entry is None:
+                    return None
+
+                enrollment = GroupStudent.objects.filter(group_id=group_id, student_id=entry.student_id).first()
+                if enrollment and enrollment.is_active:
+                    # Deja înscris între timp - doar îl scoatem din coadă
+                    entry.delete()
+                    continue
+
+                if enrollment is None:
+                    enrollment = GroupStudent(group_id=group_id, student_id=entry.student_id)
+                enrollment.is_active = True
+                try:
+                    with transaction.atomic():
+                        enrollment.save()
+                except GroupFullError:
+                    return None
+
+                entry.delete()
+                return enrollment
+
+    @classmethod
+    def fill_seats(cls, group_id):
+        """Promovează elevi din coadă cât timp grupa are locuri libere; returnează înscrierile"""
+        promoted = []
+        while True:
+            enrollment = cls.promote_next(group_id)
+            if enrollment is None:
+                return promoted
+            promoted.append(enrollment)
+
+
 class Lesson(models.Model):
     """
     Lecție programată sau desfășurată
@@ -239,12 +512,18 @@ class Lesson(models.Model):
     teacher_notes = models.TextField(blank=True, verbose_name="Notițe Profesor")
 
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Lecție"
         verbose_name_plural = "Lecții"
         ordering = ['-date', '-start_time']
+        indexes = [
+            # Lecțiile unei grupe pe interval, în ordinea din orar (fără sortare temporară)
+            models.Index(fields=['group', 'date', 'start_time'], name='tp_lesson_group_date_idx'),
+            # Lecțiile programate de la o dată încolo
+            models.Index(fields=['date', 'start_time'], condition=Q(status='scheduled'), name='tp_lesson_scheduled_idx'),
+        ]
 
     def __str__(self):
         return f"{self.group.name} - {self.date} {self.start_time}"
@@ -276,11 +555,17 @@ class Attendance(models.Model):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Prezență"
         verbose_name_plural = "Prezențe"
+        # Indexul unic acoperă și căutările (lesson, student)
         unique_together = ['lesson', 'student']
+        indexes = [
+            # Statisticile de prezență ale elevului (numărătoare din index)
+            models.Index(fields=['student', 'is_present'], name='tp_attendance_student_idx'),
+        ]
 
     def __str__(self):
         status = "Prezent" if self.is_present else "Absent"
@@ -318,6 +603,10 @@ class Assignment(models.Model):
         verbose_name = "Temă"
         verbose_name_plural = "Teme"
         ordering = ['-due_date']
+        indexes = [
+            # Temele grupei după termen (viitoare / trecute, ordonate)
+            models.Index(fields=['group', 'due_date'], name='tp_assignment_group_due_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.group.name}"
@@ -355,18 +644,23 @@ class AssignmentSubmission(models.Model):
     # Metadata
     submitted_at = models.DateTimeField(auto_now_add=True, verbose_name="Data Predare")
     graded_at = models.DateTimeField(null=True, blank=True, verbose_name="Data Evaluare")
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Predare Temă"
         verbose_name_plural = "Predări Teme"
         unique_together = ['assignment', 'student']
+        indexes = [
+            # Predările neevaluate (dashboard): doar rândurile care încă așteaptă nota
+            models.Index(fields=['assignment'], condition=Q(is_graded=False), name='tp_submission_ungraded_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.get_full_name()} - {self.assignment.title}"
 
     def is_late(self):
-        """Verifică dacă tema a fost predată târziu"""
-        return self.submitted_at.date() > self.assignment.due_date
+        """Verifică dacă tema a fost predată târziu (ziua predării în ora locală, ca în queries.py)"""
+        return timezone.localdate(self.submitted_at) > self.assignment.due_date
 
 
 class LessonNote(models.Model):
@@ -397,7 +691,7 @@ class LessonNote(models.Model):
     notes = models.TextField(verbose_name="Notițe", help_text="Notițe și observații pentru această lecție")
 
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Notiță Lecție"
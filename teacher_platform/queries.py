@@ -0,0 +1,167 @@
+"""
+Interogări reutilizabile pentru paginile profesorului.
+
+Statisticile sunt calculate în SQL (adnotări), iar listele lungi folosesc
+paginare keyset (cursor pe coloanele de sortare) în loc de OFFSET.
+"""
+import base64
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, F, FilteredRelation, IntegerField, OuterRef, Q, Subquery, Value, CharField
+from django.db.models.functions import Coalesce
+
+from accounts.models import User
+from .models import Group, GroupStudent
+
+DEFAULT_PAGE_SIZE = 25
+
+
+# ==================== PAGINARE KEYSET ====================
+
+def encode_cursor(values):
+    raw = json.dumps(values, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """Returnează lista de valori din cursor sau None dacă e invalid"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return values
+
+
+def _item_value(item, field):
+    if isinstance(item, dict):
+        return item[field]
+    value = item
+    for part in field.split('__'):
+        value = getattr(value, part)
+    return value
+
+
+def keyset_paginate(queryset, ordering, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Paginare keyset pe `ordering` - listă de (câmp, descrescător).
+    Ultimul câmp trebuie să fie unic (de regulă 'id') pentru o ordine stabilă.
+    Returnează (elemente, cursor_următor sau None).
+    """
+    order_by = [f'-{field}' if descending else field for field, descending in ordering]
+    queryset = queryset.order_by(*order_by)
+
+    values = decode_cursor(cursor, len(ordering))
+    if values is not None:
+        condition = Q()
+        for index, (field, descending) in enumerate(ordering):
+            lookup = Q(**{f'{field}__lt' if descending else f'{field}__gt': values[index]})
+            for previous_index, (previous_field, _) in enumerate(ordering[:index]):
+                lookup &= Q(**{previous_field: values[previous_index]})
+            condition |= lookup
+        queryset = queryset.filter(condition)
+
+    items = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor([_item_value(items[-1], field) for field, _ in ordering])
+    return items, next_cursor
+
+
+# ==================== TEME ====================
+
+def with_submission_stats(assignments):
+    """
+    Adaugă pe fiecare temă: submitted_count, graded_count, late_count și roster_size
+    (elevi activi în grupă), calculate în SQL.
+    __date folosește fusul orar curent, deci întârzierea se judecă pe ziua
+    locală a predării, ca AssignmentSubmission.is_late.
+    Numărul de elevi e subinterogare separată ca să nu multiplice rândurile predărilor.
+    """
+    roster = GroupStudent.objects.filter(
+        group_id=OuterRef('group_id'),
+        is_active=True
+    ).order_by().values('group_id').annotate(total=Count('id')).values('total')
+
+    return assignments.annotate(
+        submitted_count=Count('submissions'),
+        graded_count=Count('submissions', filter=Q(submissions__is_graded=True)),
+        late_count=Count('submissions', filter=Q(submissions__submitted_at__date__gt=F('due_date'))),
+        roster_size=Coalesce(Subquery(roster, output_field=IntegerField()), 0),
+    )
+
+
+# ==================== ELEVI ====================
+
+ROSTER_SORTS = {
+    'name': [('first_name', False), ('last_name', False)],
+    'last_name': [('last_name', False), ('first_name', False)],
+    'group': [('group_name', False), ('first_name', False), ('last_name', False)],
+    'attendance': [('lessons_attended', True), ('first_name', False)],
+}
+ROSTER_TIEBREAK = [('id', False), ('enrollment_id', False)]
+
+
+def roster_queryset(teacher, group_id=None):
+    """
+    Lista de elevi a profesorului într-o singură interogare: un rând pentru fiecare
+    înscriere activă într-o grupă a profesorului, plus un rând pentru elevii creați
+    de profesor care nu sunt în nicio grupă a lui (LEFT JOIN pe înscriere).
+    """
+    # FilteredRelation nu acceptă subinterogări, deci id-urile grupelor sunt citite separat
+    teacher_group_ids = list(Group.objects.filter(teacher=teacher).values_list('id', flat=True))
+
+    rows = User.objects.filter(role='student').annotate(
+        enrollment=FilteredRelation(
+            'enrolled_groups',
+            condition=Q(
+                enrolled_groups__is_active=True,
+                enrolled_groups__group_id__in=teacher_group_ids,
+            ),
+        ),
+    )
+    if group_id:
+        rows = rows.filter(enrollment__group_id=group_id)
+    else:
+        rows = rows.filter(Q(enrollment__isnull=False) | Q(student_profile__teacher=teacher))
+
+    return rows.annotate(
+        enrollment_id=Coalesce('enrollment__id', 0),
+        group_id=F('enrollment__group_id'),
+        group_name=Coalesce(
+            Subquery(Group.objects.filter(id=OuterRef('enrollment__group_id')).values('name')[:1]),
+            Value(''),
+            output_field=CharField(),
+        ),
+        lessons_attended=Coalesce('enrollment__lessons_attended', 0),
+        lessons_missed=Coalesce('enrollment__lessons_missed', 0),
+        profile_avatar=F('student_profile__avatar'),
+        grade=F('student_profile__grade'),
+    ).values(
+        'id', 'first_name', 'last_name', 'enrollment_id', 'group_id', 'group_name',
+        'lessons_attended', 'lessons_missed', 'profile_avatar', 'grade',
+    )
+
+
+def roster_page(teacher, group_id=None, sort='name', cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    O pagină din lista de elevi, sortată în SQL și paginată keyset.
+    Număr constant de interogări indiferent de numărul de elevi:
+    1 pentru id-urile grupelor + 1 pentru pagină + 1 pentru total.
+    """
+    ordering = ROSTER_SORTS.get(sort, ROSTER_SORTS['name']) + ROSTER_TIEBREAK
+    queryset = roster_queryset(teacher, group_id)
+
+    rows, next_cursor = keyset_paginate(queryset, ordering, cursor=cursor, page_size=page_size)
+    for row in rows:
+        total = row['lessons_attended'] + row['lessons_missed']
+        row['attendance_rate'] = round(row['lessons_attended'] / total * 100, 2) if total else 0
+        row['full_name'] = f"{row['first_name']} {row['last_name']}".strip()
+
+    return rows, next_cursor, queryset.count()
@@ -0,0 +1,190 @@
+"""
+Catalogul unei grupe: elevi pe rânduri, lecții pe coloane, prezența și
+evaluarea în celule.
+
+Pagina pivotează în memorie o singură interogare pe Attendance (tupluri,
+nu obiecte). Exportul CSV / XLSX parcurge elevii și prezențele cu
+.iterator(chunk_size=...), în aceeași ordine, și scrie rând cu rând, deci
+memoria rămâne constantă indiferent de mărimea grupei sau a perioadei.
+"""
+import csv
+import tempfile
+
+from django.db.models import Q
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.text import slugify
+
+from accounts.models import User
+from .models import Attendance, GroupStudent, Lesson
+
+EXPORT_CHUNK_SIZE = 2000
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class RegisterExportError(Exception):
+    """Exportul nu poate fi generat (ex. lipsește openpyxl)"""
+
+
+def register_lessons(group, date_from=None, date_to=None, module_id=None):
+    """Lecțiile (coloanele) catalogului, în ordine cronologică"""
+    lessons = Lesson.objects.filter(group=group).exclude(status='cancelled')
+    if date_from:
+        lessons = lessons.filter(date__gte=date_from)
+    if date_to:
+        lessons = lessons.filter(date__lte=date_to)
+    if module_id:
+        lessons = lessons.filter(lesson_template__module_id=module_id)
+    return lessons.order_by('date', 'start_time', 'id')
+
+
+def register_students(group, lessons):
+    """Elevii (rândurile): înscrișii activi plus cei cu prezențe în perioadă"""
+    return User.objects.filter(
+        Q(id__in=GroupStudent.objects.filter(group=group, is_active=True).values('student_id')) |
+        Q(id__in=Attendance.objects.filter(lesson__in=lessons).values('student_id'))
+    ).order_by('last_name', 'first_name', 'id')
+
+
+def _summary(cells):
+    marked = [cell for cell in cells if cell is not None]
+    present = sum(1 for is_present, _ in marked if is_present)
+    rate = round(present / len(marked) * 100, 2) if marked else 0
+    return present, len(marked) - present, rate
+
+
+def build_attendance_matrix(group, date_from=None, date_to=None, module_id=None):
+    """
+    Catalogul ca structuri compacte: lessons = [(id, date, topic)] și
+    rows = [{'student_id', 'name', 'cells', 'present', 'absent', 'attendance_rate'}],
+    unde o celulă este None (nemarcat) sau (is_present, performance_rating)
+    """
+    lessons = register_lessons(group, date_from, date_to, module_id)
+    lesson_columns = list(lessons.values_list('id', 'date', 'topic'))
+    column_of = {lesson_id: index for index, (lesson_id, _, _) in enumerate(lesson_columns)}
+
+    students = list(register_students(group, lessons).values_list('id', 'first_name', 'last_name'))
+    row_of = {}
+    rows = []
+    for student_id, first_name, last_name in students:
+        row_of[student_id] = len(rows)
+        rows.append({
+            'student_id': student_id,
+            'name': f'{first_name} {last_name}'.strip(),
+            'cells': [None] * len(lesson_columns),
+        })
+
+    attendances = Attendance.objects.filter(lesson__in=lessons).values_list(
+        'lesson_id', 'student_id', 'is_present', 'performance_rating'
+    )
+    for lesson_id, student_id, is_present, rating in attendances:
+        row_index = row_of.get(student_id)
+        column = column_of.get(lesson_id)
+        if row_index is not None and column is not None:
+            rows[row_index]['cells'][column] = (is_present, rating)
+
+    for row in rows:
+        row['present'], row['absent'], row['attendance_rate'] = _summary(row['cells'])
+
+    return {'lessons': lesson_columns, 'rows': rows}
+
+
+# ==================== EXPORT ====================
+
+def _cell_label(cell):
+    if cell is None:
+        return ''
+    is_present, rating = cell
+    label = 'P' if is_present else 'A'
+    return f'{label} {rating}' if rating else label
+
+
+def iter_register_rows(group, date_from=None, date_to=None, module_id=None):
+    """
+    Rândurile exportului (antet inclus), generate pe rând.
+    Elevii și prezențele sunt citite în aceeași ordine și îmbinate din mers.
+    """
+    lessons = register_lessons(group, date_from, date_to, module_id)
+    lesson_columns = list(lessons.values_list('id', 'date'))
+    column_of = {lesson_id: index for index, (lesson_id, _) in enumerate(lesson_columns)}
+
+    yield (
+        ['Elev']
+        + [lesson_date.strftime('%d.%m.%Y') for _, lesson_date in lesson_columns]
+        + ['Prezențe', 'Absențe', 'Rată Prezență (%)']
+    )
+
+    students = register_students(group, lessons).values_list(
+        'id', 'first_name', 'last_name'
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    attendances = Attendance.objects.filter(lesson__in=lessons).order_by(
+        'student__last_name', 'student__first_name', 'student_id'
+    ).values_list(
+        'student_id', 'lesson_id', 'is_present', 'performance_rating'
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    pending = next(attendances, None)
+    for student_id, first_name, last_name in students:
+        cells = [None] * len(lesson_columns)
+        while pending is not None and pending[0] == student_id:
+            _, lesson_id, is_present, rating = pending
+            column = column_of.get(lesson_id)
+            if column is not None:  # lecție adăugată după citirea coloanelor
+                cells[column] = (is_present, rating)
+            pending = next(attendances, None)
+
+        present, absent, rate = _summary(cells)
+        yield (
+            [f'{first_name} {last_name}'.strip()]
+            + [_cell_label(cell) for cell in cells]
+            + [present, absent, rate]
+        )
+
+
+class _Echo:
+    """Obiect „fișier” pentru csv.writer care returnează linia în loc s-o scrie"""
+
+    def write(self, value):
+        return value
+
+
+def _export_filename(group, extension):
+    return f'catalog-{slugify(group.code or group.name)}.{extension}'
+
+
+def register_csv_response(group, **filters):
+    writer = csv.writer(_Echo())
+
+    def stream():
+        yield '\ufeff'  # BOM, ca Excel să recunoască UTF-8
+        for row in iter_register_rows(group, **filters):
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(stream(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{_export_filename(group, "csv")}"'
+    return response
+
+
+def register_xlsx_response(group, **filters):
+    """
+    XLSX în modul write_only (rândurile nu sunt păstrate în memorie),
+    salvat într-un fișier temporar și trimis în bucăți
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RegisterExportError('Exportul XLSX necesită pachetul openpyxl. Folosește exportul CSV.')
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title='Catalog')
+    for row in iter_register_rows(group, **filters):
+        sheet.append(row)
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=_export_filename(group, 'xlsx'),
+        content_type=XLSX_CONTENT_TYPE,
+    )
@@ -0,0 +1,534 @@
+"""
+Generator de date sintetice pentru teste de încărcare (comanda seed_scale).
+
+Construiește o academie completă: locații, cursuri cu module și șabloane,
+profesori, elevi, grupe, ani de lecții săptămânale, prezențe, teme cu
+predări și sesiuni soroban cu answers_detail. Aceeași sămânță (seed) și
+aceeași dată de final dau exact același set de date.
+
+Rândurile sunt inserate în loturi, într-o singură tranzacție: cu
+bulk_create pentru catalog, oameni și grupe, iar pentru tabelele mari
+(lecții, prezențe, teme, predări, sesiuni soroban) cu executemany pe
+tupluri generate lot cu lot, deci memoria nu crește cu volumul. Lecțiile
+și temele sunt recitite apoi ca tupluri (id-urile nu se întorc din
+executemany).
+bulk_create ocolește save() și semnalele, așa că valorile pe care acestea
+le-ar calcula (codurile grupelor, active_student_count, progresul soroban)
+sunt completate aici explicit.
+"""
+import datetime
+import itertools
+import random
+import time
+from dataclasses import dataclass
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import User, TeacherProfile, StudentProfile
+from courses.models import AgeGroup, Course, Location, Module, LessonTemplate
+from soroban.models import SorobanExercise, SorobanSession, SorobanProgress
+from .backups import bulk_create_keeping_dates
+from .exports import DEFAULT_BATCH_SIZE
+from .models import Group, GroupStudent, Lesson, Attendance, Assignment, AssignmentSubmission
+
+# Parola comună a conturilor generate (un singur hash, nu 5000)
+DEFAULT_PASSWORD = 'scale-password'
+
+FIRST_NAMES = [
+    'Andrei', 'Maria', 'Ioana', 'Alexandru', 'Elena', 'Mihai', 'Ana', 'David', 'Sofia', 'Luca',
+    'Daria', 'Matei', 'Eva', 'Ștefan', 'Irina', 'Tudor', 'Bianca', 'Radu', 'Alesia', 'Vlad',
+    'Teodora', 'Cristian', 'Iulia', 'Gabriel', 'Anastasia', 'Rareș', 'Natalia', 'Bogdan', 'Carla', 'Denis',
+]
+LAST_NAMES = [
+    'Popescu', 'Ionescu', 'Popa', 'Radu', 'Dumitru', 'Stan', 'Stoica', 'Gheorghe', 'Matei', 'Ciobanu',
+    'Rusu', 'Munteanu', 'Constantin', 'Marin', 'Lazăr', 'Florea', 'Ene', 'Dobre', 'Barbu', 'Nistor',
+    'Moldovan', 'Tudor', 'Neagu', 'Sârbu', 'Cristea', 'Toma', 'Dinu', 'Zamfir', 'Preda', 'Voicu',
+]
+CITIES = ['București', 'Cluj-Napoca', 'Iași', 'Timișoara', 'Brașov', 'Constanța', 'Sibiu', 'Oradea', 'Craiova', 'Galați']
+COURSES = [
+    ('Aritmetică', 'aritmetica'),
+    ('Soroban', 'soroban'),
+    ('Logică și Probleme', 'logica'),
+]
+TOPICS = ['Adunări', 'Scăderi', 'Înmulțiri', 'Împărțiri', 'Fracții', 'Probleme', 'Calcul mental', 'Recapitulare']
+OPERATIONS = [('addition', '+'), ('subtraction', '-'), ('multiplication', '*')]
+ERROR_OFFSETS = [-10, -1, 1, 10]
+DIFFICULTIES = [('beginner', 1, 20), ('intermediate', 10, 100), ('advanced', 10, 500), ('expert', 100, 1000)]
+
+# Ordinea valorilor din tuplurile generate pentru tabelele mari (vezi insert_rows)
+LESSON_COLUMNS = [
+    'group_id', 'lesson_template_id', 'date', 'start_time', 'end_time', 'status', 'topic', 'description',
+    'homework', 'materials', 'teacher_notes', 'created_at', 'updated_at',
+]
+ASSIGNMENT_COLUMNS = [
+    'group_id', 'lesson_id', 'title', 'description', 'assigned_date', 'due_date', 'attachment', 'max_points',
+]
+ATTENDANCE_COLUMNS = [
+    'lesson_id', 'student_id', 'is_present', 'notes', 'performance_rating', 'created_at', 'updated_at',
+]
+SUBMISSION_COLUMNS = [
+    'assignment_id', 'student_id', 'text_response', 'file_response', 'score', 'feedback', 'is_graded',
+    'submitted_at', 'graded_at', 'updated_at',
+]
+SOROBAN_SESSION_COLUMNS = [
+    'student_id', 'exercise_id', 'problems_attempted', 'problems_correct', 'started_at', 'completed_at',
+    'total_time_seconds', 'points_earned', 'answers_detail', 'updated_at',
+]
+
+
+@dataclass
+class ScaleConfig:
+    locations: int = 20
+    teachers: int = 200
+    students: int = 5000
+    groups_per_teacher: int = 3
+    max_students_per_group: int = 10
+    years: float = 2
+    modules_per_course: int = 4
+    templates_per_module: int = 12
+    assignment_every: int = 2
+    submission_rate: float = 0.8
+    soroban_sessions: int = 50
+    seed: int = 42
+    prefix: str = 'scale'
+    end_date: datetime.date = None
+    batch_size: int = DEFAULT_BATCH_SIZE
+
+
+class SeedError(Exception):
+    """Datele nu pot fi generate (ex. prefixul este deja folosit)"""
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class ScaleSeeder:
+    def __init__(self, config):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.end_date = config.end_date or timezone.localdate()
+        self.start_date = self.end_date - datetime.timedelta(days=int(365 * config.years))
+        self.counts = {}
+        # UTC: datetime-urile se scriu fără conversie de fus orar per rând
+        self.tz = datetime.timezone.utc
+        # Operațiile bazei de date luate o dată: `connection` este un proxy
+        # rezolvat la fiecare acces, costisitor la sute de mii de rânduri
+        self.ops = connection.ops
+        self.db_now = self.db_datetime(timezone.now())
+        self.json_field = SorobanSession._meta.get_field('answers_detail')
+
+    # ---------- utilitare ----------
+
+    def insert(self, model, objects, keep=False):
+        """
+        bulk_create în loturi (datele de creare date explicit sunt păstrate);
+        cu keep=True returnează obiectele create (cu id), altfel doar le numără
+        """
+        created = []
+        total = 0
+        for batch in _batched(objects, self.config.batch_size):
+            bulk_create_keeping_dates(model, batch, batch_size=self.config.batch_size)
+            total += len(batch)
+            if keep:
+                created.extend(batch)
+        self.counts[model._meta.label_lower] = self.counts.get(model._meta.label_lower, 0) + total
+        return created
+
+    # random.randint / choice trec prin randrange (lent la milioane de apeluri);
+    # aceste variante folosesc direct random() și rămân deterministe
+
+    def randint(self, low, high):
+        return low + int(self.rng.random() * (high - low + 1))
+
+    def choice(self, sequence):
+        return sequence[int(self.rng.random() * len(sequence))]
+
+    def insert_rows(self, model, columns, rows):
+        """
+        INSERT direct cu executemany pentru tabelele de fapte (sute de mii de
+        rânduri). bulk_create pregătește fiecare valoare prin câmpul modelului
+        (~50 µs pe rând), mai mult decât costul inserării în sine; aici
+        rândurile vin ca tupluri deja adaptate pentru baza de date.
+        Coloanele trebuie să acopere toate câmpurile (valorile implicite
+        Django nu se aplică).
+        """
+        expected = {field.attname for field in model._meta.concrete_fields if not field.primary_key}
+        if set(columns) != expected:
+            raise SeedError(f'Coloanele pentru {model._meta.label} nu corespund modelului: {sorted(expected ^ set(columns))}')
+
+        quote = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table),
+            ', '.join(quote(model._meta.get_field(column).column) for column in columns),
+            ', '.join(['%s'] * len(columns)),
+        )
+        total = 0
+        with connection.cursor() as cursor:
+            for batch in _batched(rows, self.config.batch_size):
+                cursor.executemany(sql, batch)
+                total += len(batch)
+        self.counts[model._meta.label_lower] = self.counts.get(model._meta.label_lower, 0) + total
+        return total
+
+    def db_datetime(self, value):
+        return self.ops.adapt_datetimefield_value(value)
+
+    def db_date(self, value):
+        return self.ops.adapt_datefield_value(value)
+
+    def db_time(self, value):
+        return self.ops.adapt_timefield_value(value)
+
+    def db_json(self, value):
+        return self.json_field.get_db_prep_save(value, self.ops.connection)
+
+    def at(self, day, hour, minute=0):
+        return datetime.datetime(day.year, day.month, day.day, hour, minute, tzinfo=self.tz)
+
+    def name(self):
+        return self.choice(FIRST_NAMES), self.choice(LAST_NAMES)
+
+    # ---------- catalog ----------
+
+    def create_catalog(self):
+        prefix = self.config.prefix
+        self.locations = self.insert(Location, [
+            Location(
+                name=f'{prefix} {CITIES[i % len(CITIES)]} {i // len(CITIES) + 1}',
+                address=f'Str. Exemplu nr. {i + 1}, {CITIES[i % len(CITIES)]}',
+                is_online=(i == 0),
+            )
+            for i in range(self.config.locations)
+        ], keep=True)
+
+        age_group = AgeGroup.objects.create(name=f'{prefix} 6-12', min_age=6, max_age=12)
+        self.courses = self.insert(Course, [
+            Course(
+                title=title, slug=f'{prefix}-{slug}', description=f'Curs {title}', age_group=age_group,
+                price=250, frequency='Săptămânal', group_size=self.config.max_students_per_group,
+            )
+            for title, slug in COURSES
+        ], keep=True)
+
+        self.modules = self.insert(Module, [
+            Module(course=course, name=f'Modul {order}', order=order)
+            for course in self.courses
+            for order in range(1, self.config.modules_per_course + 1)
+        ], keep=True)
+
+        templates = self.insert(LessonTemplate, [
+            LessonTemplate(module=module, name=f'{TOPICS[order % len(TOPICS)]} {order}', order=order)
+            for module in self.modules
+            for order in range(1, self.config.templates_per_module + 1)
+        ], keep=True)
+        self.templates_by_module = {}
+        for template in templates:
+            self.templates_by_module.setdefault(template.module_id, []).append(template.id)
+
+        self.exercises = self.insert(SorobanExercise, [
+            SorobanExercise(
+                title=f'{prefix} {difficulty} {operation}', difficulty=difficulty, operation_type=operation,
+                number_count=self.randint(5, 10), min_number=low, max_number=high,
+                time_limit_seconds=120, points_per_correct=10,
+            )
+            for difficulty, low, high in DIFFICULTIES
+            for operation, _ in OPERATIONS
+        ], keep=True)
+
+    # ---------- oameni și grupe ----------
+
+    def create_people(self):
+        password = make_password(DEFAULT_PASSWORD)
+        prefix = self.config.prefix
+
+        def users(role, count):
+            for i in range(count):
+                first_name, last_name = self.name()
+                yield User(
+                    username=f'{prefix}-{role[0]}{i:05d}', role=role, password=password,
+                    first_name=first_name, last_name=last_name,
+                    email=f'{prefix}-{role[0]}{i:05d}@example.com',
+                )
+
+        self.teachers = self.insert(User, users('teacher', self.config.teachers), keep=True)
+        self.students = self.insert(User, users('student', self.config.students), keep=True)
+
+        profiles = self.insert(TeacherProfile, [
+            TeacherProfile(user=teacher, specialization=self.choice(COURSES)[0], experience_years=self.randint(0, 20))
+            for teacher in self.teachers
+        ], keep=True)
+        self.teacher_locations = {}
+        links = []
+        for profile in profiles:
+            chosen = self.rng.sample(self.locations, k=min(2, len(self.locations)))
+            self.teacher_locations[profile.user_id] = chosen
+            links.extend(
+                TeacherProfile.locations.through(teacherprofile_id=profile.id, location_id=location.id)
+                for location in chosen
+            )
+        self.insert(TeacherProfile.locations.through, links)
+
+    def create_groups(self):
+        groups = []
+        for teacher in self.teachers:
+            for _ in range(self.config.groups_per_teacher):
+                module = self.choice(self.modules)
+                start = self.start_date + datetime.timedelta(days=self.randint(0, 180))
+                groups.append(Group(
+                    name=f'{module.course.title} {len(groups) + 1}',
+                    teacher=teacher,
+                    course=module.course,
+                    module=module,
+                    location=self.choice(self.teacher_locations[teacher.id]),
+                    created_date=start,
+                    weekday=self.randint(0, 5),
+                    start_time=datetime.time(self.choice([9, 10, 11, 14, 16, 17, 18])),
+                    start_date=start,
+                    max_students=self.config.max_students_per_group,
+                ))
+
+        # Elevii sunt împărțiți pe grupe până la capacitate; restul rămân neînscriși
+        students = list(self.students)
+        self.rng.shuffle(students)
+        self.members = {}
+        seats = itertools.cycle(range(len(groups)))
+        for student in students[:len(groups) * self.config.max_students_per_group]:
+            self.members.setdefault(next(seats), []).append(student)
+
+        # Fără Group.save: codurile și numărul de elevi activi se completează aici
+        for index, group in enumerate(groups):
+            group.active_student_count = len(self.members.get(index, []))
+        Group.assign_codes(groups)
+        self.groups = self.insert(Group, groups, keep=True)
+
+        group_of = {}
+        enrolments = []
+        for index, group in enumerate(self.groups):
+            for student in self.members.get(index, []):
+                group_of[student.id] = group
+                enrolments.append(GroupStudent(group=group, student=student, enrolled_date=group.start_date))
+        self.insert(GroupStudent, enrolments)
+        self.members = {self.groups[index].id: members for index, members in self.members.items()}
+
+        self.insert(StudentProfile, [
+            StudentProfile(
+                user=student,
+                sex=self.choice('MF'),
+                group=group_of.get(student.id),
+                location=group_of[student.id].location if student.id in group_of else None,
+                teacher=group_of[student.id].teacher if student.id in group_of else None,
+                account_created_date=group_of[student.id].start_date if student.id in group_of else self.start_date,
+                grade=str(self.randint(1, 6)),
+            )
+            for student in self.students
+        ])
+
+    # ---------- lecții, prezențe, teme ----------
+
+    def create_lessons(self):
+        horizon = self.end_date + datetime.timedelta(weeks=4)
+
+        def rows():
+            for group in self.groups:
+                day = group.start_date + datetime.timedelta(days=(group.weekday - group.start_date.weekday()) % 7)
+                templates = self.templates_by_module.get(group.module_id, [None])
+                start_time = self.db_time(group.start_time)
+                end_time = self.db_time(datetime.time(group.start_time.hour + 1, 30))
+                created = self.db_datetime(self.at(group.start_date, 8))
+                number = 0
+                while day <= horizon:
+                    if day > self.end_date:
+                        status = 'scheduled'
+                    elif self.rng.random() < 0.03:
+                        status = 'cancelled'
+                    else:
+                        status = 'completed'
+                    yield (
+                        group.id, templates[number % len(templates)], self.db_date(day),
+                        start_time, end_time, status, f'{TOPICS[number % len(TOPICS)]} - lecția {number + 1}',
+                        '', '', '', '', created, self.db_now,
+                    )
+                    number += 1
+                    day += datetime.timedelta(weeks=1)
+
+        self.insert_rows(Lesson, LESSON_COLUMNS, rows())
+        # Id-urile nu se întorc din executemany; ordinea id-urilor este ordinea generării
+        self.lessons = list(
+            Lesson.objects.filter(group_id__in=[group.id for group in self.groups]).order_by('id')
+            .values_list('id', 'group_id', 'date', 'start_time', 'status', 'topic', named=True)
+        )
+
+    def iter_attendance(self):
+        # Fiecare elev are propria probabilitate de prezență
+        presence = {student.id: self.rng.uniform(0.65, 0.98) for student in self.students}
+        ratings = [1, 2, 3, 3, 4, 4, 4, 5, 5, 5]
+        for lesson in self.lessons:
+            if lesson.status != 'completed':
+                continue
+            created = self.db_datetime(self.at(lesson.date, lesson.start_time.hour, 45))
+            for student in self.members.get(lesson.group_id, ()):
+                is_present = self.rng.random() < presence[student.id]
+                rating = self.choice(ratings) if is_present else None
+                yield (lesson.id, student.id, is_present, '', rating, created, self.db_now)
+
+    def create_assignments(self):
+        every = max(1, self.config.assignment_every)
+        by_group = {}
+        for lesson in self.lessons:
+            by_group.setdefault(lesson.group_id, []).append(lesson)
+
+        def rows():
+            for group_id, lessons in by_group.items():
+                for lesson in lessons[::every]:
+                    if lesson.status == 'cancelled':
+                        continue
+                    yield (
+                        group_id, lesson.id, f'Temă: {lesson.topic}', 'Exercițiile din fișa de lucru.',
+                        self.db_date(lesson.date),
+                        self.db_date(lesson.date + datetime.timedelta(days=7)), '', 100,
+                    )
+
+        self.insert_rows(Assignment, ASSIGNMENT_COLUMNS, rows())
+        self.assignments = list(
+            Assignment.objects.filter(group_id__in=list(by_group)).order_by('id')
+            .values_list('id', 'group_id', 'assigned_date', 'due_date', named=True)
+        )
+
+    def iter_submissions(self):
+        for assignment in self.assignments:
+            if assignment.due_date > self.end_date:
+                continue
+            for student in self.members.get(assignment.group_id, ()):
+                if self.rng.random() >= self.config.submission_rate:
+                    continue
+                submitted = self.at(
+                    assignment.assigned_date + datetime.timedelta(days=self.randint(1, 9)),
+                    self.randint(14, 21), self.randint(0, 59),
+                )
+                graded = self.rng.random() < 0.9
+                yield (
+                    assignment.id, student.id, 'Rezolvat.', '',
+                    self.randint(40, 100) if graded else None, '', graded,
+                    self.db_datetime(submitted),
+                    self.db_datetime(submitted + datetime.timedelta(days=2)) if graded else None,
+                    self.db_now,
+                )
+
+    # ---------- soroban ----------
+
+    def _answers(self, exercise, symbol, skill):
+        # Bucla cea mai fierbinte a generării: randint / choice scrise direct pe
+        # random(), cu aceeași secvență de apeluri (datele rămân identice)
+        random = self.rng.random
+        low, span = exercise.min_number, exercise.max_number - exercise.min_number + 1
+        answers = []
+        for _ in range(exercise.number_count):
+            a = low + int(random() * span)
+            b = low + int(random() * span)
+            if symbol == '-' and b > a:
+                a, b = b, a
+            if symbol == '*':
+                b = 2 + int(random() * 8)
+            result = a + b if symbol == '+' else a - b if symbol == '-' else a * b
+            correct = random() < skill
+            if not correct:
+                result += ERROR_OFFSETS[int(random() * 4)]
+            answers.append({
+                'problem': f'{a}{symbol}{b}',
+                'answer': result,
+                'correct': correct,
+                'time': 3 + int(random() * 28),
+            })
+        return answers
+
+    def iter_soroban_sessions(self):
+        symbols = dict(OPERATIONS)
+        days = (self.end_date - self.start_date).days
+        self.progress = {}
+        for student in self.students:
+            skill = self.rng.uniform(0.55, 0.97)
+            stats = self.progress[student.id] = {
+                'sessions': 0, 'problems': 0, 'correct': 0, 'points': 0,
+                'best': 0.0, 'fastest': None, 'last': None,
+            }
+            for _ in range(self.config.soroban_sessions):
+                exercise = self.choice(self.exercises)
+                answers = self._answers(exercise, symbols[exercise.operation_type], skill)
+                correct = sum(1 for answer in answers if answer['correct'])
+                total_time = sum(answer['time'] for answer in answers)
+                started = self.at(
+                    self.start_date + datetime.timedelta(days=self.randint(0, days)),
+                    self.randint(15, 20), self.randint(0, 59),
+                )
+
+                stats['sessions'] += 1
+                stats['problems'] += len(answers)
+                stats['correct'] += correct
+                stats['points'] += correct * exercise.points_per_correct
+                stats['best'] = max(stats['best'], round(correct / len(answers) * 100, 2))
+                fastest = min(answer['time'] for answer in answers)
+                stats['fastest'] = fastest if stats['fastest'] is None else min(stats['fastest'], fastest)
+                stats['last'] = max(stats['last'] or started.date(), started.date())
+
+                yield (
+                    student.id, exercise.id, len(answers), correct,
+                    self.db_datetime(started),
+                    self.db_datetime(started + datetime.timedelta(seconds=total_time)),
+                    total_time, correct * exercise.points_per_correct,
+                    self.db_json(answers), self.db_now,
+                )
+
+    def create_soroban_progress(self):
+        self.insert(SorobanProgress, [
+            SorobanProgress(
+                student_id=student_id,
+                current_level=min(10, 1 + stats['sessions'] // 10),
+                total_sessions=stats['sessions'],
+                total_problems_solved=stats['problems'],
+                total_correct_answers=stats['correct'],
+                total_points=stats['points'],
+                best_accuracy=stats['best'],
+                fastest_problem_time=stats['fastest'],
+                last_practice_date=stats['last'],
+            )
+            for student_id, stats in self.progress.items()
+            if stats['sessions']
+        ])
+
+    # ---------- rulare ----------
+
+    def steps(self):
+        """Pașii generării, în ordinea dependențelor: (nume, funcție)"""
+        return [
+            ('catalog', self.create_catalog),
+            ('people', self.create_people),
+            ('groups', self.create_groups),
+            ('lessons', self.create_lessons),
+            ('attendance', lambda: self.insert_rows(Attendance, ATTENDANCE_COLUMNS, self.iter_attendance())),
+            ('assignments', self.create_assignments),
+            ('submissions', lambda: self.insert_rows(AssignmentSubmission, SUBMISSION_COLUMNS, self.iter_submissions())),
+            ('soroban_sessions', lambda: self.insert_rows(SorobanSession, SOROBAN_SESSION_COLUMNS, self.iter_soroban_sessions())),
+            ('soroban_progress', self.create_soroban_progress),
+        ]
+
+    def run(self, on_step=None):
+        """Generează totul într-o tranzacție; on_step(nume, secunde) după fiecare pas"""
+        if User.objects.filter(username__startswith=f'{self.config.prefix}-').exists():
+            raise SeedError(
+                f'Există deja date cu prefixul „{self.config.prefix}”. Folosește alt --prefix sau o bază goală.'
+            )
+        with transaction.atomic():
+            for name, step in self.steps():
+                started = time.perf_counter()
+                step()
+                if on_step is not None:
+                    on_step(name, time.perf_counter() - started)
+        return self.counts
@@ -0,0 +1,183 @@
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from courses.models import Course, Location, Module, LessonTemplate
+
+from .caching import bump_generation_on_commit
+from .calendar_api import CALENDAR_NAMESPACE
+from .summaries import DASHBOARD_NAMESPACE
+from .analytics import STUDENT_STATS_NAMESPACE, stats_owner
+from .changes import TRACKED_MODELS
+from .models import Group, GroupStudent, GroupWaitlistEntry, Lesson, Attendance, Assignment, AssignmentSubmission, DeletionLog
+
+
+def _invalidate(teacher_id, *namespaces):
+    """Generațiile se schimbă după commit, o dată per tranzacție (vezi caching.py)"""
+    for namespace in namespaces:
+        bump_generation_on_commit(namespace, teacher_id)
+
+
+def _group_teacher_id(instance, origin=None):
+    """
+    Profesorul grupei de care aparține obiectul (folosește grupa din cache
+    dacă e încărcată, sau grupa care a pornit o ștergere în cascadă)
+    """
+    if isinstance(origin, Group) and origin.pk == instance.group_id:
+        return origin.teacher_id
+    if type(instance).group.is_cached(instance):
+        return instance.group.teacher_id
+    return Group.objects.filter(id=instance.group_id).values_list('teacher_id', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Lesson)
+def invalidate_on_lesson_change(sender, instance, **kwargs):
+    """Orice modificare a unei lecții invalidează calendarul și dashboard-ul profesorului"""
+    _invalidate(_group_teacher_id(instance, kwargs.get('origin')), CALENDAR_NAMESPACE, DASHBOARD_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=Group)
+def invalidate_on_group_change(sender, instance, **kwargs):
+    """Numele grupei și modulul apar în calendar, deci invalidăm și aici"""
+    _invalidate(instance.teacher_id, CALENDAR_NAMESPACE, DASHBOARD_NAMESPACE)
+
+
+def _invalidate_teachers(teacher_ids, *namespaces):
+    for teacher_id in set(teacher_ids):
+        _invalidate(teacher_id, *namespaces)
+
+
+# Catalogul (cursuri, module, locații, șabloane) apare în payload-urile din cache.
+# La ștergere rândurile legate sunt deja dezlegate (SET_NULL) în post_delete,
+# deci profesorii afectați sunt căutați în pre_delete.
+
+@receiver([post_save, pre_delete], sender=Module)
+def invalidate_on_module_change(sender, instance, **kwargs):
+    """Numele și culoarea modulului apar în calendar și în dashboard"""
+    teacher_ids = Group.objects.filter(module=instance).order_by().values_list('teacher_id', flat=True).distinct()
+    _invalidate_teachers(teacher_ids, CALENDAR_NAMESPACE, DASHBOARD_NAMESPACE)
+
+
+@receiver([post_save, pre_delete], sender=LessonTemplate)
+def invalidate_on_lesson_template_change(sender, instance, **kwargs):
+    """Numele șablonului este titlul lecției în calendar și în dashboard"""
+    teacher_ids = Lesson.objects.filter(lesson_template=instance).order_by().values_list('group__teacher_id', flat=True).distinct()
+    _invalidate_teachers(teacher_ids, CALENDAR_NAMESPACE, DASHBOARD_NAMESPACE)
+
+
+@receiver([post_save, pre_delete], sender=Course)
+def invalidate_on_course_change(sender, instance, **kwargs):
+    """Cursul grupelor active apare în dashboard"""
+    teacher_ids = Group.objects.filter(course=instance).order_by().values_list('teacher_id', flat=True).distinct()
+    _invalidate_teachers(teacher_ids, DASHBOARD_NAMESPACE)
+
+
+@receiver([post_save, pre_delete], sender=Location)
+def invalidate_on_location_change(sender, instance, **kwargs):
+    """Locația apare în dashboard și în evenimentele feed-ului .ics (ETag-ul urmează generația de calendar)"""
+    teacher_ids = Group.objects.filter(location=instance).order_by().values_list('teacher_id', flat=True).distinct()
+    _invalidate_teachers(teacher_ids, CALENDAR_NAMESPACE, DASHBOARD_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=GroupStudent)
+def invalidate_on_group_student_change(sender, instance, **kwargs):
+    _invalidate(_group_teacher_id(instance, kwargs.get('origin')), DASHBOARD_NAMESPACE)
+
+
+@receiver(post_delete, sender=GroupStudent)
+def release_seat_on_group_student_delete(sender, instance, using, **kwargs):
+    """
+    Ștergerea unei înscrieri active eliberează locul (rulează în tranzacția
+    ștergerii). Lista de așteptare este promovată după commit: dacă grupa
+    este ștearsă în aceeași operație, coada ei nu mai există.
+    """
+    if instance.is_active:
+        Group.release_seats(instance.group_id)
+        group_id = instance.group_id
+        transaction.on_commit(lambda: GroupWaitlistEntry.promote_next(group_id), using=using)
+
+
+@receiver([post_save, post_delete], sender=Assignment)
+def invalidate_on_assignment_change(sender, instance, **kwargs):
+    _invalidate(_group_teacher_id(instance, kwargs.get('origin')), DASHBOARD_NAMESPACE)
+
+
+def _related_teacher_id(instance, relation, origin=None):
+    """
+    Profesorul grupei lecției / temei (`relation`) de care aparține rândul.
+    Folosește obiectele deja încărcate (ex. lesson.attendances.update_or_create
+    cu lesson.group din select_related) sau obiectul care a pornit ștergerea
+    în cascadă (`origin`); interoghează doar când nu le are.
+    """
+    parent_model = instance._meta.get_field(relation).related_model
+    parent_id = getattr(instance, f'{relation}_id')
+    if isinstance(origin, Group):
+        return origin.teacher_id
+    if isinstance(origin, parent_model) and origin.pk == parent_id:
+        # Grupa rămâne în cache pe origin pentru restul rândurilor din cascadă
+        return origin.group.teacher_id
+    if getattr(type(instance), relation).is_cached(instance):
+        parent = getattr(instance, relation)
+        return _group_teacher_id(parent) if parent is not None else None
+    return parent_model.objects.filter(id=parent_id).values_list('group__teacher_id', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=AssignmentSubmission)
+def invalidate_on_submission_change(sender, instance, **kwargs):
+    teacher_id = _related_teacher_id(instance, 'assignment', kwargs.get('origin'))
+    _invalidate(teacher_id, DASHBOARD_NAMESPACE)
+    if teacher_id is not None:
+        _invalidate(stats_owner(teacher_id, instance.student_id), STUDENT_STATS_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=Attendance)
+def invalidate_on_attendance_change(sender, instance, **kwargs):
+    """Prezențele alimentează statisticile din pagina elevului"""
+    teacher_id = _related_teacher_id(instance, 'lesson', kwargs.get('origin'))
+    if teacher_id is not None:
+        _invalidate(stats_owner(teacher_id, instance.student_id), STUDENT_STATS_NAMESPACE)
+
+
+def log_tracked_deletion(sender, instance, **kwargs):
+    """Tombstone pentru export_changes (rulează în tranzacția ștergerii, deci dispare la rollback)"""
+    DeletionLog.objects.create(model_label=sender._meta.label_lower, object_id=instance.pk)
+
+
+# Conectat per model: un receiver fără sender ar dezactiva ștergerile rapide (fast delete) peste tot
+for _model in TRACKED_MODELS:
+    post_delete.connect(log_tracked_deletion, sender=_model, dispatch_uid=f'deletion_log_{_model._meta.label_lower}')
+
+
+# Receiver-ele post_delete apelate pentru fiecare rând din cascada unei grupe
+_ROW_DELETE_RECEIVERS = [
+    (invalidate_on_group_change, Group),
+    (invalidate_on_lesson_change, Lesson),
+    (invalidate_on_group_student_change, GroupStudent),
+    (release_seat_on_group_student_delete, GroupStudent),
+    (invalidate_on_assignment_change, Assignment),
+    (invalidate_on_submission_change, AssignmentSubmission),
+    (invalidate_on_attendance_change, Attendance),
+]
+
+
+@contextmanager
+def row_delete_receivers_disconnected():
+    """
+    Deconectează temporar receiver-ele post_delete per rând (cache, locuri,
+    tombstone-uri), ca QuerySet.delete() să poată șterge în masă. Apelantul
+    preia munca lor: scrie tombstone-urile și invalidează cache-ul singur.
+    Deconectarea e globală pentru proces, deci se folosește doar din comenzi.
+    """
+    for func, model in _ROW_DELETE_RECEIVERS:
+        post_delete.disconnect(func, sender=model)
+    for model in TRACKED_MODELS:
+        post_delete.disconnect(sender=model, dispatch_uid=f'deletion_log_{model._meta.label_lower}')
+    try:
+        yield
+    finally:
+        for func, model in _ROW_DELETE_RECEIVERS:
+            post_delete.connect(func, sender=model)
+        for model in TRACKED_MODELS:
+            post_delete.connect(log_tracked_deletion, sender=model, dispatch_uid=f'deletion_log_{model._meta.label_lower}')
@@ -0,0 +1,86 @@
+"""
+Sumarul materializat pentru dashboard-ul profesorului.
+
+Snapshot-ul este calculat o singură dată și păstrat în cache; semnalele din
+signals.py schimbă generația profesorului când se modifică grupe, elevi,
+lecții, teme sau predări, iar următoarea accesare îl recalculează.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from .caching import make_key, count_lookup, DEFAULT_TIMEOUT
+from .models import Group, GroupStudent, Lesson, Assignment, AssignmentSubmission
+
+DASHBOARD_NAMESPACE = 'dashboard'
+
+
+def build_dashboard_summary(teacher, today):
+    """Calculează toate datele dashboard-ului (fără cache)"""
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=6)
+    upcoming_deadline = today + timedelta(days=7)
+
+    total_groups = Group.objects.filter(teacher=teacher, is_active=True).count()
+
+    weekly_lessons = Lesson.objects.filter(
+        group__teacher=teacher,
+        date__range=[week_start, week_end]
+    ).count()
+
+    total_students = GroupStudent.objects.filter(
+        group__teacher=teacher,
+        is_active=True
+    ).count()
+
+    ungraded_assignments = AssignmentSubmission.objects.filter(
+        assignment__group__teacher=teacher,
+        is_graded=False
+    ).count()
+
+    upcoming_lessons = list(Lesson.objects.filter(
+        group__teacher=teacher,
+        date__gte=today,
+        status='scheduled'
+    ).select_related('group', 'lesson_template').order_by('date', 'start_time')[:5])
+
+    active_groups = list(Group.objects.filter(
+        teacher=teacher,
+        is_active=True
+    ).select_related('course', 'module', 'location')[:6])
+
+    upcoming_assignments = list(Assignment.objects.filter(
+        group__teacher=teacher,
+        due_date__range=[today, upcoming_deadline]
+    ).annotate(
+        submission_count=Count('submissions')
+    ).select_related('group').order_by('due_date')[:5])
+
+    return {
+        'total_groups': total_groups,
+        'total_students': total_students,
+        'weekly_lessons': weekly_lessons,
+        'ungraded_assignments': ungraded_assignments,
+        'upcoming_lessons': upcoming_lessons,
+        'active_groups': active_groups,
+        'upcoming_assignments': upcoming_assignments,
+        'computed_at': timezone.now(),
+    }
+
+
+def get_dashboard_summary(teacher):
+    """
+    Returnează snapshot-ul dashboard-ului din cache, recalculându-l doar după invalidare.
+    Data curentă face parte din cheie, pentru că statisticile săptămânale depind de ea.
+    """
+    today = timezone.localdate()
+    key = make_key(DASHBOARD_NAMESPACE, teacher.id, today.isoformat())
+
+    summary = cache.get(key)
+    count_lookup(DASHBOARD_NAMESPACE, summary is not None)
+    if summary is None:
+        summary = build_dashboard_summary(teacher, today)
+        cache.set(key, summary, DEFAULT_TIMEOUT)
+    return summary
@@ -1,3 +1,971 @@
-from django.test import TestCase
+import csv
+import gzip
+import importlib.util
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import zoneinfo
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.db.models.signals import post_delete
+
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import StudentProfile, User
+from courses.models import Course, LessonTemplate, Location, Module
+from mathcourses import plans, query_budget
+
+from . import backups, caching, changes, exports, hot_queries
+from .analytics import STUDENT_STATS_NAMESPACE, stats_owner
+from .caching import get_generation
+from .calendar_api import get_lessons_payload
+from .models import (
+    Assignment, AssignmentSubmission, Attendance, DeletionLog, Group, GroupCodeCounter, GroupFullError, GroupStudent,
+    GroupWaitlistEntry, Lesson,
+)
+from .benchmarks import BenchmarkFixture, iter_views
+from .ics import make_feed_token, read_feed_token
+from .imports import (
+    PARALLEL_HASH_THRESHOLD, StudentImportError, hash_passwords, import_students, read_rows, validate_rows,
+)
+from .queries import ROSTER_SORTS, keyset_paginate, roster_page, with_submission_stats
+from .registers import XLSX_CONTENT_TYPE, build_attendance_matrix, iter_register_rows
+from .seeding import ScaleConfig, ScaleSeeder
+from .summaries import get_dashboard_summary
+
+
+class ViewQueryBudgetTests(query_budget.QueryBudgetTestCase):
+    """Paginile profesorului: N grupe x N elevi, lecții și teme pe ~N luni"""
+
+    def build_world(self, size):
+        seeder = ScaleSeeder(ScaleConfig(
+            locations=2,
+            teachers=1,
+            students=size * size,
+            groups_per_teacher=size,
+            max_students_per_group=size,
+            years=0.6 + size * 0.1,
+            modules_per_course=2,
+            templates_per_module=4,
+            soroban_sessions=size,
+            prefix=f'qb{size}',
+        ))
+        seeder.run()
+        return BenchmarkFixture(teacher=seeder.teachers[0])
+
+    def view_requests(self, world):
+        teacher = world.teacher
+        group_id = world.group.id
+        day = world.lesson.date
+        return [
+            ('teacher_platform:dashboard', {}, {}, teacher),
+            ('teacher_platform:teacher_profile', {}, {}, teacher),
+            ('teacher_platform:groups_list', {}, {}, teacher),
+            ('teacher_platform:group_add', {}, {}, teacher),
+            ('teacher_platform:group_detail', {'group_id': group_id}, {}, teacher),
+            ('teacher_platform:group_edit', {'group_id': group_id}, {}, teacher),
+            ('teacher_platform:waitlists', {}, {}, teacher),
+            ('teacher_platform:group_register', {'group_id': group_id}, {}, teacher),
+            ('teacher_platform:group_register_export', {'group_id': group_id}, {}, teacher),
+            ('teacher_platform:calendar', {}, {'year': day.year, 'month': day.month}, teacher),
+            ('teacher_platform:teacher_calendar_feed', {'token': make_feed_token('teacher', teacher.id)}, {}, None),
+            ('teacher_platform:group_calendar_feed', {'token': make_feed_token('group', group_id)}, {}, None),
+            ('teacher_platform:students_list', {}, {}, teacher),
+            ('teacher_platform:student_add', {}, {}, teacher),
+            ('teacher_platform:student_import', {}, {}, teacher),
+            ('teacher_platform:student_detail', {'student_id': world.student.id}, {}, teacher),
+            ('teacher_platform:student_edit', {'student_id': world.student.id}, {}, teacher),
+            ('teacher_platform:lesson_detail', {'lesson_id': world.lesson.id}, {}, teacher),
+            ('teacher_platform:lesson_create', {}, {}, teacher),
+            ('teacher_platform:lesson_create_for_group', {'group_id': group_id}, {}, teacher),
+            ('teacher_platform:lesson_edit', {'lesson_id': world.lesson.id}, {}, teacher),
+            ('teacher_platform:assignments_list', {}, {}, teacher),
+            ('teacher_platform:assignment_detail', {'assignment_id': world.assignment.id}, {}, teacher),
+            ('teacher_platform:simulators_list', {}, {}, teacher),
+            ('teacher_platform:abacus_simulator', {}, {}, teacher),
+            ('teacher_platform:flashcard_simulator', {}, {}, teacher),
+            ('teacher_platform:get_modules_for_course', {}, {'course_id': world.group.course_id}, teacher),
+            ('teacher_platform:lessons_range_api', {}, {
+                'from': day.replace(day=1).isoformat(), 'to': day.isoformat(),
+            }, teacher),
+        ]
+
+
+class PlanSnapshotTests(plans.PlanSnapshotTestCase):
+    """Planurile interogărilor critice (teacher_platform/hot_queries.py)"""
+    snapshot_path = hot_queries.SNAPSHOT_PATH
+
+    def build_world(self):
+        return hot_queries.build_world()
+
+    def hot_queries(self, world):
+        return hot_queries.hot_queries(world)
+
+
+
+class BenchmarkFixtureTests(TestCase):
+    """Parametrii URL-urilor pentru un profesor fără grupe"""
+
+    def test_teacher_without_groups(self):
+        teacher = User.objects.create_user('prof', password='x', role='teacher')
+        fixture = BenchmarkFixture(teacher=teacher)
+        self.assertIsNone(fixture.group)
+        self.assertIsNone(fixture.kwargs_for('teacher_platform:group_calendar_feed')[0]['token'])
+        token = fixture.kwargs_for('teacher_platform:teacher_calendar_feed')[0]['token']
+        self.assertEqual(read_feed_token(token, 'teacher'), teacher.id)
+
+        urls = {name: url for name, url, _, _ in iter_views(fixture)}
+        self.assertIsNone(urls['teacher_platform:group_calendar_feed'])
+        self.assertIsNone(urls['teacher_platform:group_detail'])
+        self.assertIsNotNone(urls['teacher_platform:teacher_calendar_feed'])
+
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def build_teacher_world(prefix='t', max_students=2, students=3):
+    """Profesor, curs cu modul și șablon, o grupă cu o lecție și câțiva elevi neînscriși"""
+    teacher = User.objects.create_user(f'{prefix}-prof', password='x', role='teacher')
+    course = Course.objects.create(
+        title=f'{prefix} Curs', slug=f'{prefix}-curs', description='Descriere',
+        price=250, frequency='Săptămânal', group_size=10,
+    )
+    module = Module.objects.create(course=course, name='Modul A')
+    template = LessonTemplate.objects.create(module=module, name='Adunări')
+    group = Group.objects.create(
+        name=f'{prefix} Grupa', teacher=teacher, course=course, module=module,
+        weekday=0, start_time=time(10), start_date=date(2026, 1, 5), max_students=max_students,
+    )
+    lesson = Lesson.objects.create(group=group, lesson_template=template, date=date(2026, 1, 5), start_time=time(10))
+    pupils = [User.objects.create_user(f'{prefix}-elev{i}', password='x', role='student') for i in range(students)]
+    return SimpleNamespace(
+        teacher=teacher, course=course, module=module, template=template,
+        group=group, lesson=lesson, students=pupils,
+    )
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CalendarCacheTests(TestCase):
+    """Payload-ul lunar din cache și invalidarea lui"""
+
+    def setUp(self):
+        cache.clear()
+        self.world = build_teacher_world()
+        self.month = (date(2026, 1, 1), date(2026, 1, 31))
+
+    def titles(self):
+        return [(lesson['title'], lesson['module']) for lesson in get_lessons_payload(self.world.teacher, *self.month)]
+
+    def test_payload_is_served_from_cache(self):
+        self.assertEqual(self.titles(), [('Adunări', 'Modul A')])
+        with self.assertNumQueries(0):
+            self.titles()
+
+    def test_lesson_change_invalidates(self):
+        self.titles()
+        with self.captureOnCommitCallbacks(execute=True):
+            Lesson.objects.create(group=self.world.group, topic='Recapitulare', date=date(2026, 1, 12), start_time=time(10))
+        self.assertEqual(len(self.titles()), 2)
+
+    def test_module_and_template_changes_invalidate(self):
+        self.titles()
+        self.world.module.name = 'Modul B'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.world.module.save()
+        self.assertEqual(self.titles(), [('Adunări', 'Modul B')])
+        self.world.template.name = 'Scăderi'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.world.template.save()
+        self.assertEqual(self.titles(), [('Scăderi', 'Modul B')])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.world.template.delete()
+        self.assertEqual(self.titles(), [('', 'Modul B')])
+
+    def test_calendar_page_uses_payload(self):
+        self.client.force_login(self.world.teacher)
+        url = reverse('teacher_platform:calendar')
+        lesson_url = reverse('teacher_platform:lesson_detail', args=[self.world.lesson.id])
+        for view in ('calendar', 'list'):
+            response = self.client.get(url, {'year': 2026, 'month': 1, 'view': view})
+            self.assertContains(response, lesson_url)
+        self.world.template.name = 'Scăderi'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.world.template.save()
+        self.assertContains(self.client.get(url, {'year': 2026, 'month': 1, 'view': 'list'}), 'Scăderi')
+
+
+class ModulesForCourseTests(TestCase):
+    """Endpoint-ul AJAX cu modulele unui curs, în ordinea din curs"""
+
+    def test_modules(self):
+        world = build_teacher_world()
+        world.module.order = 1
+        world.module.save()
+        Module.objects.create(course=world.course, name='Modul 0', order=0)
+        Module.objects.create(course=world.course, name='Inactiv', order=2, is_active=False)
+        self.client.force_login(world.teacher)
+        url = reverse('teacher_platform:get_modules_for_course')
+        response = self.client.get(url, {'course_id': world.course.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([module['title'] for module in response.json()], ['Modul 0', 'Modul A'])
+        self.assertEqual(self.client.get(url).json(), [])
+
+
+class SeatAccountingTests(TestCase):
+    """Group.active_student_count urmează înscrierile active"""
+
+    def setUp(self):
+        self.world = build_teacher_world(max_students=2, students=3)
+        self.group = self.world.group
+        self.other = Group.objects.create(
+            name='t Grupa 2', teacher=self.world.teacher, course=self.world.course,
+            weekday=2, start_time=time(12), start_date=date(2026, 1, 7), max_students=1,
+        )
+
+    def seats(self, group=None):
+        return Group.objects.get(pk=(group or self.group).pk).active_student_count
+
+    def enroll(self, student, group=None):
+        return GroupStudent.objects.create(group=group or self.group, student=student)
+
+    def test_activate_deactivate_delete(self):
+        first = self.enroll(self.world.students[0])
+        self.enroll(self.world.students[1])
+        self.assertEqual(self.seats(), 2)
+        with self.assertRaises(GroupFullError):
+            self.enroll(self.world.students[2])
+        self.assertEqual(self.seats(), 2)
+
+        first.is_active = False
+        first.save()
+        self.assertEqual(self.seats(), 1)
+        first.save()
+        self.assertEqual(self.seats(), 1)
+        first.is_active = True
+        first.save()
+        self.assertEqual(self.seats(), 2)
+
+        first.delete()
+        self.assertEqual(self.seats(), 1)
+
+    def test_group_move(self):
+        enrollment = self.enroll(self.world.students[0])
+        enrollment = GroupStudent.objects.get(pk=enrollment.pk)
+        enrollment.group = self.other
+        enrollment.save()
+        self.assertEqual((self.seats(), self.seats(self.other)), (0, 1))
+
+        # Grupa țintă e plină: nimic nu se schimbă
+        blocked = self.enroll(self.world.students[1])
+        blocked.group = Group.objects.get(pk=self.other.pk)
+        with self.assertRaises(GroupFullError):
+            blocked.save()
+        self.assertEqual((self.seats(), self.seats(self.other)), (1, 1))
+        with self.assertRaises(ValidationError):
+            blocked.full_clean()
+
+    def test_admin_inline_over_capacity_is_a_form_error(self):
+        admin_user = User.objects.create_superuser('t-admin', password='x')
+        self.client.force_login(admin_user)
+        group = self.group
+        data = {
+            'name': group.name, 'teacher': group.teacher_id, 'course': group.course_id,
+            'module': group.module_id, 'weekday': group.weekday, 'start_time': '10:00',
+            'duration_minutes': group.duration_minutes, 'start_date': '2026-01-05',
+            'max_students': group.max_students, 'created_date': '2026-01-01', 'is_active': 'on',
+            'students-TOTAL_FORMS': 3, 'students-INITIAL_FORMS': 0,
+            'students-MIN_NUM_FORMS': 0, 'students-MAX_NUM_FORMS': 1000,
+        }
+        for index, student in enumerate(self.world.students):
+            data.update({
+                f'students-{index}-student': student.pk, f'students-{index}-is_active': 'on',
+                f'students-{index}-lessons_attended': 0, f'students-{index}-lessons_missed': 0,
+            })
+        response = self.client.post(reverse('admin:teacher_platform_group_change', args=[group.pk]), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Grupa are doar 2 locuri.')
+        self.assertEqual((GroupStudent.objects.count(), self.seats()), (0, 0))
+
+
+class WaitlistPromotionTests(TestCase):
+    """Locurile eliberate trec la elevii din coadă, în ordinea cererii"""
+
+    def setUp(self):
+        self.world = build_teacher_world(max_students=1, students=4)
+        self.group = self.world.group
+        self.holder, *self.queue = self.world.students
+        self.seat = GroupStudent.objects.create(group=self.group, student=self.holder)
+        start = timezone.now()
+        for index, student in enumerate(reversed(self.queue)):
+            # Cererile sunt create în ordine inversă: ordinea vine din requested_at
+            GroupWaitlistEntry.objects.create(
+                group=self.group, student=student, requested_at=start - timedelta(minutes=index)
+            )
+
+    def active(self):
+        return list(GroupStudent.objects.filter(group=self.group, is_active=True).values_list('student_id', flat=True))
+
+    def waiting(self):
+        return list(GroupWaitlistEntry.objects.filter(group=self.group).values_list('student_id', flat=True))
+
+    def test_promote_next_order(self):
+        self.assertEqual(self.waiting(), [student.id for student in self.queue])
+        self.assertIsNone(GroupWaitlistEntry.promote_next(self.group.id))  # grupa e plină
+
+        self.seat.is_active = False
+        self.seat.save()
+        self.assertEqual(self.seat.promoted_enrollment.student_id, self.queue[0].id)
+        self.assertEqual(self.active(), [self.queue[0].id])
+        self.assertEqual(self.waiting(), [self.queue[1].id, self.queue[2].id])
+
+    def test_delete_promotes_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.seat.delete()
+        self.assertEqual(self.active(), [self.queue[0].id])
+        self.assertEqual(Group.objects.get(pk=self.group.pk).active_student_count, 1)
+
+    def test_group_delete_with_waitlist(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.delete()
+        self.assertFalse(GroupStudent.objects.exists())
+        self.assertFalse(GroupWaitlistEntry.objects.exists())
+
+    def test_raising_capacity_fills_seats(self):
+        group = Group.objects.get(pk=self.group.pk)
+        group.max_students = 3
+        group.save()
+        self.assertEqual([enrollment.student_id for enrollment in group.promoted_enrollments],
+                         [self.queue[0].id, self.queue[1].id])
+        self.assertEqual(self.waiting(), [self.queue[2].id])
+        self.assertEqual(Group.objects.get(pk=self.group.pk).active_student_count, 3)
+
+    def test_waitlist_add_reports_the_promoted_student(self):
+        self.seat.delete()
+        GroupWaitlistEntry.objects.filter(student=self.queue[0]).delete()
+        newcomer = User.objects.create_user('t-nou', password='x', role='student', first_name='Nou', last_name='Elev')
+        StudentProfile.objects.create(user=newcomer, teacher=self.world.teacher)
+        self.client.force_login(self.world.teacher)
+        response = self.client.post(
+            reverse('teacher_platform:group_waitlist_add', args=[self.group.id]),
+            {'student': newcomer.id}, follow=True,
+        )
+        # Înaintea noului elev mai sunt doi în coadă: primul dintre ei primește locul
+        self.assertEqual(self.active(), [self.queue[1].id])
+        self.assertEqual(self.waiting(), [self.queue[2].id, newcomer.id])
+        self.assertContains(response, 'Nou Elev a fost adăugat în lista de așteptare.')
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CalendarFeedTests(TestCase):
+    """Tokenurile feed-ului .ics și GET-ul condițional"""
+
+    def setUp(self):
+        cache.clear()
+        self.world = build_teacher_world()
+        self.location = Location.objects.create(name='Sala 1', address='Str. Exemplu 1')
+        self.world.group.location = self.location
+        self.world.group.save()
+        self.url = reverse('teacher_platform:teacher_calendar_feed', args=[make_feed_token('teacher', self.world.teacher.id)])
+
+    def test_tokens(self):
+        token = make_feed_token('group', self.world.group.id)
+        self.assertEqual(read_feed_token(token, 'group'), self.world.group.id)
+        self.assertIsNone(read_feed_token(token, 'teacher'))
+        self.assertIsNone(read_feed_token(token[:-1] + ('A' if token[-1] != 'A' else 'B'), 'group'))
+        self.assertEqual(self.client.get(reverse('teacher_platform:group_calendar_feed', args=['group-1:x'])).status_code, 404)
+
+    def etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        body = b''.join(response.streaming_content).decode()
+        return response['ETag'], body
+
+    def assertChanged(self, etag):
+        """ETag-ul vechi nu mai produce 304"""
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_not_modified(self):
+        etag, body = self.etag()
+        self.assertIn('SUMMARY:t Grupa - Adunări', body)
+        self.assertIn('LOCATION:Sala 1', body)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_related_changes_change_etag(self):
+        for obj, value in [(self.world.template, 'Scăderi'), (self.location, 'Sala 2'), (self.world.group, 'Grupa nouă')]:
+            etag, _ = self.etag()
+            obj.name = value
+            with self.captureOnCommitCallbacks(execute=True):
+                obj.save()
+            self.assertChanged(etag)
+
+        etag, _ = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.world.lesson.delete()
+        self.assertChanged(etag)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class StudentImportTests(TestCase):
+    """Importul CSV: username-uri, locuri în grupă, erori și cursa pe username"""
+
+    def setUp(self):
+        self.world = build_teacher_world(max_students=3, students=0)
+
+    def rows(self, *names):
+        csv_file = SimpleUploadedFile('elevi.csv', ('Prenume;Nume\n' + ''.join(f'{first};{last}\n' for first, last in names)).encode())
+        return read_rows(csv_file)
+
+    def test_usernames_seats_and_passwords(self):
+        User.objects.create_user('ana.pop', password='x', role='student')
+        users, errors = import_students(self.rows(('Ana', 'Pop'), ('Ana', 'Pop'), ('Ion', 'Ștefan')), self.world.teacher, self.world.group)
+        self.assertEqual(errors, [])
+        self.assertEqual([user.username for user in users], ['ana.pop2', 'ana.pop3', 'ion.stefan'])
+        self.assertTrue(User.objects.get(username='ion.stefan').check_password('ion.stefan'))
+        self.assertEqual(Group.objects.get(pk=self.world.group.pk).active_student_count, 3)
+
+        with self.assertRaises(StudentImportError):
+            import_students(self.rows(('Dan', 'Ilie')), self.world.teacher, self.world.group)
+        self.assertFalse(User.objects.filter(username='dan.ilie').exists())
+
+    def test_row_errors_import_nothing(self):
+        users, errors = import_students(self.rows(('Ana', 'Pop'), ('', 'Fără Prenume')), self.world.teacher)
+        self.assertEqual(users, [])
+        self.assertEqual([row for row, _ in errors], [3])
+        self.assertFalse(User.objects.filter(role='student').exists())
+
+    def test_threaded_hashes(self):
+        passwords = [f'parola{i}' for i in range(PARALLEL_HASH_THRESHOLD + 2)]
+        hashes = hash_passwords(passwords, max_workers=3)
+        self.assertTrue(all(check_password(password, hashed) for password, hashed in zip(passwords, hashes)))
+
+    def test_username_taken_concurrently_is_retried(self):
+        original = validate_rows
+        calls = []
+
+        def validate_then_steal(rows):
+            cleaned_rows, errors = original(rows)
+            if not calls:
+                # Alt cont primește username-ul între validare și inserare
+                User.objects.create_user(cleaned_rows[0]['username'], password='x', role='student')
+            calls.append(1)
+            return cleaned_rows, errors
+
+        with mock.patch('teacher_platform.imports.validate_rows', validate_then_steal):
+            users, errors = import_students(self.rows(('Ana', 'Pop')), self.world.teacher, self.world.group)
+        self.assertEqual((len(calls), errors), (2, []))
+        self.assertEqual([user.username for user in users], ['ana.pop2'])
+        self.assertEqual(Group.objects.get(pk=self.world.group.pk).active_student_count, 1)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class StatsInvalidationTests(TestCase):
+    """Statisticile elevului sunt invalidate fără interogări pentru profesor"""
+
+    def setUp(self):
+        cache.clear()
+        self.world = build_teacher_world(students=1)
+        self.student = self.world.students[0]
+        GroupStudent.objects.create(group=self.world.group, student=self.student)
+
+    def generation(self):
+        return get_generation(STUDENT_STATS_NAMESPACE, stats_owner(self.world.teacher.id, self.student.id))
+
+    def test_loaded_relations_are_used(self):
+        lesson = Lesson.objects.select_related('group').get(pk=self.world.lesson.pk)
+        before = self.generation()
+        with self.assertNumQueries(1), self.captureOnCommitCallbacks(execute=True):  # doar INSERT-ul
+            lesson.attendances.create(student=self.student, is_present=True)
+        self.assertNotEqual(self.generation(), before)
+
+    def test_cascade_bumps_once_per_generation(self):
+        second = Lesson.objects.create(group=self.world.group, date=date(2026, 1, 12), start_time=time(10))
+        for lesson in (self.world.lesson, second):
+            lesson.attendances.create(student=self.student, is_present=True)
+        before = self.generation()
+        with mock.patch('teacher_platform.caching.bump_generation', wraps=caching.bump_generation) as bump:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.world.group.delete()
+                # Nimic nu se scrie în cache înainte de commit
+                self.assertEqual((bump.call_count, self.generation()), (0, before))
+        bumped = [call.args for call in bump.call_args_list]
+        self.assertEqual(len(bumped), len(set(bumped)))
+        self.assertIn((STUDENT_STATS_NAMESPACE, stats_owner(self.world.teacher.id, self.student.id)), bumped)
+        self.assertNotEqual(self.generation(), before)
+
+    def test_mark_attendance(self):
+        self.client.force_login(self.world.teacher)
+        url = reverse('teacher_platform:mark_attendance', args=[self.world.lesson.id])
+        for is_present in ('true', 'false'):
+            before = self.generation()
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(url, {'student_id': self.student.id, 'is_present': is_present})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(self.generation(), before)
+        enrollment = GroupStudent.objects.get(student=self.student)
+        self.assertEqual((enrollment.lessons_attended, enrollment.lessons_missed), (0, 1))
+        outsider = User.objects.create_user('t-strain', password='x', role='student')
+        self.assertEqual(self.client.post(url, {'student_id': outsider.id, 'is_present': 'true'}).status_code, 400)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class BackupRestoreTests(TestCase):
+    """Backup -> restore --replace păstrează rândurile, datele de creare și locurile"""
+
+    def setUp(self):
+        seeder = ScaleSeeder(ScaleConfig(
+            locations=1, teachers=1, students=6, groups_per_teacher=2, max_students_per_group=3,
+            years=0.3, modules_per_course=1, templates_per_module=3, soroban_sessions=0, prefix='bk',
+        ))
+        seeder.run()
+        self.teacher = seeder.teachers[0]
+        self.path = os.path.join(tempfile.mkdtemp(), 'backup.zip')
+        self.addCleanup(shutil.rmtree, os.path.dirname(self.path))
+
+    def snapshot(self):
+        querysets = backups.teacher_querysets(self.teacher)
+        counts = {name: queryset.count() for name, queryset in querysets.items()}
+        enrolled = sorted(querysets['group_students'].values_list('student__username', 'enrolled_date'))
+        seats = sorted(querysets['groups'].values_list('code', 'active_student_count'))
+        return counts, enrolled, seats
+
+    def test_round_trip(self):
+        before = self.snapshot()
+        self.assertTrue(before[0]['group_students'] and before[0]['attendance'], before[0])
+        manifest = backups.write_backup(self.teacher, self.path)
+        self.assertEqual({name: table['rows'] for name, table in manifest['tables'].items()}, before[0])
+
+        old_lessons = set(Lesson.objects.filter(group__teacher=self.teacher).values_list('id', flat=True))
+        teacher, counts, skipped = backups.restore_backup(self.path, replace=True)
+        self.assertEqual(teacher, self.teacher)
+        self.assertEqual(skipped, {})
+        self.assertEqual(self.snapshot(), before)
+
+        # Ștergerea grupelor vechi trece prin semnale: tombstone pentru fiecare lecție
+        tombstones = set(DeletionLog.objects.filter(model_label='teacher_platform.lesson').values_list('object_id', flat=True))
+        self.assertEqual(tombstones, old_lessons)
+
+    def test_purge_is_set_based(self):
+        querysets = {model: model.objects.filter(**{lookup: self.teacher})
+                     for model, lookup in backups.PURGE_LOOKUPS.items()}
+        expected = {model._meta.label_lower: set(queryset.values_list('id', flat=True))
+                    for model, queryset in querysets.items() if model in changes.TRACKED_MODELS}
+        self.assertTrue(expected['teacher_platform.attendance'] and expected['teacher_platform.lesson'])
+        owner = stats_owner(self.teacher.id, querysets[Attendance][0].student_id)
+        before = get_generation(STUDENT_STATS_NAMESPACE, owner)
+
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                backups.purge_teacher_groups(self.teacher)
+        # Numărul de interogări nu depinde de numărul de rânduri șterse
+        self.assertLess(len(queries), 40)
+
+        self.assertFalse(any(queryset.exists() for queryset in querysets.values()))
+        for label, ids in expected.items():
+            self.assertEqual(set(DeletionLog.objects.filter(model_label=label).values_list('object_id', flat=True)), ids)
+        self.assertNotEqual(get_generation(STUDENT_STATS_NAMESPACE, owner), before)
+        self.assertTrue(post_delete.has_listeners(Attendance))
+
+    def test_bulk_create_keeping_dates(self):
+        group = Group.objects.filter(teacher=self.teacher).first()
+        past = datetime(2024, 5, 1, 8, tzinfo=zoneinfo.ZoneInfo('UTC'))
+        with CaptureQueriesContext(connection) as queries:
+            kept, stamped = backups.bulk_create_keeping_dates(Lesson, [
+                Lesson(group=group, date=date(2024, 5, 6), start_time=time(10), created_at=past),
+                Lesson(group=group, date=date(2024, 5, 13), start_time=time(10)),
+            ])
+        self.assertEqual(len(queries), 1)  # doar INSERT-ul, fără UPDATE după
+        self.assertEqual(Lesson.objects.get(pk=kept.pk).created_at, past)
+        self.assertGreater(Lesson.objects.get(pk=stamped.pk).created_at, past)
+        self.assertTrue(Lesson._meta.get_field('created_at').auto_now_add)
+
+    def test_restore_refuses_existing_groups(self):
+        backups.write_backup(self.teacher, self.path)
+        with self.assertRaises(backups.BackupError):
+            backups.restore_backup(self.path)
+
+
+class AssignmentQueriesTests(TestCase):
+    """Temele: întârzierile în ora locală și paginarea keyset"""
+
+    def setUp(self):
+        self.world = build_teacher_world(students=2)
+
+    def test_late_count_matches_is_late(self):
+        assignment = Assignment.objects.create(
+            group=self.world.group, title='Tema 1', description='-', due_date=date(2026, 3, 10)
+        )
+        bucharest = zoneinfo.ZoneInfo('Europe/Bucharest')
+        # 23:30 în ziua termenului (21:30 UTC) și 00:30 în ziua următoare (22:30 UTC, tot 10 martie în UTC)
+        moments = [datetime(2026, 3, 10, 23, 30, tzinfo=bucharest), datetime(2026, 3, 11, 0, 30, tzinfo=bucharest)]
+        for student, moment in zip(self.world.students, moments):
+            submission = AssignmentSubmission.objects.create(assignment=assignment, student=student)
+            AssignmentSubmission.objects.filter(pk=submission.pk).update(submitted_at=moment)
+
+        submissions = AssignmentSubmission.objects.select_related('assignment').order_by('submitted_at')
+        self.assertEqual([submission.is_late() for submission in submissions], [False, True])
+        self.assertEqual(with_submission_stats(Assignment.objects.all()).get().late_count, 1)
+
+    def test_keyset_pages_are_stable(self):
+        # Multe teme cu același termen: ordinea se decide pe id
+        Assignment.objects.bulk_create([
+            Assignment(group=self.world.group, title=f'Tema {i}', description='-', due_date=date(2026, 3, 1 + i % 3))
+            for i in range(11)
+        ])
+        ordering = [('due_date', True), ('id', False)]
+        expected = list(Assignment.objects.order_by('-due_date', 'id').values_list('id', flat=True))
+
+        seen, cursor = [], None
+        while True:
+            items, cursor = keyset_paginate(Assignment.objects.all(), ordering, cursor=cursor, page_size=4)
+            seen += [item.id for item in items]
+            if cursor is None:
+                break
+            # O temă nouă care s-ar sorta pe o pagină deja citită nu mută restul paginilor
+            Assignment.objects.create(group=self.world.group, title='Nouă', description='-', due_date=date(2026, 3, 9))
+        self.assertEqual(seen, expected)
+
+        first_page, _ = keyset_paginate(Assignment.objects.all(), ordering, cursor='nu-e-cursor', page_size=4)
+        self.assertEqual(len(first_page), 4)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class DashboardSummaryTests(TestCase):
+    """Snapshot-ul dashboard-ului este servit din cache și recalculat după modificări"""
+
+    def setUp(self):
+        cache.clear()
+        self.world = build_teacher_world(max_students=3, students=2)
+        self.teacher = self.world.teacher
+
+    def test_cached_until_invalidated(self):
+        summary = get_dashboard_summary(self.teacher)
+        self.assertEqual((summary['total_groups'], summary['total_students']), (1, 0))
+        with self.assertNumQueries(0):
+            get_dashboard_summary(self.teacher)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            enrollment = GroupStudent.objects.create(group=self.world.group, student=self.world.students[0])
+        self.assertEqual(get_dashboard_summary(self.teacher)['total_students'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment = Assignment.objects.create(
+                group=self.world.group, title='Tema', description='-', due_date=timezone.localdate()
+            )
+            submission = AssignmentSubmission.objects.create(assignment=assignment, student=enrollment.student)
+        summary = get_dashboard_summary(self.teacher)
+        self.assertEqual((len(summary['upcoming_assignments']), summary['ungraded_assignments']), (1, 1))
+        submission.is_graded = True
+        with self.captureOnCommitCallbacks(execute=True):
+            submission.save()
+        self.assertEqual(get_dashboard_summary(self.teacher)['ungraded_assignments'], 0)
+
+    def test_catalog_changes_invalidate(self):
+        location = Location.objects.create(name='Sala 1', address='-')
+        self.world.group.location = location
+        self.world.group.save()
+        self.assertEqual(get_dashboard_summary(self.teacher)['active_groups'][0].location.name, 'Sala 1')
+        location.name = 'Sala 2'
+        self.world.course.title = 'Curs nou'
+        with self.captureOnCommitCallbacks(execute=True):
+            location.save()
+            self.world.course.save()
+        group = get_dashboard_summary(self.teacher)['active_groups'][0]
+        self.assertEqual((group.location.name, group.course.title), ('Sala 2', 'Curs nou'))
+
+
+class RosterPageTests(TestCase):
+    """Lista de elevi: un rând per înscriere activă, paginată stabil"""
+
+    def setUp(self):
+        self.world = build_teacher_world(max_students=10, students=7)
+        self.other = Group.objects.create(
+            name='t Grupa 2', teacher=self.world.teacher, course=self.world.course,
+            weekday=2, start_time=time(12), start_date=date(2026, 1, 7),
+        )
+        for student in self.world.students:
+            # Nume identice: ordinea se decide pe id și pe înscriere
+            student.first_name, student.last_name = 'Ana', 'Pop'
+            student.save()
+        for student in self.world.students[:5]:
+            GroupStudent.objects.create(group=self.world.group, student=student)
+        GroupStudent.objects.create(group=self.other, student=self.world.students[0])
+        StudentProfile.objects.create(user=self.world.students[6], teacher=self.world.teacher)
+
+    def read_all(self, **kwargs):
+        rows, cursor, total = roster_page(self.world.teacher, page_size=3, **kwargs)
+        while cursor is not None:
+            page, cursor, _ = roster_page(self.world.teacher, cursor=cursor, page_size=3, **kwargs)
+            rows += page
+        return rows, total
+
+    def test_pages_cover_every_enrolment_once(self):
+        for sort in ROSTER_SORTS:
+            rows, total = self.read_all(sort=sort)
+            keys = [(row['id'], row['enrollment_id']) for row in rows]
+            self.assertEqual(len(keys), len(set(keys)), sort)
+            self.assertEqual(len(rows), total, sort)
+            # 6 înscrieri active + elevul fără grupă (profil creat de profesor)
+            self.assertEqual(total, 7, sort)
+
+        rows, _ = self.read_all(sort='name')
+        self.assertEqual(sorted(row['group_name'] for row in rows if row['id'] == self.world.students[0].id),
+                         ['t Grupa', 't Grupa 2'])
+        self.assertIn((self.world.students[6].id, ''), [(row['id'], row['group_name']) for row in rows])
+
+    def test_group_filter(self):
+        rows, total = self.read_all(group_id=self.other.id)
+        self.assertEqual(([row['id'] for row in rows], total), ([self.world.students[0].id], 1))
+
+
+class GroupCodeTests(TestCase):
+    """Codurile grupelor vin din contorul per (curs, modul)"""
+
+    def setUp(self):
+        self.world = build_teacher_world(students=0)
+
+    def new_group(self, module=None):
+        return Group(
+            name='Grupa', teacher=self.world.teacher, course=self.world.course, module=module or self.world.module,
+            weekday=0, start_time=time(10), start_date=date(2026, 1, 5),
+        )
+
+    def test_sequential_and_never_reused(self):
+        prefix = self.world.group.code_prefix()
+        self.assertEqual(self.world.group.code, f'{prefix}-001')
+        second = self.new_group()
+        second.save()
+        self.assertEqual(second.code, f'{prefix}-002')
+        second.delete()
+        third = self.new_group()
+        third.save()
+        self.assertEqual(third.code, f'{prefix}-003')
+        third.name = 'Redenumită'
+        third.save()
+        self.assertEqual(Group.objects.get(pk=third.pk).code, f'{prefix}-003')
+
+    def test_bulk_allocation(self):
+        other_module = Module.objects.create(course=self.world.course, name='Modul B', order=2)
+        groups = [self.new_group(), self.new_group(module=other_module), self.new_group()]
+        with transaction.atomic():
+            Group.assign_codes(groups)
+        prefix = self.world.group.code_prefix()
+        self.assertEqual(
+            [group.code for group in groups],
+            [f'{prefix}-002', f'{groups[1].code_prefix()}-001', f'{prefix}-003'],
+        )
+        self.assertEqual(GroupCodeCounter.objects.get(prefix=prefix).last_number, 3)
+
+
+class GroupRegisterTests(TestCase):
+    """Catalogul: matricea paginii și exportul CSV conțin aceleași celule"""
+
+    def setUp(self):
+        self.world = build_teacher_world(students=3)
+        for student, (first_name, last_name) in zip(self.world.students, [('Ana', 'Pop'), ('Dan', 'Ene'), ('Ion', 'Zaharia')]):
+            student.first_name, student.last_name = first_name, last_name
+            student.save()
+        first, second, former = self.world.students
+        GroupStudent.objects.create(group=self.world.group, student=first)
+        GroupStudent.objects.create(group=self.world.group, student=second)
+        self.later = Lesson.objects.create(
+            group=self.world.group, lesson_template=self.world.template, date=date(2026, 1, 12), start_time=time(10),
+        )
+        Attendance.objects.create(lesson=self.world.lesson, student=first, is_present=True, performance_rating=5)
+        Attendance.objects.create(lesson=self.later, student=first, is_present=False)
+        Attendance.objects.create(lesson=self.world.lesson, student=second, is_present=True)
+        # Fost elev, neînscris: apare doar pentru că are prezențe în perioadă
+        Attendance.objects.create(lesson=self.later, student=former, is_present=True, performance_rating=3)
+
+    def test_matrix(self):
+        matrix = build_attendance_matrix(self.world.group)
+        self.assertEqual([lesson_id for lesson_id, _, _ in matrix['lessons']], [self.world.lesson.id, self.later.id])
+        self.assertEqual(
+            [(row['name'], row['cells'], row['present'], row['absent'], row['attendance_rate']) for row in matrix['rows']],
+            [
+                ('Dan Ene', [(True, None), None], 1, 0, 100.0),
+                ('Ana Pop', [(True, 5), (False, None)], 1, 1, 50.0),
+                ('Ion Zaharia', [None, (True, 3)], 1, 0, 100.0),
+            ],
+        )
+
+        filtered = build_attendance_matrix(self.world.group, date_to=date(2026, 1, 5))
+        self.assertEqual([row['name'] for row in filtered['rows']], ['Dan Ene', 'Ana Pop'])
+
+    def test_csv_export(self):
+        self.client.force_login(self.world.teacher)
+        response = self.client.get(reverse('teacher_platform:group_register_export', args=[self.world.group.id]))
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertTrue(content.startswith('\ufeff'))
+        rows = list(csv.reader(io.StringIO(content.lstrip('\ufeff'))))
+        self.assertEqual(rows, [
+            ['Elev', '05.01.2026', '12.01.2026', 'Prezențe', 'Absențe', 'Rată Prezență (%)'],
+            ['Dan Ene', 'P', '', '1', '0', '100.0'],
+            ['Ana Pop', 'P 5', 'A', '1', '1', '50.0'],
+            ['Ion Zaharia', '', 'P 3', '1', '0', '100.0'],
+        ])
+
+    def test_lesson_added_during_export_is_skipped(self):
+        rows = iter_register_rows(self.world.group)
+        header = next(rows)
+        # Lecție nouă între citirea coloanelor și citirea prezențelor
+        added = Lesson.objects.create(group=self.world.group, date=date(2026, 1, 8), start_time=time(10))
+        Attendance.objects.create(lesson=added, student=self.world.students[0], is_present=True)
+        self.assertEqual(len(header), 6)
+        self.assertEqual([row[:3] for row in rows], [
+            ['Dan Ene', 'P', ''],
+            ['Ana Pop', 'P 5', 'A'],
+            ['Ion Zaharia', '', 'P 3'],
+        ])
+
+    @skipUnless(importlib.util.find_spec('openpyxl'), 'openpyxl nu este instalat')
+    def test_xlsx_export(self):
+        from openpyxl import load_workbook
+
+        self.client.force_login(self.world.teacher)
+        url = reverse('teacher_platform:group_register_export', args=[self.world.group.id])
+        response = self.client.get(url, {'format': 'xlsx'})
+        self.assertEqual(response['Content-Type'], XLSX_CONTENT_TYPE)
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        self.assertEqual([list(row) for row in workbook['Catalog'].iter_rows(values_only=True)], [
+            ['Elev', '05.01.2026', '12.01.2026', 'Prezențe', 'Absențe', 'Rată Prezență (%)'],
+            ['Dan Ene', 'P', None, 1, 0, 100],
+            ['Ana Pop', 'P 5', 'A', 1, 1, 50],
+            ['Ion Zaharia', None, 'P 3', 1, 0, 100],
+        ])
+
+    def test_xlsx_without_openpyxl(self):
+        self.client.force_login(self.world.teacher)
+        url = reverse('teacher_platform:group_register_export', args=[self.world.group.id])
+        with mock.patch.dict(sys.modules, {'openpyxl': None}):
+            response = self.client.get(url, {'format': 'xlsx'})
+        self.assertRedirects(response, reverse('teacher_platform:group_register', args=[self.world.group.id]),
+                             fetch_redirect_response=False)
+
+    def test_other_teacher_gets_404(self):
+        other = User.objects.create_user('alt-prof', password='x', role='teacher')
+        self.client.force_login(other)
+        response = self.client.get(reverse('teacher_platform:group_register', args=[self.world.group.id]))
+        self.assertEqual(response.status_code, 404)
+
+
+class DataExportTests(TestCase):
+    """Exporturile complete: loturi keyset, CSV, JSONL.gz, acțiunea din admin și comanda"""
+
+    def setUp(self):
+        self.world = build_teacher_world(students=5)
+        for index, student in enumerate(self.world.students):
+            Attendance.objects.create(lesson=self.world.lesson, student=student, is_present=index % 2 == 0)
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+
+    def test_batches_cover_every_row_once(self):
+        _, columns = exports.get_export('attendance')
+        batches = list(exports.iter_batches(Attendance.objects.all(), columns, batch_size=2))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        ids = [row[0] for batch in batches for row in batch]
+        self.assertEqual(ids, sorted(Attendance.objects.values_list('id', flat=True)))
+
+    def test_csv_and_jsonl_files(self):
+        _, columns = exports.get_export('attendance')
+        csv_path = os.path.join(self.output_dir, 'attendance.csv')
+        self.assertEqual(exports.write_export('attendance', 'csv', csv_path, batch_size=2), 5)
+        with open(csv_path, encoding='utf-8', newline='') as handle:
+            rows = list(csv.reader(handle))
+        self.assertEqual(rows[0], columns)
+        self.assertEqual(len(rows), 6)
+
+        jsonl_path = os.path.join(self.output_dir, 'attendance.jsonl.gz')
+        self.assertEqual(exports.write_export('attendance', 'jsonl', jsonl_path, batch_size=2), 5)
+        with gzip.open(jsonl_path, 'rt', encoding='utf-8') as handle:
+            records = [json.loads(line) for line in handle]
+        self.assertEqual([record['student__username'] for record in records], [s.username for s in self.world.students])
+        self.assertEqual({record['lesson__date'] for record in records}, {'2026-01-05'})
+
+    def test_admin_action_exports_selection(self):
+        selection = Attendance.objects.filter(is_present=True)
+        response = exports.export_as_jsonl(None, None, selection)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode('utf-8').splitlines()
+        self.assertEqual(sorted(json.loads(line)['id'] for line in lines), sorted(selection.values_list('id', flat=True)))
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('export_data', 'groups', 'attendance', output_dir=self.output_dir, stdout=out)
+        self.assertIn('groups: 1 rânduri', out.getvalue())
+        self.assertIn('attendance: 5 rânduri', out.getvalue())
+        self.assertEqual(len(os.listdir(self.output_dir)), 2)
+        with self.assertRaises(CommandError):
+            call_command('export_data', 'nimic', output_dir=self.output_dir, stdout=out)
+
+
+class ChangeExportTests(TestCase):
+    """Exportul incremental: watermark, partiții pe zile și tombstone-uri"""
+
+    def setUp(self):
+        self.world = build_teacher_world(students=0)
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+        self.second = Lesson.objects.create(
+            group=self.world.group, lesson_template=self.world.template, date=date(2026, 1, 12), start_time=time(10),
+        )
+        # Două modificări în zile (UTC) diferite
+        self.first_day = datetime(2026, 3, 1, 23, 30, tzinfo=zoneinfo.ZoneInfo('UTC'))
+        Lesson.objects.filter(pk=self.world.lesson.pk).update(updated_at=self.first_day)
+        Lesson.objects.filter(pk=self.second.pk).update(updated_at=self.first_day + timedelta(hours=1))
+
+    def read_feed(self, paths):
+        records = []
+        for path in paths:
+            with gzip.open(path, 'rt', encoding='utf-8') as handle:
+                records += [json.loads(line) for line in handle]
+        return records
+
+    def test_watermark_advances(self):
+        result = changes.export_feed('lessons', self.output_dir, lag_seconds=0, batch_size=1, run_stamp='r1')
+        self.assertEqual(result.rows, 2)
+        self.assertEqual(
+            [os.path.basename(os.path.dirname(path)) for path in result.files], ['dt=2026-03-01', 'dt=2026-03-02'],
+        )
+        self.assertEqual([record['id'] for record in self.read_feed(result.files)], [self.world.lesson.id, self.second.id])
+        self.assertEqual(result.watermark, (self.first_day + timedelta(hours=1), self.second.id))
+
+        # Nimic nou: watermark-ul rămâne pe loc
+        again = changes.export_feed('lessons', self.output_dir, lag_seconds=0, run_stamp='r2')
+        self.assertEqual((again.rows, again.files, again.watermark), (0, [], result.watermark))
+
+        # Doar rândul modificat reapare
+        self.world.lesson.topic = 'Recapitulare'
+        self.world.lesson.save()
+        changed = changes.export_feed('lessons', self.output_dir, lag_seconds=0, run_stamp='r3')
+        self.assertEqual([record['topic'] for record in self.read_feed(changed.files)], ['Recapitulare'])
+
+    def test_lag_holds_back_recent_rows(self):
+        self.world.lesson.save()
+        result = changes.export_feed('lessons', self.output_dir, lag_seconds=3600, run_stamp='r1')
+        self.assertEqual(result.rows, 1)
+        self.assertEqual(result.watermark[1], self.second.id)
+
+    def test_deletions_are_exported(self):
+        changes.export_feed(changes.DELETIONS_FEED, self.output_dir, lag_seconds=0, run_stamp='r1')
+        lesson_id = self.second.id
+        self.second.delete()
+        result = changes.export_feed(changes.DELETIONS_FEED, self.output_dir, lag_seconds=0, run_stamp='r2')
+        self.assertEqual(
+            [(record['model_label'], record['object_id']) for record in self.read_feed(result.files)],
+            [('teacher_platform.lesson', lesson_id)],
+        )
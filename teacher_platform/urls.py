@@ -15,13 +15,22 @@ urlpatterns = [
     path('grupe/adauga/', views.group_add, name='group_add'),
     path('grupe/<int:group_id>/', views.group_detail, name='group_detail'),
     path('grupe/<int:group_id>/editeaza/', views.group_edit, name='group_edit'),
+    path('grupe/<int:group_id>/studenti/<int:student_id>/retrage/', views.group_student_remove, name='group_student_remove'),
+    path('grupe/<int:group_id>/asteptare/adauga/', views.group_waitlist_add, name='group_waitlist_add'),
+    path('grupe/<int:group_id>/asteptare/<int:entry_id>/sterge/', views.group_waitlist_remove, name='group_waitlist_remove'),
+    path('grupe/asteptare/', views.waitlists, name='waitlists'),
+    path('grupe/<int:group_id>/catalog/', views.group_register, name='group_register'),
+    path('grupe/<int:group_id>/catalog/export/', views.group_register_export, name='group_register_export'),
 
     # Calendar
     path('calendar/', views.calendar_view, name='calendar'),
+    path('calendar/feed/<str:token>.ics', views.teacher_calendar_feed, name='teacher_calendar_feed'),
+    path('grupe/feed/<str:token>.ics', views.group_calendar_feed, name='group_calendar_feed'),
 
     # Studenți
     path('studenti/', views.students_list, name='students_list'),
     path('studenti/adauga/', views.student_add, name='student_add'),
+    path('studenti/import/', views.student_import, name='student_import'),
     path('studenti/<int:student_id>/', views.student_detail, name='student_detail'),
     path('studenti/<int:student_id>/editeaza/', views.student_edit, name='student_edit'),
 
@@ -43,4 +52,5 @@ urlpatterns = [
 
     # API
     path('api/get-modules/', views.get_modules_for_course, name='get_modules_for_course'),
+    path('api/lessons', views.lessons_range_api, name='lessons_range_api'),
 ]
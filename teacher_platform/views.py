@@ -1,14 +1,24 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Count, Q, Avg
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
-from django.http import JsonResponse
-from datetime import datetime, timedelta
-from .models import Group, GroupStudent, Lesson, Attendance, Assignment, AssignmentSubmission, LessonNote
+from django.http import JsonResponse, Http404
+from datetime import date, datetime, timedelta
+from .models import Group, GroupFullError, GroupStudent, GroupWaitlistEntry, Lesson, Attendance, Assignment, AssignmentSubmission, LessonNote
 from accounts.models import User, StudentProfile, TeacherProfile
 from courses.models import Module, LessonTemplate
-from .forms import GroupForm, StudentForm, EditStudentForm, LessonForm, TeacherProfileForm
+from mathcourses.query_budget import query_budget
+from .forms import GroupForm, StudentForm, StudentImportForm, WaitlistEntryForm, EditStudentForm, LessonForm, TeacherProfileForm
+from .ics import make_feed_token, read_feed_token, feed_response
+from .summaries import get_dashboard_summary
+from .analytics import get_student_stats, rolling_trend, trend_polyline
+from .queries import keyset_paginate, with_submission_stats, roster_page, ROSTER_SORTS
+from .calendar_api import get_lessons_payload, month_start, next_month, MAX_RANGE_DAYS
+from .imports import read_rows, import_students, StudentImportError
+from .registers import build_attendance_matrix, register_csv_response, register_xlsx_response, RegisterExportError
 
 
 def teacher_required(view_func):
@@ -23,6 +33,7 @@ def teacher_required(view_func):
     return wrapper
 
 
+@query_budget(10)
 @login_required
 @teacher_required
 def dashboard(request):
@@ -31,65 +42,26 @@ def dashboard(request):
     """
     teacher = request.user
 
-    # Statistici generale
-    total_groups = Group.objects.filter(teacher=teacher, is_active=True).count()
-    total_students = GroupStudent.objects.filter(
-        group__teacher=teacher,
-        is_active=True
-    ).distinct().count()
-
-    # Lecții pentru săptămâna curentă
-    today = timezone.now().date()
-    week_start = today - timedelta(days=today.weekday())
-    week_end = week_start + timedelta(days=6)
-
-    weekly_lessons = Lesson.objects.filter(
-        group__teacher=teacher,
-        date__range=[week_start, week_end]
-    ).count()
-
-    # Teme nenotate
-    ungraded_assignments = AssignmentSubmission.objects.filter(
-        assignment__group__teacher=teacher,
-        is_graded=False
-    ).count()
-
-    # Lecțiile următoare (următoarele 5)
-    upcoming_lessons = Lesson.objects.filter(
-        group__teacher=teacher,
-        date__gte=today,
-        status='scheduled'
-    ).select_related('group', 'lesson_template').order_by('date', 'start_time')[:5]
-
-    # Grupele active
-    active_groups = Group.objects.filter(
-        teacher=teacher,
-        is_active=True
-    ).annotate(
-        student_count=Count('students', filter=Q(students__is_active=True))
-    ).select_related('course', 'module', 'location')[:6]
-
-    # Teme cu deadline aproape (următoarele 7 zile)
-    upcoming_deadline = today + timedelta(days=7)
-    upcoming_assignments = Assignment.objects.filter(
-        group__teacher=teacher,
-        due_date__range=[today, upcoming_deadline]
-    ).select_related('group').order_by('due_date')[:5]
+    # Snapshot materializat (invalidat prin semnale la modificarea datelor)
+    summary = get_dashboard_summary(teacher)
 
     context = {
         'teacher': teacher,
-        'total_groups': total_groups,
-        'total_students': total_students,
-        'weekly_lessons': weekly_lessons,
-        'ungraded_assignments': ungraded_assignments,
-        'upcoming_lessons': upcoming_lessons,
-        'active_groups': active_groups,
-        'upcoming_assignments': upcoming_assignments,
+        'total_groups': summary['total_groups'],
+        'total_students': summary['total_students'],
+        'weekly_lessons': summary['weekly_lessons'],
+        'ungraded_assignments': summary['ungraded_assignments'],
+        'upcoming_lessons': summary['upcoming_lessons'],
+        'active_groups': summary['active_groups'],
+        'upcoming_assignments': summary['upcoming_assignments'],
+        'summary_computed_at': summary['computed_at'],
+        'today': timezone.localdate(),
     }
 
     return render(request, 'teacher_platform/dashboard.html', context)
 
 
+@query_budget(4)
 @login_required
 @teacher_required
 def groups_list(request):
@@ -108,9 +80,7 @@ def groups_list(request):
     elif status_filter == 'inactive':
         groups_query = groups_query.filter(is_active=False)
 
-    groups = groups_query.annotate(
-        student_count=Count('students', filter=Q(students__is_active=True))
-    ).select_related('course', 'module', 'location').order_by('-created_at')
+    groups = groups_query.select_related('course', 'module', 'location').order_by('-created_at')
 
     context = {
         'groups': groups,
@@ -120,6 +90,7 @@ def groups_list(request):
     return render(request, 'teacher_platform/groups_list.html', context)
 
 
+@query_budget(15)
 @login_required
 @teacher_required
 def group_detail(request, group_id):
@@ -169,11 +140,175 @@ def group_detail(request, group_id):
         'past_lessons': past_lessons,
         'assignments': assignments,
         'lesson_templates': lesson_templates,
+        'ics_feed_url': request.build_absolute_uri(
+            reverse('teacher_platform:group_calendar_feed', args=[make_feed_token('group', group.id)])
+        ),
+        'waitlist': list(group.waitlist.select_related('student')),
+        'waitlist_form': WaitlistEntryForm(teacher=request.user, group=group),
     }
 
     return render(request, 'teacher_platform/group_detail.html', context)
 
 
+@login_required
+@teacher_required
+def group_student_remove(request, group_id, student_id):
+    """
+    Retrage un elev din grupă; locul liber trece la primul elev din lista de așteptare
+    """
+    if request.method != 'POST':
+        return redirect('teacher_platform:group_detail', group_id=group_id)
+
+    group_student = get_object_or_404(
+        GroupStudent.objects.select_related('student', 'group'),
+        group_id=group_id,
+        group__teacher=request.user,
+        student_id=student_id,
+        is_active=True
+    )
+    group_student.is_active = False
+    group_student.save()
+
+    messages.success(request, f'Elevul {group_student.student.get_full_name()} a fost retras din grupă.')
+    if group_student.promoted_enrollment:
+        promoted = group_student.promoted_enrollment.student
+        messages.success(request, f'{promoted.get_full_name()} a fost înscris din lista de așteptare.')
+    return redirect('teacher_platform:group_detail', group_id=group_id)
+
+
+@login_required
+@teacher_required
+def group_waitlist_add(request, group_id):
+    """
+    Adaugă un elev în lista de așteptare a grupei
+    """
+    group = get_object_or_404(Group, id=group_id, teacher=request.user)
+    if request.method != 'POST':
+        return redirect('teacher_platform:group_detail', group_id=group.id)
+
+    form = WaitlistEntryForm(request.POST, teacher=request.user, group=group)
+    if form.is_valid():
+        entry = form.save(commit=False)
+        entry.group = group
+        entry.save()
+
+        # Dacă grupa are locuri libere, primul din coadă este înscris
+        # (elevul adăugat acum doar dacă nu are pe nimeni înaintea lui)
+        promoted = GroupWaitlistEntry.promote_next(group.id) if group.has_available_spots() else None
+        if promoted and promoted.student_id == entry.student_id:
+            messages.success(request, f'{entry.student.get_full_name()} a fost înscris direct în grupă.')
+        else:
+            messages.success(request, f'{entry.student.get_full_name()} a fost adăugat în lista de așteptare.')
+            if promoted:
+                messages.success(request, f'{promoted.student.get_full_name()} a fost înscris din lista de așteptare.')
+    else:
+        messages.error(request, 'Elevul nu a putut fi adăugat în lista de așteptare.')
+    return redirect('teacher_platform:group_detail', group_id=group.id)
+
+
+@login_required
+@teacher_required
+def group_waitlist_remove(request, group_id, entry_id):
+    """
+    Scoate un elev din lista de așteptare
+    """
+    entry = get_object_or_404(
+        GroupWaitlistEntry.objects.select_related('student'),
+        id=entry_id,
+        group_id=group_id,
+        group__teacher=request.user
+    )
+    if request.method == 'POST':
+        entry.delete()
+        messages.success(request, f'{entry.student.get_full_name()} a fost scos din lista de așteptare.')
+    return redirect('teacher_platform:group_detail', group_id=group_id)
+
+
+@query_budget(4)
+@login_required
+@teacher_required
+def waitlists(request):
+    """
+    Listele de așteptare ale tuturor grupelor profesorului (o singură interogare)
+    """
+    entries = GroupWaitlistEntry.objects.filter(
+        group__teacher=request.user
+    ).select_related('group', 'student').annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=[F('group_id')],
+            order_by=[F('requested_at').asc(), F('id').asc()]
+        )
+    ).order_by('group__name', 'group_id', 'requested_at', 'id')
+
+    context = {
+        'entries': list(entries),
+    }
+    return render(request, 'teacher_platform/waitlists.html', context)
+
+
+def _register_filters(request):
+    """Filtrele catalogului din query string: ?from=YYYY-MM-DD&to=YYYY-MM-DD&module=ID"""
+    filters = {'date_from': None, 'date_to': None, 'module_id': None}
+    for key, param in (('date_from', 'from'), ('date_to', 'to')):
+        try:
+            if request.GET.get(param):
+                filters[key] = datetime.strptime(request.GET[param], '%Y-%m-%d').date()
+        except ValueError:
+            pass
+    if request.GET.get('module', '').isdigit():
+        filters['module_id'] = int(request.GET['module'])
+    return filters
+
+
+@query_budget(8)
+@login_required
+@teacher_required
+def group_register(request, group_id):
+    """
+    Catalogul grupei: elevi x lecții, cu prezența și evaluarea în celule
+    """
+    group = get_object_or_404(
+        Group.objects.select_related('course', 'module'),
+        id=group_id,
+        teacher=request.user
+    )
+    filters = _register_filters(request)
+    matrix = build_attendance_matrix(group, **filters)
+
+    context = {
+        'group': group,
+        'lessons': matrix['lessons'],
+        'rows': matrix['rows'],
+        'modules': Module.objects.filter(course_id=group.course_id).order_by('order') if group.course_id else [],
+        'date_from': filters['date_from'],
+        'date_to': filters['date_to'],
+        'module_id': filters['module_id'],
+        'query_string': request.GET.urlencode(),
+    }
+    return render(request, 'teacher_platform/group_register.html', context)
+
+
+@query_budget(7)
+@login_required
+@teacher_required
+def group_register_export(request, group_id):
+    """
+    Export catalog în CSV (streaming) sau XLSX: ?format=csv|xlsx plus filtrele paginii
+    """
+    group = get_object_or_404(Group, id=group_id, teacher=request.user)
+    filters = _register_filters(request)
+
+    if request.GET.get('format') == 'xlsx':
+        try:
+            return register_xlsx_response(group, **filters)
+        except RegisterExportError as exc:
+            messages.error(request, str(exc))
+            return redirect('teacher_platform:group_register', group_id=group.id)
+    return register_csv_response(group, **filters)
+
+
+@query_budget(5)
 @login_required
 @teacher_required
 def calendar_view(request):
@@ -196,11 +331,11 @@ def calendar_view(request):
     else:
         last_day = datetime(year, month + 1, 1).date() - timedelta(days=1)
 
-    # Lecții pentru luna selectată
-    lessons = Lesson.objects.filter(
-        group__teacher=teacher,
-        date__range=[first_day, last_day]
-    ).select_related('group', 'group__module', 'lesson_template').order_by('date', 'start_time')
+    # Lecțiile lunii din cache-ul lunar al API-ului de calendar (aceleași date ca /api/lessons)
+    lessons = [
+        {**lesson, 'date': date.fromisoformat(lesson['date'])}
+        for lesson in get_lessons_payload(teacher, first_day, last_day)
+    ]
 
     # Grupuri pentru calendar view
     groups = Group.objects.filter(
@@ -232,9 +367,7 @@ def calendar_view(request):
         # Creează un dicționar cu lecțiile organizate pe zile
         lessons_by_date = {}
         for lesson in lessons:
-            if lesson.date not in lessons_by_date:
-                lessons_by_date[lesson.date] = []
-            lessons_by_date[lesson.date].append(lesson)
+            lessons_by_date.setdefault(lesson['date'], []).append(lesson)
 
         # Construiește săptămânile cu informații despre lecții
         for week in month_calendar:
@@ -265,11 +398,50 @@ def calendar_view(request):
         'today': timezone.now().date(),
         'view_mode': view_mode,
         'calendar_weeks': calendar_weeks,
+        'ics_feed_url': request.build_absolute_uri(
+            reverse('teacher_platform:teacher_calendar_feed', args=[make_feed_token('teacher', teacher.id)])
+        ),
     }
 
     return render(request, 'teacher_platform/calendar.html', context)
 
 
+def _feed_lessons():
+    return Lesson.objects.select_related(
+        'group', 'group__location', 'lesson_template'
+    ).order_by('date', 'start_time')
+
+
+@query_budget(3)
+def teacher_calendar_feed(request, token):
+    """
+    Feed iCalendar cu toate lecțiile profesorului (abonare din telefon / Google Calendar)
+    Accesul se face prin token semnat, fără autentificare
+    """
+    teacher_id = read_feed_token(token, 'teacher')
+    if teacher_id is None:
+        raise Http404
+    teacher = get_object_or_404(User, id=teacher_id, role='teacher')
+
+    lessons = _feed_lessons().filter(group__teacher=teacher)
+    return feed_response(request, lessons, f'MindAcademy - {teacher.get_full_name()}', teacher.id)
+
+
+@query_budget(3)
+def group_calendar_feed(request, token):
+    """
+    Feed iCalendar cu lecțiile unei grupe
+    """
+    group_id = read_feed_token(token, 'group')
+    if group_id is None:
+        raise Http404
+    group = get_object_or_404(Group, id=group_id)
+
+    lessons = _feed_lessons().filter(group=group)
+    return feed_response(request, lessons, f'MindAcademy - {group.name}', group.teacher_id)
+
+
+@query_budget(7)
 @login_required
 @teacher_required
 def students_list(request):
@@ -278,44 +450,19 @@ def students_list(request):
     """
     teacher = request.user
 
-    # Filtrare după grupă
+    # Filtrare după grupă și sortare
     group_filter = request.GET.get('group', '')
-
-    # Obține elevii din grupe
-    students_in_groups = GroupStudent.objects.filter(
-        group__teacher=teacher,
-        is_active=True
-    ).select_related('student', 'student__student_profile', 'group')
-
-    if group_filter:
-        students_in_groups = students_in_groups.filter(group_id=group_filter)
-
-    # Obține și elevii creați de profesor dar care nu sunt într-o grupă
-    students_without_group = []
-    if not group_filter:  # Doar când nu e filtru de grupă
-        student_profiles = StudentProfile.objects.filter(
-            teacher=teacher
-        ).select_related('user')
-
-        # Exclude elevii care sunt deja în grupe
-        students_with_groups_ids = students_in_groups.values_list('student_id', flat=True)
-        for profile in student_profiles:
-            if profile.user.id not in students_with_groups_ids:
-                # Creează un obiect pseudo-GroupStudent pentru consistență în template
-                class StudentWithoutGroup:
-                    def __init__(self, student):
-                        self.student = student
-                        self.group = None
-                        self.lessons_attended = 0
-                        self.lessons_missed = 0
-
-                    def get_attendance_rate(self):
-                        return 0
-
-                students_without_group.append(StudentWithoutGroup(profile.user))
-
-    students = list(students_in_groups.order_by('student__first_name', 'student__last_name'))
-    students.extend(students_without_group)
+    sort = request.GET.get('sort', 'name')
+    if sort not in ROSTER_SORTS:
+        sort = 'name'
+
+    # O singură interogare pentru elevii din grupe + elevii creați fără grupă
+    students, next_cursor, total_students = roster_page(
+        teacher,
+        group_id=group_filter if group_filter.isdigit() else None,
+        sort=sort,
+        cursor=request.GET.get('after'),
+    )
 
     # Grupele pentru filtru
     groups = Group.objects.filter(
@@ -325,20 +472,29 @@ def students_list(request):
 
     context = {
         'students': students,
+        'total_students': total_students,
         'groups': groups,
         'group_filter': group_filter,
+        'sort': sort,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('after'),
     }
 
     return render(request, 'teacher_platform/students_list.html', context)
 
 
+@query_budget(9)
 @login_required
 @teacher_required
 def student_detail(request, student_id):
     """
     Detalii despre un student specific
     """
-    student = get_object_or_404(User, id=student_id, role='student')
+    student = get_object_or_404(
+        User.objects.select_related('student_profile'),
+        id=student_id,
+        role='student'
+    )
 
     # Verifică dacă există student_profile
     if not hasattr(student, 'student_profile'):
@@ -353,41 +509,35 @@ def student_detail(request, student_id):
     ).first()
 
     # Verifică și dacă profesorul a creat acest student
-    is_creator = (student.student_profile.teacher == request.user)
+    is_creator = (student.student_profile.teacher_id == request.user.id)
 
     if not group_student and not is_creator:
         messages.error(request, 'Nu aveți acces la acest student.')
         return redirect('teacher_platform:students_list')
 
     # Grupele studentului
-    student_groups = GroupStudent.objects.filter(
+    student_groups = list(GroupStudent.objects.filter(
         student=student,
         is_active=True
-    ).select_related('group', 'group__course', 'group__module')
+    ).select_related('group', 'group__course', 'group__module'))
 
-    # Prezențe - queryset complet pentru statistici
-    attendances_full = Attendance.objects.filter(
+    # Prezențe - ultimele 20 pentru afișare și pentru tendință
+    attendances = list(Attendance.objects.filter(
         student=student,
         lesson__group__teacher=request.user
-    ).select_related('lesson', 'lesson__group')
-
-    # Prezențe - limitate pentru afișare
-    attendances = attendances_full.order_by('-lesson__date')[:20]
+    ).select_related('lesson', 'lesson__group').order_by('-lesson__date')[:20])
 
     # Teme predate
-    submissions = AssignmentSubmission.objects.filter(
+    submissions = list(AssignmentSubmission.objects.filter(
         student=student,
         assignment__group__teacher=request.user
-    ).select_related('assignment', 'assignment__group').order_by('-submitted_at')[:20]
+    ).select_related('assignment', 'assignment__group').order_by('-submitted_at')[:20])
 
-    # Statistici - calculăm pe queryset-ul complet, nu cel sliced
-    total_lessons = attendances_full.count()
-    present_count = attendances_full.filter(is_present=True).count()
-    attendance_rate = round((present_count / total_lessons * 100), 2) if total_lessons > 0 else 0
+    # Statistici - o singură interogare agregată, din cache per (profesor, elev)
+    stats = get_student_stats(request.user, student)
 
-    avg_performance = attendances_full.filter(
-        performance_rating__isnull=False
-    ).aggregate(Avg('performance_rating'))['performance_rating__avg']
+    # Tendința pe ultimele 8 lecții, din prezențele deja încărcate
+    trend = rolling_trend(attendances)
 
     context = {
         'student': student,
@@ -395,13 +545,17 @@ def student_detail(request, student_id):
         'student_groups': student_groups,
         'attendances': attendances,
         'submissions': submissions,
-        'attendance_rate': attendance_rate,
-        'avg_performance': round(avg_performance, 2) if avg_performance else None,
+        'stats': stats,
+        'attendance_rate': stats['attendance_rate'],
+        'avg_performance': stats['avg_performance'],
+        'trend': trend,
+        'trend_points': trend_polyline(trend),
     }
 
     return render(request, 'teacher_platform/student_detail.html', context)
 
 
+@query_budget(7)
 @login_required
 @teacher_required
 def lesson_detail(request, lesson_id):
@@ -421,16 +575,17 @@ def lesson_detail(request, lesson_id):
         is_active=True
     ).select_related('student')
 
-    for gs in group_students:
-        attendance = Attendance.objects.filter(
-            lesson=lesson,
-            student=gs.student
-        ).first()
+    # Prezențele lecției într-o singură interogare, nu una per elev
+    attendance_by_student = {
+        attendance.student_id: attendance
+        for attendance in Attendance.objects.filter(lesson=lesson)
+    }
 
+    for gs in group_students:
         students_data.append({
             'group_student': gs,
             'student': gs.student,
-            'attendance': attendance,
+            'attendance': attendance_by_student.get(gs.student_id),
         })
 
     context = {
@@ -441,6 +596,7 @@ def lesson_detail(request, lesson_id):
     return render(request, 'teacher_platform/lesson_detail.html', context)
 
 
+@query_budget(5)
 @login_required
 @teacher_required
 def assignments_list(request):
@@ -453,9 +609,9 @@ def assignments_list(request):
     status_filter = request.GET.get('status', 'all')
     group_filter = request.GET.get('group', '')
 
-    assignments_query = Assignment.objects.filter(
+    assignments_query = with_submission_stats(Assignment.objects.filter(
         group__teacher=teacher
-    ).select_related('group').prefetch_related('submissions')
+    ).select_related('group', 'group__module'))
 
     if group_filter:
         assignments_query = assignments_query.filter(group_id=group_filter)
@@ -467,7 +623,12 @@ def assignments_list(request):
     elif status_filter == 'past':
         assignments_query = assignments_query.filter(due_date__lt=today)
 
-    assignments = assignments_query.order_by('-due_date')
+    # Paginare keyset (profesorii pot avea sute de teme)
+    assignments, next_cursor = keyset_paginate(
+        assignments_query,
+        [('due_date', True), ('id', True)],
+        cursor=request.GET.get('after'),
+    )
 
     # Grupele pentru filtru
     groups = Group.objects.filter(
@@ -481,11 +642,14 @@ def assignments_list(request):
         'status_filter': status_filter,
         'group_filter': group_filter,
         'today': today,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('after'),
     }
 
     return render(request, 'teacher_platform/assignments_list.html', context)
 
 
+@query_budget(6)
 @login_required
 @teacher_required
 def assignment_detail(request, assignment_id):
@@ -493,22 +657,23 @@ def assignment_detail(request, assignment_id):
     Detalii despre o temă și submissions-urile studentilor
     """
     assignment = get_object_or_404(
-        Assignment.objects.select_related('group'),
+        with_submission_stats(Assignment.objects.select_related('group')),
         id=assignment_id,
         group__teacher=request.user
     )
 
-    # Submissions
-    submissions = AssignmentSubmission.objects.filter(
+    # Submissions (assignment inclus pentru is_late fără interogări per rând)
+    submissions = list(AssignmentSubmission.objects.filter(
         assignment=assignment
-    ).select_related('student').order_by('-submitted_at')
+    ).select_related('student', 'assignment').order_by('-submitted_at'))
 
     # Studenții care nu au predat
-    students_submitted = submissions.values_list('student_id', flat=True)
-    students_not_submitted = GroupStudent.objects.filter(
+    students_not_submitted = list(GroupStudent.objects.filter(
         group=assignment.group,
         is_active=True
-    ).exclude(student_id__in=students_submitted).select_related('student')
+    ).exclude(
+        student_id__in=[sub.student_id for sub in submissions]
+    ).select_related('student'))
 
     context = {
         'assignment': assignment,
@@ -520,6 +685,7 @@ def assignment_detail(request, assignment_id):
     return render(request, 'teacher_platform/assignment_detail.html', context)
 
 
+@query_budget(7)
 @login_required
 @teacher_required
 def group_add(request):
@@ -534,8 +700,6 @@ def group_add(request):
             group = form.save(commit=False)
             group.teacher = teacher
             group.save()
-            group.generate_code()
-            group.save()
             messages.success(request, f'Grupa "{group.name}" a fost creată cu succes! Cod: {group.code}')
             return redirect('teacher_platform:group_detail', group_id=group.id)
         else:
@@ -550,6 +714,7 @@ def group_add(request):
     return render(request, 'teacher_platform/group_form.html', context)
 
 
+@query_budget(9)
 @login_required
 @teacher_required
 def group_edit(request, group_id):
@@ -563,6 +728,8 @@ def group_edit(request, group_id):
         if form.is_valid():
             form.save()
             messages.success(request, f'Grupa "{group.name}" a fost actualizată cu succes!')
+            for enrollment in group.promoted_enrollments:
+                messages.success(request, f'{enrollment.student.get_full_name()} a fost înscris din lista de așteptare.')
             return redirect('teacher_platform:group_detail', group_id=group.id)
         else:
             messages.error(request, 'Te rog corectează erorile din formular.')
@@ -577,6 +744,7 @@ def group_edit(request, group_id):
     return render(request, 'teacher_platform/group_form.html', context)
 
 
+@query_budget(4)
 @login_required
 @teacher_required
 def student_add(request):
@@ -598,7 +766,16 @@ def student_add(request):
     if request.method == 'POST':
         form = StudentForm(request.POST, teacher=teacher)
         if form.is_valid():
-            student = form.save()
+            try:
+                student = form.save()
+            except GroupFullError:
+                form.add_error('group', 'Grupa a atins numărul maxim de elevi.')
+                messages.error(request, 'Te rog corectează erorile din formular.')
+                return render(request, 'teacher_platform/student_form.html', {
+                    'form': form,
+                    'title': 'Adaugă Elev Nou',
+                    'selected_group': selected_group
+                })
 
             # Verifică dacă studentul a fost adăugat într-o grupă
             group_student = GroupStudent.objects.filter(
@@ -631,6 +808,48 @@ def student_add(request):
     return render(request, 'teacher_platform/student_form.html', context)
 
 
+@query_budget(4)
+@login_required
+@teacher_required
+def student_import(request):
+    """
+    Import în masă al elevilor dintr-un fișier CSV sau XLSX
+    """
+    teacher = request.user
+    created_students = []
+    row_errors = []
+
+    if request.method == 'POST':
+        form = StudentImportForm(request.POST, request.FILES, teacher=teacher)
+        if form.is_valid():
+            try:
+                rows = read_rows(form.cleaned_data['file'])
+                created_students, row_errors = import_students(rows, teacher, form.cleaned_data['group'])
+            except StudentImportError as exc:
+                form.add_error('file', str(exc))
+            else:
+                if created_students:
+                    messages.success(
+                        request,
+                        f'Au fost creați {len(created_students)} elevi. '
+                        f'Parola temporară a fiecărui elev este username-ul său.'
+                    )
+                elif row_errors:
+                    messages.error(request, 'Fișierul conține erori. Niciun elev nu a fost importat.')
+                else:
+                    messages.error(request, 'Fișierul nu conține niciun elev.')
+    else:
+        form = StudentImportForm(teacher=teacher)
+
+    context = {
+        'form': form,
+        'created_students': created_students,
+        'row_errors': row_errors,
+    }
+    return render(request, 'teacher_platform/student_import.html', context)
+
+
+@query_budget(6)
 @login_required
 @teacher_required
 def student_edit(request, student_id):
@@ -668,6 +887,7 @@ def student_edit(request, student_id):
     return render(request, 'teacher_platform/student_form.html', context)
 
 
+@query_budget(4)
 @login_required
 @teacher_required
 def get_modules_for_course(request):
@@ -676,11 +896,12 @@ def get_modules_for_course(request):
     """
     course_id = request.GET.get('course_id')
     if course_id:
-        modules = Module.objects.filter(course_id=course_id, is_active=True).values('id', 'title')
+        modules = Module.objects.filter(course_id=course_id, is_active=True).order_by('order').values('id', title=F('name'))
         return JsonResponse(list(modules), safe=False)
     return JsonResponse([], safe=False)
 
 
+@query_budget(6)
 @login_required
 @teacher_required
 def lesson_create(request, group_id=None):
@@ -774,6 +995,33 @@ def lesson_create(request, group_id=None):
     return render(request, 'teacher_platform/lesson_form.html', context)
 
 
+@query_budget(4)
+@login_required
+@teacher_required
+def lessons_range_api(request):
+    """
+    API JSON cu lecțiile profesorului dintr-un interval: ?from=YYYY-MM-DD&to=YYYY-MM-DD
+    Fără parametri returnează luna curentă. Datele vin din cache-ul lunar.
+    """
+    today = timezone.now().date()
+    try:
+        date_from = datetime.strptime(request.GET['from'], '%Y-%m-%d').date() if request.GET.get('from') else month_start(today)
+        date_to = datetime.strptime(request.GET['to'], '%Y-%m-%d').date() if request.GET.get('to') else next_month(date_from) - timedelta(days=1)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid date format, expected YYYY-MM-DD'}, status=400)
+
+    if date_to < date_from:
+        return JsonResponse({'error': '"to" must not be before "from"'}, status=400)
+    if (date_to - date_from).days > MAX_RANGE_DAYS:
+        return JsonResponse({'error': f'Range too large (max {MAX_RANGE_DAYS} days)'}, status=400)
+
+    return JsonResponse({
+        'from': date_from.isoformat(),
+        'to': date_to.isoformat(),
+        'lessons': get_lessons_payload(request.user, date_from, date_to),
+    })
+
+
 @login_required
 @teacher_required
 def mark_attendance(request, lesson_id):
@@ -799,13 +1047,14 @@ def mark_attendance(request, lesson_id):
 
     student = get_object_or_404(User, id=student_id, role='student')
 
-    # Verifică că studentul e în grupă
-    if not GroupStudent.objects.filter(group=lesson.group, student=student, is_active=True).exists():
+    # Verifică că studentul e în grupă (managerii legați păstrează lesson / group
+    # încărcate pe rânduri, deci semnalele nu mai caută profesorul în baza de date)
+    group_student = lesson.group.students.filter(student=student, is_active=True).first()
+    if group_student is None:
         return JsonResponse({'error': 'Student not in this group'}, status=400)
 
     # Creează sau actualizează attendance
-    attendance, created = Attendance.objects.update_or_create(
-        lesson=lesson,
+    attendance, created = lesson.attendances.update_or_create(
         student=student,
         defaults={
             'is_present': is_present,
@@ -815,7 +1064,6 @@ def mark_attendance(request, lesson_id):
     )
 
     # Actualizează contoarele în GroupStudent
-    group_student = GroupStudent.objects.get(group=lesson.group, student=student)
     total_lessons = Attendance.objects.filter(
         lesson__group=lesson.group,
         student=student
@@ -842,6 +1090,7 @@ def mark_attendance(request, lesson_id):
     })
 
 
+@query_budget(6)
 @login_required
 @teacher_required
 def lesson_edit(request, lesson_id):
@@ -878,6 +1127,7 @@ def lesson_edit(request, lesson_id):
     return render(request, 'teacher_platform/lesson_form.html', context)
 
 
+@query_budget(6)
 @login_required
 @teacher_required
 def teacher_profile(request):
@@ -908,6 +1158,7 @@ def teacher_profile(request):
     return render(request, 'teacher_platform/teacher_profile.html', context)
 
 
+@query_budget(3)
 @login_required
 @teacher_required
 def simulators_list(request):
@@ -938,6 +1189,7 @@ def simulators_list(request):
     return render(request, 'teacher_platform/simulators_list.html', context)
 
 
+@query_budget(3)
 @login_required
 @teacher_required
 def abacus_simulator(request):
@@ -947,6 +1199,7 @@ def abacus_simulator(request):
     return render(request, 'teacher_platform/abacus_simulator.html')
 
 
+@query_budget(3)
 @login_required
 @teacher_required
 def flashcard_simulator(request):